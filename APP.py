@@ -1,134 +1,30 @@
-import pandas as pd
+import time
+INICIO_EXECUCAO = time.perf_counter()
+
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import io
+from datetime import datetime
 import os
-import time
-import hashlib
+import json
+import uuid
 import warnings
-from pytz import timezone
-import numpy as np
-import streamlit.components.v1 as components
-warnings.filterwarnings('ignore')
+from concurrent.futures import ThreadPoolExecutor
 
-# ============================================
-# PALETA DE CORES - NOVA IDENTIDADE VISUAL
-# ============================================
-# Cores principais
-COR_VERDE_ESCURO = "#2E7D32"      # Verde escuro - principal
-COR_AZUL_PETROLEO = "#028a9f"     # Azul petróleo - secundário
-COR_AZUL_ESCURO = "#005973"       # Azul escuro - destaque
-COR_LARANJA = "#F57C00"           # Laranja - alertas/positivo
-COR_VERMELHO = "#C62828"          # Vermelho - erros/negativo
-
-# Cores neutras
-COR_CINZA_FUNDO = "#F8F9FA"       # Cinza muito claro para fundos
-COR_CINZA_BORDA = "#E9ECEF"       # Cinza para bordas
-COR_CINZA_TEXTO = "#6C757D"       # Cinza para textos secundários
-COR_BRANCO = "#FFFFFF"            # Branco
-COR_PRETO_SUAVE = "#212529"       # Preto suave para textos principais
-
-# Cores para gráficos
-CORES_GRADIENTE = [
-    COR_VERDE_ESCURO,
-    COR_AZUL_PETROLEO,
-    COR_AZUL_ESCURO,
-    COR_LARANJA,
-    COR_VERMELHO,
-    "#1E88E5"  # Azul adicional
-]
+# Apenas módulos leves até o cabeçalho ser pintado (esteira.constantes não carrega o pandas)
+from esteira.constantes import (
+    COR_VERDE_ESCURO, COR_AZUL_PETROLEO, COR_AZUL_ESCURO, COR_LARANJA, COR_VERMELHO,
+    COR_CINZA_FUNDO, COR_CINZA_BORDA, COR_CINZA_TEXTO, COR_BRANCO, COR_PRETO_SUAVE,
+    MAPEAMENTO_EMPRESAS, NOMES_MESES_COMPLETOS, LIMITE_MEMORIA_MB, SESSAO_OCIOSA_MINUTOS,
+    agora_brasilia
+)
+from esteira.importacao import (
+    TEMPOS_IMPORTACAO, importar_medindo, importar_sob_demanda, perfil_importacoes
+)
+from esteira.desempenho import LogDesempenho, iniciar_rastreamento, medir
+warnings.filterwarnings('ignore')
 
-# ============================================
-# MAPEAMENTO COMPLETO DAS EMPRESAS
-# ============================================
-MAPEAMENTO_EMPRESAS = {
-    'EMR': {
-        'sigla': 'MG',
-        'estado': 'Minas Gerais',
-        'regiao': 'Sudeste',
-        'nome_completo': 'Energisa Minas Gerais',
-        'latitude': -19.9167,
-        'longitude': -43.9345
-    },
-    'EPB': {
-        'sigla': 'PB',
-        'estado': 'Paraíba',
-        'regiao': 'Nordeste',
-        'nome_completo': 'Energisa Paraíba',
-        'latitude': -7.1195,
-        'longitude': -36.7240
-    },
-    'ESE': {
-        'sigla': 'SE',
-        'estado': 'Sergipe',
-        'regiao': 'Nordeste',
-        'nome_completo': 'Energisa Sergipe',
-        'latitude': -10.9472,
-        'longitude': -37.0731
-    },
-    'ESS': {
-        'sigla': 'SP',
-        'estado': 'São Paulo',
-        'regiao': 'Sudeste',
-        'nome_completo': 'Energisa Sul/Sudeste',
-        'latitude': -23.5505,
-        'longitude': -46.6333
-    },
-    'EMS': {
-        'sigla': 'MS',
-        'estado': 'Mato Grosso do Sul',
-        'regiao': 'Centro-Oeste',
-        'nome_completo': 'Energisa Mato Grosso do Sul',
-        'latitude': -20.4697,
-        'longitude': -54.6201
-    },
-    'EMT': {
-        'sigla': 'MT',
-        'estado': 'Mato Grosso',
-        'regiao': 'Centro-Oeste',
-        'nome_completo': 'Energisa Mato Grosso',
-        'latitude': -12.6819,
-        'longitude': -56.9211
-    },
-    'ETO': {
-        'sigla': 'TO',
-        'estado': 'Tocantins',
-        'regiao': 'Norte',
-        'nome_completo': 'Energisa Tocantins',
-        'latitude': -10.1753,
-        'longitude': -48.2982
-    },
-    'ERO': {
-        'sigla': 'RO',
-        'estado': 'Rondônia',
-        'regiao': 'Norte',
-        'nome_completo': 'Energisa Rondônia',
-        'latitude': -10.9161,
-        'longitude': -61.8298
-    },
-    'EAC': {
-        'sigla': 'AC',
-        'estado': 'Acre',
-        'regiao': 'Norte',
-        'nome_completo': 'Energisa Acre',
-        'latitude': -9.0238,
-        'longitude': -70.8120
-    }
-}
+# Tempos desta execução (carga, filtros, abas, figuras), exibidos em "⏱️ Desempenho"
+rastreador = iniciar_rastreamento('painel')
 
-# ============================================
-# VARIÁVEIS GLOBAIS DE CONFIGURAÇÃO
-# ============================================
-CAMINHO_ARQUIVO_PRINCIPAL = "esteira_demandas.csv"
-CAMINHOS_ALTERNATIVOS = [
-    "data/esteira_demandas.csv",
-    "dados/esteira_demandas.csv",
-    "database/esteira_demandas.csv",
-    "base_dados.csv",
-    "dados.csv"
-]
 
 # ============================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -140,6 +36,112 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+if 'inicio_sessao' not in st.session_state:
+    st.session_state.inicio_sessao = INICIO_EXECUCAO
+    st.session_state.id_sessao = uuid.uuid4().hex[:8]
+
+# ============================================
+# DIAGNÓSTICO DE INICIALIZAÇÃO
+# ============================================
+# Módulos do painel, na ordem em que são importados; o perfil atribui a cada um
+# apenas o custo que ainda não foi pago pelos anteriores
+MODULOS_PERFIL_IMPORTACAO = [
+    'streamlit', 'pandas', 'esteira.dados', 'esteira.analises', 'esteira.snapshot',
+    'plotly.graph_objects', 'plotly.express', 'pytz', 'folium', 'fpdf', 'PIL.Image'
+]
+
+@st.cache_data(show_spinner=False)
+def obter_perfil_importacoes():
+    """Custo de importação de cada módulo do painel (python -X importtime)"""
+    return [
+        linha for linha in perfil_importacoes(MODULOS_PERFIL_IMPORTACAO)
+        if linha['nivel'] == 0 and linha['modulo'] in MODULOS_PERFIL_IMPORTACAO
+    ]
+
+def registrar_marco(chave):
+    """Guarda, uma vez por sessão, o tempo desde o início da sessão até este ponto"""
+    if chave not in st.session_state:
+        st.session_state[chave] = (time.perf_counter() - st.session_state.inicio_sessao) * 1000
+
+def exibir_diagnostico_inicializacao():
+    """Painel da barra lateral com primeira pintura e custo das importações"""
+    with st.expander("🩺 Diagnóstico de Inicialização", expanded=False):
+        col_pintura, col_dados = st.columns(2)
+        with col_pintura:
+            if 'tempo_primeira_pintura' in st.session_state:
+                st.metric("🎨 1ª pintura", f"{st.session_state.tempo_primeira_pintura:,.0f} ms",
+                          help="Do início da sessão até o cabeçalho aparecer")
+        with col_dados:
+            if 'tempo_painel_com_dados' in st.session_state:
+                st.metric("📊 Painel", f"{st.session_state.tempo_painel_com_dados:,.0f} ms",
+                          help="Do início da sessão até o painel começar a exibir os dados")
+        
+        st.markdown("**Importações sob demanda (processo):**")
+        if TEMPOS_IMPORTACAO:
+            st.dataframe(
+                pd.DataFrame(sorted(TEMPOS_IMPORTACAO.items(), key=lambda item: -item[1]),
+                             columns=['Módulo', 'Tempo (ms)']).round(1),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.caption("Nenhum módulo pesado importado ainda.")
+        
+        if st.button("📊 Perfil de importação", use_container_width=True, key="btn_perfil_importacao"):
+            st.session_state.mostrar_perfil_importacao = True
+        
+        if st.session_state.get('mostrar_perfil_importacao'):
+            with st.spinner('Medindo importações...'):
+                perfil = obter_perfil_importacoes()
+            st.dataframe(
+                pd.DataFrame(perfil).rename(columns={
+                    'modulo': 'Módulo', 'proprio_ms': 'Próprio (ms)', 'acumulado_ms': 'Total (ms)'
+                }).drop(columns='nivel').round(1),
+                use_container_width=True,
+                hide_index=True
+            )
+
+# ============================================
+# DESEMPENHO DA EXECUÇÃO
+# ============================================
+@st.cache_resource(show_spinner=False)
+def obter_log_desempenho():
+    """Log rotativo (JSON lines) das execuções de todas as sessões do processo"""
+    return LogDesempenho()
+
+def exibir_painel_desempenho(rastreador):
+    """Painel da barra lateral com o tempo de cada seção desta execução e das recentes"""
+    log = obter_log_desempenho()
+    with st.expander("⏱️ Desempenho", expanded=False):
+        medicoes = pd.DataFrame(rastreador.medicoes, columns=['secao', 'nivel', 'ms', 'linhas', 'cache'])
+        medicoes['linhas'] = medicoes['linhas'].astype('Int64')
+        cache = medicoes['cache'].dropna()
+        col_total, col_cache = st.columns(2)
+        with col_total:
+            st.metric("⏱️ Execução", f"{rastreador.total_ms:,.0f} ms")
+        with col_cache:
+            if not cache.empty:
+                st.metric("🎯 Acertos de cache", f"{(cache == 'acerto').mean() * 100:.0f}%",
+                          help=f"{len(cache)} consultas a cache nesta execução")
+        
+        if not medicoes.empty:
+            medicoes['secao'] = ['\u2003' * n + s for n, s in zip(medicoes['nivel'], medicoes['secao'])]
+            st.dataframe(
+                medicoes.drop(columns='nivel').rename(columns={
+                    'secao': 'Seção', 'ms': 'Tempo (ms)', 'linhas': 'Linhas', 'cache': 'Cache'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        if log.recentes:
+            totais = pd.Series([r['total_ms'] for r in log.recentes])
+            st.caption(
+                f"Últimas {len(totais)} execuções do processo: p50 {totais.quantile(0.5):,.0f} ms, "
+                f"p95 {totais.quantile(0.95):,.0f} ms · log em {log.caminho}"
+            )
+
+
 # ============================================
 # CSS PERSONALIZADO - NOVA PALETA
 # ============================================
@@ -403,40 +405,94 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # ============================================
-# FUNÇÕES AUXILIARES
+# HEADER - ESTILO GRADIENTE AZUL PETRÓLEO
 # ============================================
-def formatar_nome_responsavel(nome):
-    """Formata nomes dos responsáveis"""
-    if pd.isna(nome):
-        return "Não informado"
-    
-    nome_str = str(nome).strip()
-    
-    if '@' in nome_str:
-        partes = nome_str.split('@')[0]
-        for separador in ['.', '_', '-']:
-            if separador in partes:
-                partes = partes.replace(separador, ' ')
-        
-        palavras = [p.capitalize() for p in partes.split() if not p.isdigit()]
-        nome_formatado = ' '.join(palavras)
-        
-        correcoes = {
-            ' Da ': ' da ',
-            ' De ': ' de ',
-            ' Do ': ' do ',
-            ' Das ': ' das ',
-            ' Dos ': ' dos ',
-            ' E ': ' e ',
-        }
-        
-        for errado, correto in correcoes.items():
-            nome_formatado = nome_formatado.replace(errado, correto)
-        
-        return nome_formatado
-    
-    return nome_str.title()
+st.markdown(f"""
+<div style="
+    background: linear-gradient(135deg, {COR_AZUL_PETROLEO} 0%, {COR_AZUL_ESCURO} 100%);
+    padding: 1.5rem 2rem;
+    margin-bottom: 1.5rem;
+    border-radius: 0;
+    box-shadow: 0 4px 15px rgba(2, 138, 159, 0.3);
+">
+    <div style="display: flex; align-items: center; justify-content: space-between; flex-wrap: wrap;">
+        <div>
+            <h1 style="
+                color: {COR_BRANCO};
+                margin: 0;
+                font-size: 1.6rem;
+                font-weight: 600;
+                letter-spacing: -0.3px;
+                text-shadow: 0 1px 2px rgba(0,0,0,0.1);
+            ">
+                📊 ESTEIRA SRE (Site Reliability Engineering)
+            </h1>
+            <p style="
+                color: rgba(255,255,255,0.9);
+                margin: 0.3rem 0 0 0;
+                font-size: 0.85rem;
+                font-weight: 400;
+            ">
+                Acompanhamento das validações da EAC | EMR | EMS | EMT | EPB | ERO | ESE | ESS | ETO
+            </p>
+        </div>
+        <div style="text-align: right;">
+            <p style="
+                color: rgba(255,255,255,0.9);
+                margin: 0;
+                font-size: 0.85rem;
+                font-weight: 500;
+            ">
+                Dashboard de Performance
+            </p>
+            <p style="
+                color: rgba(255,255,255,0.8);
+                margin: 0.2rem 0 0 0;
+                font-size: 0.75rem;
+            ">
+                v5.5 | Sistema de Performance SRE
+            </p>
+            <p style="
+                color: rgba(255,255,255,0.7);
+                margin: 0.3rem 0 0 0;
+                font-size: 0.7rem;
+                font-weight: 500;
+            ">
+                {datetime.now().strftime('%d/%m/%Y')}
+            </p>
+        </div>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+registrar_marco('tempo_primeira_pintura')
+
+# ============================================
+# IMPORTAÇÕES PESADAS (APÓS A PRIMEIRA PINTURA)
+# ============================================
+import pandas as pd
 
+import esteira
+from esteira import (
+    COLUNAS_ULTIMAS_DEMANDAS, FORMATOS_EXPORTACAO, LIMITE_BARRAS_DIARIAS,
+    LIMITE_PONTOS_GRAFICO, CacheLRU, amostrar_serie_diaria, fingerprint_dados,
+    formatos_exportacao_disponiveis, gerar_relatorio_pdf, paginar_demandas,
+    particionar, recortar_periodo, serializar_exportacao, substituir_nome_sre
+)
+from esteira.armazem import AGREGADOS_SQL, ArmazemSQLite
+from esteira.memoria import RegistroSessoes, medir_objeto
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from esteira.snapshot import chave_agregado, obter_agregado as obter_agregado_snapshot
+
+# Módulos usados só dentro dos gráficos e de algumas seções: importados no primeiro uso
+go = importar_sob_demanda('plotly.graph_objects')
+px = importar_sob_demanda('plotly.express')
+pytz = importar_sob_demanda('pytz')
+
+# ============================================
+# FUNÇÕES AUXILIARES
+# ============================================
 def criar_card_indicador_simples(valor, label, icone="📊"):
     """Cria card de indicador SIMPLES - sem delta"""
     if isinstance(valor, (int, float)):
@@ -456,213 +512,245 @@ def criar_card_indicador_simples(valor, label, icone="📊"):
     </div>
     '''
 
-def calcular_hash_arquivo(conteudo):
-    """Calcula hash do conteúdo do arquivo para detectar mudanças"""
-    return hashlib.md5(conteudo).hexdigest()
+def selecionar_janela_datas(serie_dia, key):
+    """Slider de período (zoom) para séries diárias; retorna a série recortada"""
+    if len(serie_dia) < 2:
+        return serie_dia
+
+    data_min = serie_dia['Data'].min()
+    data_max = serie_dia['Data'].max()
+
+    if data_min == data_max:
+        return serie_dia
+
+    data_ini, data_fim = st.slider(
+        "🔍 Período exibido (reduza para ver todos os pontos):",
+        min_value=data_min,
+        max_value=data_max,
+        value=(data_min, data_max),
+        format="DD/MM/YYYY",
+        key=f"{key}_{data_min}_{data_max}"
+    )
+
+    return serie_dia[(serie_dia['Data'] >= data_ini) & (serie_dia['Data'] <= data_fim)]
 
 # ============================================
 # FUNÇÃO PRINCIPAL DE CARREGAMENTO DE DADOS (ADAPTADA)
 # ============================================
-@st.cache_data(ttl=300)
-def carregar_dados(uploaded_file=None, caminho_arquivo=None):
-    """Carrega e processa os dados - Adaptado para o formato do arquivo ADMS"""
-    try:
-        if uploaded_file:
-            conteudo_bytes = uploaded_file.getvalue()
-            conteudo = conteudo_bytes.decode('utf-8-sig')
-        elif caminho_arquivo and os.path.exists(caminho_arquivo):
-            with open(caminho_arquivo, 'r', encoding='utf-8-sig') as f:
-                conteudo = f.read()
-            conteudo_bytes = conteudo.encode('utf-8')
-        else:
-            return None, "Nenhum arquivo fornecido", None
-        
-        lines = conteudo.split('\n')
-        
-        # ============================================
-        # 🔧 BUSCA MAIS FLEXÍVEL PELO CABEÇALHO
-        # ============================================
-        header_line = None
-        for i, line in enumerate(lines):
-            # Remove caracteres invisíveis e procura por "Chamado"
-            line_clean = line.strip().strip('\ufeff')
-            if '"Chamado"' in line_clean and '"Tipo Chamado"' in line_clean:
-                header_line = i
-                break
-        
-        if header_line is None:
-            for i, line in enumerate(lines):
-                line_clean = line.strip().strip('\ufeff')
-                if '"Chamado"' in line_clean:
-                    header_line = i
-                    break
-        
-        if header_line is None:
-            return None, "Formato de arquivo inválido - cabeçalho não encontrado", None
-        
-        # Usa a linha do cabeçalho encontrada
-        data_str = '\n'.join(lines[header_line:])
-        df = pd.read_csv(io.StringIO(data_str), quotechar='"')
-        
-        # ============================================
-        # 🔧 MAPEAMENTO DE COLUNAS MAIS ROBUSTO
-        # ============================================
-        col_mapping = {
-            'Chamado': 'Chamado',
-            'Tipo Chamado': 'Tipo_Chamado',
-            'Responsável': 'Responsável',
-            'Status': 'Status',
-            'Criado': 'Criado',
-            'Modificado': 'Modificado',
-            'Modificado por': 'Modificado_por',
-            'Prioridade': 'Prioridade',
-            'Sincronização': 'Sincronização',
-            'SRE': 'SRE',
-            'Empresa': 'Empresa',
-            'Revisões': 'Revisões',
-            'Motivo Revisão': 'Motivo_Revisao',
-            'Retorno Cliente': 'Retorno_Cliente'
-        }
-        
-        # Renomeia apenas colunas que existem
-        for old, new in col_mapping.items():
-            if old in df.columns:
-                df = df.rename(columns={old: new})
-        
-        # ============================================
-        # 🔧 PROCESSAMENTO DE DATAS COM FLEXIBILIDADE
-        # ============================================
-        date_columns = ['Criado', 'Modificado', 'Vencimento']
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        # ============================================
-        # 🔧 CRIAÇÃO DE COLUNAS DE DATA
-        # ============================================
-        if 'Criado' in df.columns:
-            df['Ano'] = df['Criado'].dt.year
-            df['Mês'] = df['Criado'].dt.month
-            df['Mês_Num'] = df['Criado'].dt.month
-            df['Dia'] = df['Criado'].dt.day
-            df['Hora'] = df['Criado'].dt.hour
-            df['Mês_Ano'] = df['Criado'].dt.strftime('%b/%Y')
-            df['Nome_Mês'] = df['Criado'].dt.month.map({
-                1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr',
-                5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
-                9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
-            })
-            df['Nome_Mês_Completo'] = df['Criado'].dt.month.map({
-                1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
-                5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
-                9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
-            })
-            df['Ano_Mês'] = df['Criado'].dt.strftime('%Y-%m')
-        
-        # ============================================
-        # 🔧 PROCESSAMENTO DO RESPONSÁVEL
-        # ============================================
-        if 'Responsável' in df.columns:
-            df['Responsável_Formatado'] = df['Responsável'].apply(formatar_nome_responsavel)
-        
-        # ============================================
-        # 🔧 PROCESSAMENTO DE REVISÕES
-        # ============================================
-        if 'Revisões' in df.columns:
-            df['Revisões'] = pd.to_numeric(df['Revisões'], errors='coerce').fillna(0).astype(int)
-        
-        # ============================================
-        # 🔧 PROCESSAMENTO DE EMPRESA (remove espaços extras)
-        # ============================================
-        if 'Empresa' in df.columns:
-            df['Empresa'] = df['Empresa'].astype(str).str.strip()
-        
-        # ============================================
-        # 🔧 PROCESSAMENTO DE SINCRONIZAÇÃO (remove espaços)
-        # ============================================
-        if 'Sincronização' in df.columns:
-            df['Sincronização'] = df['Sincronização'].astype(str).str.strip()
-        
-        hash_conteudo = calcular_hash_arquivo(conteudo_bytes)
-        timestamp = time.time()
-        
-        return df, "✅ Dados carregados com sucesso", f"{hash_conteudo}_{timestamp}"
-    
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return None, f"Erro: {str(e)}", None
-
-def encontrar_arquivo_dados():
-    """Tenta encontrar o arquivo de dados em vários caminhos possíveis"""
-    if os.path.exists(CAMINHO_ARQUIVO_PRINCIPAL):
-        return CAMINHO_ARQUIVO_PRINCIPAL
-    
-    for caminho in CAMINHOS_ALTERNATIVOS:
-        if os.path.exists(caminho):
-            return caminho
-    
-    return None
+@st.cache_resource(show_spinner=False)
+def obter_cache_carregamento():
+    """Bases processadas por conteúdo do arquivo, compartilhadas entre sessões do processo"""
+    return CacheLRU(max_entradas=8, max_bytes=512 * 1024 ** 2)
 
-def verificar_atualizacao_arquivo():
-    """Verifica se o arquivo foi modificado desde a última carga"""
-    caminho_arquivo = encontrar_arquivo_dados()
-    
-    if caminho_arquivo and os.path.exists(caminho_arquivo):
-        if 'ultima_modificacao' not in st.session_state:
-            st.session_state.ultima_modificacao = os.path.getmtime(caminho_arquivo)
-            return False
-        
-        modificacao_atual = os.path.getmtime(caminho_arquivo)
-        
-        if modificacao_atual > st.session_state.ultima_modificacao:
-            st.session_state.ultima_modificacao = modificacao_atual
-            return True
-    
-    return False
+def carregar_dados(caminho_arquivo=None, conteudo=None):
+    """Base processada (arquivo, diretório de exports ou upload) em cache pelo conteúdo, sem TTL"""
+    return esteira.carregar_dados_em_cache(obter_cache_carregamento(), caminho_arquivo=caminho_arquivo, conteudo=conteudo)
 
-def verificar_e_atualizar_arquivo():
-    """Verifica se o arquivo local foi modificado e atualiza se necessário"""
-    caminho_arquivo = encontrar_arquivo_dados()
-    
-    if caminho_arquivo and os.path.exists(caminho_arquivo):
-        if 'ultima_modificacao' not in st.session_state:
-            st.session_state.ultima_modificacao = os.path.getmtime(caminho_arquivo)
-            return False
-        
-        modificacao_atual = os.path.getmtime(caminho_arquivo)
-        
-        if (modificacao_atual > st.session_state.ultima_modificacao and 
-            st.session_state.df_original is not None):
-            
-            with open(caminho_arquivo, 'rb') as f:
-                conteudo_atual = f.read()
-            hash_atual = calcular_hash_arquivo(conteudo_atual)
-            
-            if 'file_hash' not in st.session_state or hash_atual != st.session_state.file_hash:
-                st.session_state.ultima_modificacao = modificacao_atual
-                return True
-        
-        st.session_state.ultima_modificacao = modificacao_atual
-    
-    return False
+def obter_agregado(nome, df, **parametros):
+    """
+    Agregado de uma aba: vem do snapshot enquanto a base não for filtrada na
+    barra lateral; filtrada, vira consulta SQL quando a base veio do armazém SQLite
+    """
+    agregados = st.session_state.get('agregados_snapshot')
+    with medir(f"Agregado {nome}", linhas=len(df)) as medicao:
+        if df is not st.session_state.df_original:
+            agregados = None
+            if (nome in AGREGADOS_SQL and df is st.session_state.df_filtrado
+                    and st.session_state.get('origem_base') == 'sqlite'):
+                return obter_armazem().agregar(nome, st.session_state.filtros_sidebar, **parametros)
+        medicao['cache'] = 'acerto' if agregados and chave_agregado(nome, **parametros) in agregados else 'falha'
+        return obter_agregado_snapshot(agregados, nome, df, **parametros)
+
+@st.cache_resource(show_spinner=False)
+def obter_monitor_arquivo():
+    """Monitor único por processo do arquivo local (thread em segundo plano)"""
+    return esteira.MonitorArquivo().iniciar()
+
+@st.cache_resource(show_spinner=False)
+def obter_armazem():
+    """Armazém SQLite opcional (ativo quando o arquivo existe; python -m esteira.armazem)"""
+    return ArmazemSQLite()
+
+@st.cache_resource(show_spinner=False)
+def obter_repositorio_base():
+    """Versão atual da base local, compartilhada pelas sessões e recarregada em segundo plano"""
+    return esteira.RepositorioBase(obter_monitor_arquivo(), carregar=carregar_dados, armazem=obter_armazem())
+
+def adotar_versao_base(versao):
+    """Aponta a sessão para uma versão da base local (só troca referências, não recarrega)"""
+    st.session_state.df_original = versao.df
+    st.session_state.df_filtrado = versao.df
+    st.session_state.agregados_snapshot = versao.agregados
+    st.session_state.arquivo_atual = versao.caminho
+    st.session_state.file_hash = versao.file_hash
+    st.session_state.versao_arquivo = versao.versao_arquivo
+    st.session_state.versao_base = versao.numero
+    st.session_state.origem_base = versao.origem
+    st.session_state.ultima_atualizacao = get_horario_brasilia()
+
+def arquivo_local_atualizado():
+    """O arquivo local mudou depois que esta sessão o carregou (comparação de versões, sem I/O)"""
+    versao_sessao = st.session_state.get('versao_arquivo')
+    return versao_sessao is not None and obter_monitor_arquivo().versao > versao_sessao
+
+def acompanhar_recarga_base():
+    """Aguarda a recarga pedida em 'Recarregar Local' sem bloquear o painel"""
+    recarga = st.session_state.get('recarga_base')
+    if recarga is None:
+        return
+    if not recarga.done():
+        st.caption("⏳ Carregando a nova versão em segundo plano...")
+        return
+
+    del st.session_state.recarga_base
+    if recarga.exception() is not None:
+        st.session_state.erro_recarga = str(recarga.exception())
+    else:
+        # Pode ser mais nova que a do Future, se o arquivo mudou de novo durante a carga
+        adotar_versao_base(obter_repositorio_base().atual)
+    st.rerun()
+
+if hasattr(st, 'fragment'):
+    acompanhar_recarga_base = st.fragment(run_every=1)(acompanhar_recarga_base)
 
 def limpar_sessao_dados():
     """Limpa todos os dados da sessão relacionados ao upload"""
     keys_to_clear = [
         'df_original', 'df_filtrado', 'arquivo_atual',
-        'ultima_modificacao', 'file_hash', 'uploaded_file_name',
-        'ultima_atualizacao'
+        'versao_arquivo', 'versao_base', 'origem_base', 'file_hash', 'uploaded_file_name',
+        'ultima_atualizacao', 'agregados_snapshot'
     ]
     
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
 
+# ============================================
+# MEMÓRIA POR SESSÃO E LIMITE BRANDO
+# ============================================
+def sessao_conectada(id_sessao):
+    """A sessão do Streamlit segue conectada (sem runtime, como no AppTest, vale sempre)"""
+    return not Runtime.exists() or Runtime.instance().is_active_session(id_sessao)
+
+@st.cache_resource(show_spinner=False)
+def obter_registro_sessoes():
+    """Sessões ativas do processo (estado e último acesso) para medir e liberar memória"""
+    return RegistroSessoes(ativa=sessao_conectada)
+
+def registrar_acesso_sessao():
+    """
+    Registra o acesso desta sessão com o SessionState dela: o st.session_state
+    de cada execução é um invólucro descartado quando a execução termina
+    """
+    contexto = get_script_run_ctx()
+    if contexto is not None:
+        estado = getattr(contexto.session_state, '_state', contexto.session_state)
+        obter_registro_sessoes().tocar(st.session_state.id_sessao, estado, id_runtime=contexto.session_id)
+
+def caches_processo():
+    return {
+        'carregamento': obter_cache_carregamento(),
+        'ciclo': obter_cache_ciclo(),
+        'sla': obter_cache_sla(),
+        'textos': obter_cache_textos(),
+        'figuras': obter_cache_figuras(),
+        'exportacoes': obter_cache_exportacoes(),
+        'relatorios': obter_cache_relatorios()
+    }
+
+def liberar_sessao_ociosa(estado):
+    """
+    Solta as bases de uma sessão ociosa: o recorte é refeito na próxima
+    interação e a base local, readotada do repositório (uploads são mantidos)
+    """
+    valores = estado.filtered_state
+    liberou = False
+    if valores.get('df_filtrado') is not None:
+        estado['df_filtrado'] = None
+        liberou = True
+    if valores.get('versao_base') is not None and valores.get('df_original') is not None:
+        estado['df_original'] = None
+        estado['agregados_snapshot'] = None
+        liberou = True
+    return liberou
+
+def relatorio_memoria():
+    """Relatório de memória do processo, com a base local atual contada à parte"""
+    relatorio = obter_registro_sessoes().relatorio(caches_processo())
+    versao = obter_repositorio_base().atual
+    relatorio['base_local'] = None if versao is None else {
+        'versao': versao.numero, 'linhas': len(versao.df), 'bytes': medir_objeto(versao.df)
+    }
+    relatorio['limite_bytes'] = LIMITE_MEMORIA_MB * 1024 ** 2
+    return relatorio
+
+def exibir_painel_memoria():
+    """Visão de administração (?admin=1): memória por sessão, por cache e do processo"""
+    with st.expander("🧠 Memória", expanded=False):
+        relatorio = relatorio_memoria()
+        mb = 1024 ** 2
+        col_rss, col_sessoes = st.columns(2)
+        with col_rss:
+            if relatorio['rss_bytes'] is not None:
+                st.metric("🖥️ RSS do processo", f"{relatorio['rss_bytes'] / mb:,.0f} MB",
+                          help=f"Limite brando: {LIMITE_MEMORIA_MB:,} MB")
+        with col_sessoes:
+            st.metric("👥 Sessões", len(relatorio['sessoes']),
+                      help=f"{relatorio['sessoes_liberadas']} liberadas por ociosidade")
+        
+        if relatorio['base_local']:
+            st.caption(f"Base local v{relatorio['base_local']['versao']} (compartilhada): "
+                       f"{relatorio['base_local']['bytes'] / mb:,.1f} MB")
+        
+        st.markdown("**Caches do processo:**")
+        st.dataframe(
+            pd.DataFrame(relatorio['caches']).assign(MB=lambda d: (d['bytes'] / mb).round(1))
+            .drop(columns=['bytes', 'limite_bytes']),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        st.markdown("**Sessões:**")
+        if relatorio['sessoes']:
+            st.dataframe(
+                pd.DataFrame(relatorio['sessoes']).assign(
+                    exclusivos_MB=lambda d: (d['bytes_exclusivos'] / mb).round(1),
+                    compartilhados_MB=lambda d: (d['bytes_compartilhados'] / mb).round(1)
+                ).drop(columns=['itens', 'bytes_exclusivos', 'bytes_compartilhados']),
+                use_container_width=True,
+                hide_index=True
+            )
+            sessao_atual = next((s for s in relatorio['sessoes'] if s['sessao'] == st.session_state.id_sessao), None)
+            if sessao_atual and sessao_atual['itens']:
+                st.markdown("**Esta sessão:**")
+                st.dataframe(
+                    pd.DataFrame(sessao_atual['itens']).assign(MB=lambda d: (d['bytes'] / mb).round(2))
+                    .drop(columns='bytes'),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        
+        col_exportar, col_liberar = st.columns(2)
+        with col_exportar:
+            st.download_button(
+                "📥 Exportar JSON",
+                data=json.dumps(relatorio, ensure_ascii=False, indent=2, default=str),
+                file_name=f"memoria_esteira_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                use_container_width=True,
+                key="btn_exportar_memoria"
+            )
+        with col_liberar:
+            if st.button("🧹 Liberar ociosas", use_container_width=True, key="btn_liberar_memoria"):
+                liberadas = obter_registro_sessoes().liberar_ociosas(
+                    SESSAO_OCIOSA_MINUTOS * 60, liberar_sessao_ociosa
+                )
+                st.toast(f"🧹 {len(liberadas)} sessões ociosas liberadas")
+
 def get_horario_brasilia():
     """Retorna o horário atual de Brasília"""
     try:
-        tz = timezone('America/Sao_Paulo')
+        tz = pytz.timezone('America/Sao_Paulo')
         return datetime.now(tz).strftime('%d/%m/%Y %H:%M:%S')
     except:
         return datetime.now().strftime('%d/%m/%Y %H:%M:%S')
@@ -682,8 +770,7 @@ def criar_popup_indicadores(df):
     }
     nome_mes_pt = meses_pt.get(nome_mes, nome_mes)
     
-    df_mes = df[(df['Criado'].dt.month == mes_atual) & 
-                (df['Criado'].dt.year == ano_atual)].copy()
+    df_mes = recortar_periodo(df, ano=ano_atual, meses=[mes_atual]).copy()
     
     total_cards_mes = len(df_mes)
     cards_validados = len(df_mes[df_mes['Status'] == 'Sincronizado'])
@@ -696,8 +783,7 @@ def criar_popup_indicadores(df):
     mes_anterior = mes_atual - 1 if mes_atual > 1 else 12
     ano_anterior = ano_atual if mes_atual > 1 else ano_atual - 1
     
-    df_mes_anterior = df[(df['Criado'].dt.month == mes_anterior) & 
-                         (df['Criado'].dt.year == ano_anterior)].copy()
+    df_mes_anterior = recortar_periodo(df, ano=ano_anterior, meses=[mes_anterior]).copy()
     
     cards_validados_anterior = len(df_mes_anterior[df_mes_anterior['Status'] == 'Sincronizado'])
     
@@ -883,97 +969,6 @@ def criar_popup_indicadores(df):
     
     return popup_html
 
-def calcular_taxa_retorno_sre(df, sre_nome):
-    """Calcula taxa de retorno específica para um SRE"""
-    df_sre = df[df['SRE'] == sre_nome].copy()
-    
-    if len(df_sre) == 0:
-        return 0, 0, 0
-    
-    total_cards = len(df_sre)
-    
-    if 'Revisões' in df_sre.columns:
-        cards_com_revisoes = len(df_sre[df_sre['Revisões'] > 0])
-        taxa_retorno = (cards_com_revisoes / total_cards * 100) if total_cards > 0 else 0
-    else:
-        taxa_retorno = 0
-        cards_com_revisoes = 0
-    
-    cards_sincronizados = len(df_sre[df_sre['Status'] == 'Sincronizado'])
-    
-    return taxa_retorno, cards_com_revisoes, cards_sincronizados
-
-def analisar_tendencia_mensal_sre(df, sre_nome):
-    """Analisa tendência mensal de sincronizações de um SRE"""
-    df_sre = df[df['SRE'] == sre_nome].copy()
-    
-    if len(df_sre) == 0 or 'Criado' not in df_sre.columns:
-        return None
-    
-    df_sre['Mes_Ano'] = df_sre['Criado'].dt.strftime('%Y-%m')
-    
-    sinc_mes = df_sre[df_sre['Status'] == 'Sincronizado'].groupby('Mes_Ano').size().reset_index()
-    sinc_mes.columns = ['Mes_Ano', 'Sincronizados']
-    
-    total_mes = df_sre.groupby('Mes_Ano').size().reset_index()
-    total_mes.columns = ['Mes_Ano', 'Total']
-    
-    dados_mes = pd.merge(total_mes, sinc_mes, on='Mes_Ano', how='left').fillna(0)
-    
-    dados_mes = dados_mes.sort_values('Mes_Ano')
-    
-    return dados_mes
-
-# ============================================
-# FUNÇÕES DO MAPA - PROCESSAMENTO DE DADOS
-# ============================================
-def processar_dados_mapa(df, empresas_selecionadas=None, ano_filtro=None, mes_filtro=None):
-    """Processa os dados para gerar as métricas do mapa"""
-    
-    # Filtrar apenas sincronizados
-    df_sinc = df[df['Status'] == 'Sincronizado'].copy()
-    
-    # Aplicar filtros de data
-    if ano_filtro and ano_filtro != 'Todos':
-        df_sinc = df_sinc[df_sinc['Ano'] == int(ano_filtro)]
-    
-    if mes_filtro and mes_filtro != 'Todos':
-        df_sinc = df_sinc[df_sinc['Mês'] == int(mes_filtro)]
-    
-    # Filtrar empresas selecionadas
-    if empresas_selecionadas and 'Todas' not in empresas_selecionadas:
-        df_sinc = df_sinc[df_sinc['Empresa'].isin(empresas_selecionadas)]
-    
-    # Contar sincronismos por empresa
-    sinc_por_empresa = df_sinc['Empresa'].value_counts().reset_index()
-    sinc_por_empresa.columns = ['Empresa', 'Sincronismos']
-    
-    # Preparar dados para o mapa
-    dados_mapa = []
-    total_sinc = 0
-    
-    for empresa, info in MAPEAMENTO_EMPRESAS.items():
-        mask = sinc_por_empresa['Empresa'] == empresa
-        qtd = int(sinc_por_empresa[mask]['Sincronismos'].values[0]) if mask.any() else 0
-        
-        if empresas_selecionadas and 'Todas' not in empresas_selecionadas:
-            if empresa not in empresas_selecionadas:
-                continue
-        
-        dados_mapa.append({
-            'sigla': info['sigla'],
-            'estado': info['estado'],
-            'regiao': info['regiao'],
-            'empresa': empresa,
-            'empresa_nome': info['nome_completo'],
-            'sincronismos': qtd,
-            'latitude': info['latitude'],
-            'longitude': info['longitude']
-        })
-        total_sinc += qtd
-    
-    return pd.DataFrame(dados_mapa), total_sinc
-
 # ============================================
 # FUNÇÕES DO MAPA FOLIUM
 # ============================================
@@ -1017,7 +1012,7 @@ def criar_mapa_folium(df_mapa):
     - Legenda visual
     """
     try:
-        import folium
+        folium = importar_medindo('folium')
     except ImportError:
         st.error("⚠️ Biblioteca 'folium' não instalada. Execute: pip install folium")
         return None
@@ -1341,116 +1336,994 @@ def criar_grafico_barras(df_mapa):
 
 
 # ============================================
-# SIDEBAR - FILTROS E CONTROLES
+# CACHE DE FIGURAS PLOTLY
 # ============================================
-with st.sidebar:
-    st.markdown(f"""
-    <div style="text-align: center; padding: 1rem 0;">
-        <h3 style="color: {COR_AZUL_ESCURO}; margin: 0;">⚙️ Painel de Controle</h3>
-        <p style="color: {COR_CINZA_TEXTO}; margin: 0; font-size: 0.85rem;">Filtros e Configurações</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    if 'df_original' not in st.session_state:
-        st.session_state.df_original = None
-        st.session_state.df_filtrado = None
-        st.session_state.arquivo_atual = None
-        st.session_state.file_hash = None
-        st.session_state.uploaded_file_name = None
-        st.session_state.ultima_atualizacao = None
-    
-    if st.session_state.df_original is not None:
-        with st.container():
-            st.markdown('<div class="sidebar-section">', unsafe_allow_html=True)
-            st.markdown("**🔍 Filtros de Análise**")
-            
-            df = st.session_state.df_original.copy()
+@st.cache_resource(show_spinner=False)
+def obter_cache_figuras():
+    """Cache de figuras compartilhado entre sessões do processo"""
+    return CacheLRU(max_entradas=256)
+
+
+def obter_figura(nome, construtor, *dados, **parametros):
+    """
+    Retorna a especificação da figura (dict já em tipos JSON) do cache ou a
+    constrói via `construtor(*dados, **parametros)`. A chave é (nome,
+    fingerprint dos dados, parâmetros). O dict vai direto para st.plotly_chart,
+    que o serializa sem recriar nem validar um go.Figure a cada rerun.
+    Não alterar o dict devolvido: ele é compartilhado entre as sessões.
+    """
+    with medir(f"Figura {nome}") as medicao:
+        chave = (nome, fingerprint_dados(*dados), repr(sorted(parametros.items())))
+        cache = obter_cache_figuras()
+
+        especificacao = cache.obter(chave)
+        medicao['cache'] = 'falha' if especificacao is None else 'acerto'
+        if especificacao is None:
+            fig = construtor(*dados, **parametros)
+            if fig is None:
+                return None
+            especificacao = json.loads(fig.to_json(validate=False))
+            cache.guardar(chave, especificacao)
+        return especificacao
+
+
+# ============================================
+# EXPORTAÇÃO SOB DEMANDA (CSV / EXCEL / PARQUET)
+# ============================================
+def download_diferido_suportado():
+    """Verifica se st.download_button aceita um callable (geração só no clique)"""
+    try:
+        from streamlit.elements.widgets import button as modulo_botao
+        return 'Callable' in str(getattr(modulo_botao, 'DownloadButtonDataType', ''))
+    except Exception:
+        return False
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_exportacoes():
+    """Cache de arquivos exportados compartilhado entre sessões do processo"""
+    return CacheLRU(max_entradas=32)
+
+def chave_filtros_sidebar():
+    """Identifica a base carregada + filtros da barra lateral para memoizar exportações"""
+    chaves_filtro = [
+        'filtro_ano', 'filtro_mes', 'filtro_responsavel', 'busca_chamado',
+        'filtro_status', 'filtro_tipo', 'filtro_empresa', 'filtro_sre'
+    ]
+    return (st.session_state.get('file_hash'),) + tuple(
+        str(st.session_state.get(chave)) for chave in chaves_filtro
+    )
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_ciclo():
+    """Tempo de ciclo por (versão da base, filtros da barra lateral), compartilhado entre sessões"""
+    return CacheLRU(max_entradas=32)
+
+def obter_tempo_ciclo(df):
+    """Histogramas e percentis do tempo de ciclo: calculados uma vez por versão da base e filtros"""
+    cache = obter_cache_ciclo()
+    chave = chave_filtros_sidebar()
+    ciclo = cache.obter(chave)
+    if ciclo is None:
+        ciclo = obter_agregado('tempo_ciclo', df)
+        cache.guardar(chave, ciclo)
+    return ciclo
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_sla():
+    """Índices de SLA das bases enviadas por upload, por hash do conteúdo"""
+    return CacheLRU(max_entradas=8)
+
+def obter_indice_sla(df):
+    """Índice de SLA da base: o da versão local (atualizado a cada recarga) ou, no upload, montado uma vez por arquivo"""
+    versao = obter_repositorio_base().atual
+    if versao is not None and versao.df is df and versao.sla is not None:
+        return versao.sla
+    cache = obter_cache_sla()
+    chave = st.session_state.get('file_hash')
+    indice = cache.obter(chave)
+    if indice is None:
+        indice = esteira.IndiceSLA.da_base(df)
+        cache.guardar(chave, indice)
+    return indice
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_textos():
+    """Índices invertidos de texto das bases enviadas por upload, por hash do conteúdo"""
+    return CacheLRU(max_entradas=8)
+
+def obter_indices_textos(df):
+    """Índices de Motivo Revisão/ChangeSet: os montados na carga da versão local ou, no upload, uma vez por arquivo"""
+    versao = obter_repositorio_base().atual
+    if versao is not None and versao.df is df and versao.textos is not None:
+        return versao.textos
+    cache = obter_cache_textos()
+    chave = st.session_state.get('file_hash')
+    indices = cache.obter(chave)
+    if indices is None:
+        indices = esteira.indexar_textos(df)
+        cache.guardar(chave, indices)
+    return indices
+
+def exibir_painel_sla(indice):
+    """Cartões abertos vencidos e a vencer (buscas binárias no índice por Vencimento)"""
+    with medir("Painel SLA", linhas=len(indice)):
+        agora = agora_brasilia()
+        with st.expander("🚨 SLA - CARTÕES ABERTOS EM RISCO", expanded=False):
+            horizonte = st.selectbox(
+                "⏰ Vencendo nas próximas:",
+                options=[4, 8, 24, 48, 72, 168],
+                index=2,
+                format_func=lambda horas: f"{horas} horas",
+                key="sla_horizonte"
+            )
+            resumo = indice.resumo(agora, horizonte)
             
-            if 'Ano' in df.columns:
-                anos_disponiveis = sorted(df['Ano'].dropna().unique().astype(int))
-                if anos_disponiveis:
-                    anos_opcoes = ['Todos os Anos'] + list(anos_disponiveis)
-                    ano_selecionado = st.selectbox(
-                        "📅 Ano",
-                        options=anos_opcoes,
-                        key="filtro_ano"
-                    )
-                    if ano_selecionado != 'Todos os Anos':
-                        df = df[df['Ano'] == int(ano_selecionado)]
+            col_sla1, col_sla2, col_sla3 = st.columns(3)
+            with col_sla1:
+                st.metric("📂 Abertos com vencimento", f"{resumo['abertos']:,}")
+            with col_sla2:
+                st.metric("🔴 Vencidos", f"{resumo['vencidos']:,}")
+            with col_sla3:
+                st.metric(f"🟠 Vencendo em {horizonte} h", f"{resumo['vencendo']:,}")
             
-            if 'Mês' in df.columns:
-                meses_disponiveis = sorted(df['Mês'].dropna().unique().astype(int))
-                if meses_disponiveis:
-                    meses_opcoes = ['Todos os Meses'] + [str(m) for m in meses_disponiveis]
-                    mes_selecionado = st.selectbox(
-                        "📆 Mês",
-                        options=meses_opcoes,
-                        key="filtro_mes"
-                    )
-                    if mes_selecionado != 'Todos os Meses':
-                        df = df[df['Mês'] == int(mes_selecionado)]
+            if resumo['vencidos']:
+                col_sla_sre, col_sla_empresa = st.columns(2)
+                for coluna_sla, rotulo_sla, col_sla in [('SRE', '🔧 Vencidos por SRE', col_sla_sre),
+                                                        ('Empresa', '🏢 Vencidos por Empresa', col_sla_empresa)]:
+                    if coluna_sla in indice.cartoes.columns:
+                        with col_sla:
+                            st.markdown(f"**{rotulo_sla}**")
+                            st.dataframe(indice.vencidos_por(coluna_sla, agora).rename('Vencidos'),
+                                         use_container_width=True)
             
-            if 'Responsável_Formatado' in df.columns:
-                responsaveis = ['Todos'] + sorted(df['Responsável_Formatado'].dropna().unique())
-                responsavel_selecionado = st.selectbox(
-                    "👤 Responsável",
-                    options=responsaveis,
-                    key="filtro_responsavel"
+            em_risco = pd.concat([indice.vencidos(agora), indice.vencendo(agora, horizonte)])
+            if em_risco.empty:
+                st.success("✅ Nenhum cartão aberto vencido ou vencendo no período.")
+            else:
+                em_risco = em_risco.assign(
+                    Situação=(em_risco['Vencimento'] < agora).map({True: 'Vencido', False: 'Vencendo'}),
+                    Prazo=(em_risco['Vencimento'] - agora).map(
+                        lambda prazo: esteira.formatar_duracao(abs(prazo.total_seconds()) / 60))
                 )
-                if responsavel_selecionado != 'Todos':
-                    df = df[df['Responsável_Formatado'] == responsavel_selecionado]
-            
-            busca_chamado = st.text_input(
-                "🔎 Buscar Chamado",
-                placeholder="Digite número do chamado...",
-                key="busca_chamado"
+                st.dataframe(em_risco, use_container_width=True, hide_index=True, height=min(400, 40 + 35 * len(em_risco)))
+            st.caption(f"🕒 Atualizado às {agora.strftime('%H:%M')} · recalculado a cada minuto")
+
+if hasattr(st, 'fragment'):
+    exibir_painel_sla = st.fragment(run_every=60)(exibir_painel_sla)
+
+def botao_download_sob_demanda(label, gerar_df, chave, nome_base, key):
+    """
+    Botão de download que só serializa os dados quando o usuário clica.
+    `gerar_df` é um callable sem argumentos; o resultado fica memoizado por
+    (chave, formato), onde `chave` deve identificar base + filtros aplicados.
+    """
+    formatos = formatos_exportacao_disponiveis()
+
+    col_botao, col_formato = st.columns([3, 1])
+
+    with col_formato:
+        formato = st.selectbox(
+            "Formato",
+            options=formatos,
+            key=f"{key}_formato",
+            label_visibility="collapsed"
+        )
+
+    extensao, mime, _ = FORMATOS_EXPORTACAO[formato]
+    chave_completa = (nome_base, chave, formato)
+    cache = obter_cache_exportacoes()
+
+    def gerar_arquivo():
+        dados = cache.obter(chave_completa)
+        if dados is None:
+            dados = serializar_exportacao(gerar_df(), formato, nome_base)
+            cache.guardar(chave_completa, dados)
+        return dados
+
+    with col_botao:
+        if not download_diferido_suportado():
+            # Streamlit antigo: exige os bytes já prontos, então pede um clique antes
+            if st.button(f"⚙️ Preparar: {label}", use_container_width=True, key=f"{key}_preparar"):
+                st.session_state[f"{key}_preparado"] = chave_completa
+            if st.session_state.get(f"{key}_preparado") != chave_completa:
+                return
+            dados = gerar_arquivo()
+        else:
+            dados = gerar_arquivo
+
+        st.download_button(
+            label=label,
+            data=dados,
+            file_name=f"{nome_base}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extensao}",
+            mime=mime,
+            use_container_width=True,
+            key=key
+        )
+
+
+# ============================================
+# RELATÓRIO PDF DA MANCHETE
+# ============================================
+@st.cache_resource(show_spinner=False)
+def obter_executor_relatorios():
+    """Executor de segundo plano para geração de PDFs, compartilhado no processo"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='relatorio_pdf')
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_relatorios():
+    """Relatórios (Futures) por (hash da base, filtros, período)"""
+    return CacheLRU(max_entradas=16)
+
+def solicitar_relatorio_pdf(chave, dados):
+    """Dispara a geração em segundo plano, reaproveitando o relatório já pronto/em curso"""
+    cache = obter_cache_relatorios()
+    futuro = cache.obter(chave)
+    if futuro is None:
+        futuro = obter_executor_relatorios().submit(gerar_relatorio_pdf, dados)
+        cache.guardar(chave, futuro)
+    return futuro
+
+
+# ============================================
+# FUNÇÕES DE GRÁFICOS
+# ============================================
+def criar_grafico_evolucao_mensal(demandas_completas, ano_selecionado):
+    """Gráfico de linha com as demandas de cada mês do ano"""
+    ordem_meses_abreviados = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+                             'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+    fig_mes = go.Figure()
+
+    fig_mes.add_trace(go.Scatter(
+        x=demandas_completas['Nome_Mês'],
+        y=demandas_completas['Quantidade'],
+        mode='lines+markers+text',
+        name='Demandas',
+        line=dict(color=COR_AZUL_ESCURO, width=3),
+        marker=dict(size=10, color=COR_AZUL_PETROLEO),
+        text=demandas_completas['Quantidade'],
+        textposition='top center',
+        textfont=dict(size=12, color=COR_AZUL_ESCURO)
+    ))
+
+    fig_mes.update_layout(
+        title=f"Demandas em {ano_selecionado}",
+        xaxis_title="Mês",
+        yaxis_title="Número de Demandas",
+        plot_bgcolor=COR_BRANCO,
+        height=450,
+        showlegend=False,
+        margin=dict(t=50, b=50, l=50, r=50),
+        xaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            tickmode='array',
+            tickvals=list(range(12)),
+            ticktext=ordem_meses_abreviados
+        ),
+        yaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            rangemode='tozero'
+        )
+    )
+
+    total_ano = int(demandas_completas['Quantidade'].sum())
+    fig_mes.add_annotation(
+        x=0.5, y=0.95,
+        xref="paper", yref="paper",
+        text=f"Total no ano: {total_ano:,} demandas",
+        showarrow=False,
+        font=dict(size=12, color=COR_AZUL_ESCURO, weight="bold"),
+        bgcolor="rgba(255,255,255,0.9)",
+        bordercolor=COR_AZUL_ESCURO,
+        borderwidth=1,
+        borderpad=4
+    )
+
+    return fig_mes
+
+
+def criar_grafico_revisoes(revisoes_por_responsavel, titulo_rev):
+    """Gráfico de barras com os 15 responsáveis com mais revisões"""
+    fig_revisoes = go.Figure()
+
+    max_revisoes = revisoes_por_responsavel['Total_Revisões'].max()
+    min_revisoes = revisoes_por_responsavel['Total_Revisões'].min()
+
+    colors = []
+    for valor in revisoes_por_responsavel['Total_Revisões']:
+        if max_revisoes == min_revisoes:
+            colors.append(COR_VERMELHO)
+        else:
+            normalized = (valor - min_revisoes) / (max_revisoes - min_revisoes)
+            red = int(198 * normalized + 40 * (1 - normalized))
+            green = int(40 * normalized + 167 * (1 - normalized))
+            blue = int(40 * normalized + 69 * (1 - normalized))
+            colors.append(f'rgb({red}, {green}, {blue})')
+
+    fig_revisoes.add_trace(go.Bar(
+        x=revisoes_por_responsavel['Responsável'].head(15),
+        y=revisoes_por_responsavel['Total_Revisões'].head(15),
+        name='Total de Revisões',
+        text=revisoes_por_responsavel['Total_Revisões'].head(15),
+        textposition='outside',
+        marker_color=colors[:15],
+        marker_line_color=COR_PRETO_SUAVE,
+        marker_line_width=1.5,
+        opacity=0.8
+    ))
+
+    fig_revisoes.update_layout(
+        title=titulo_rev,
+        xaxis_title='Responsável',
+        yaxis_title='Total de Revisões',
+        plot_bgcolor=COR_BRANCO,
+        height=500,
+        showlegend=False,
+        margin=dict(t=50, b=100, l=50, r=50),
+        xaxis=dict(
+            tickangle=45,
+            gridcolor='rgba(0,0,0,0.05)'
+        ),
+        yaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)'
+        )
+    )
+
+    return fig_revisoes
+
+
+def criar_grafico_revisoes_categoria(revisoes_por_categoria, titulo_rev):
+    """Barras horizontais com as revisões por categoria do motivo"""
+    revisoes_por_categoria = revisoes_por_categoria.iloc[::-1]
+    fig_categorias = go.Figure(go.Bar(
+        x=revisoes_por_categoria['Total_Revisões'],
+        y=revisoes_por_categoria['Categoria'],
+        orientation='h',
+        text=revisoes_por_categoria['Total_Revisões'],
+        textposition='outside',
+        customdata=revisoes_por_categoria['Chamados_Com_Revisão'],
+        hovertemplate='<b>%{y}</b><br>Revisões: %{x}<br>Chamados revisados: %{customdata}<extra></extra>',
+        marker_color=COR_VERMELHO,
+        marker_line_color=COR_PRETO_SUAVE,
+        marker_line_width=1,
+        opacity=0.8
+    ))
+
+    fig_categorias.update_layout(
+        title=titulo_rev,
+        xaxis_title='Total de Revisões',
+        yaxis_title='',
+        plot_bgcolor=COR_BRANCO,
+        height=max(300, 36 * len(revisoes_por_categoria) + 120),
+        showlegend=False,
+        margin=dict(t=50, b=50, l=200, r=50),
+        xaxis=dict(gridcolor='rgba(0,0,0,0.05)')
+    )
+
+    return fig_categorias
+
+
+def criar_grafico_termos_motivo(termos, titulo):
+    """Barras horizontais com os termos mais frequentes nos motivos de revisão"""
+    termos = termos.iloc[::-1]
+    fig_termos = go.Figure(go.Bar(
+        x=termos['Cartões'],
+        y=termos['Termo'],
+        orientation='h',
+        text=termos['Cartões'],
+        textposition='outside',
+        marker_color=COR_AZUL_ESCURO,
+        marker_line_color=COR_PRETO_SUAVE,
+        marker_line_width=1,
+        opacity=0.85
+    ))
+
+    fig_termos.update_layout(
+        title=titulo,
+        xaxis_title='Cartões',
+        yaxis_title='',
+        plot_bgcolor=COR_BRANCO,
+        height=max(300, 32 * len(termos) + 120),
+        showlegend=False,
+        margin=dict(t=50, b=50, l=150, r=50),
+        xaxis=dict(gridcolor='rgba(0,0,0,0.05)')
+    )
+
+    return fig_termos
+
+
+def criar_grafico_histograma_ciclo(histograma, titulo):
+    """Gráfico de barras com os cartões em cada faixa de tempo de ciclo"""
+    total = histograma.sum()
+    fig_hist = go.Figure()
+
+    fig_hist.add_trace(go.Bar(
+        x=list(histograma.index),
+        y=histograma.values,
+        text=[f"{v / total:.0%}" if total else '' for v in histograma.values],
+        textposition='outside',
+        marker_color=COR_AZUL_PETROLEO,
+        marker_line_color=COR_PRETO_SUAVE,
+        marker_line_width=1,
+        opacity=0.85,
+        hovertemplate='%{x}: %{y:,} cartões<extra></extra>'
+    ))
+
+    fig_hist.update_layout(
+        title=titulo,
+        xaxis_title='Tempo de ciclo',
+        yaxis_title='Cartões',
+        plot_bgcolor=COR_BRANCO,
+        height=420,
+        showlegend=False,
+        margin=dict(t=50, b=60, l=50, r=50),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.05)')
+    )
+
+    return fig_hist
+
+
+def criar_grafico_percentis_ciclo(tabela, dimensao):
+    """P50/P85/P95 do tempo de ciclo (em horas) por grupo: linhas por mês, barras nas demais dimensões"""
+    if dimensao == 'Mês':
+        dados = tabela
+    else:
+        dados = tabela.nlargest(15, 'Cartões').sort_values('P85', ascending=False)
+    cores = {'P50': COR_VERDE_ESCURO, 'P85': COR_LARANJA, 'P95': COR_VERMELHO}
+
+    fig_perc = go.Figure()
+    for coluna, cor in cores.items():
+        horas = dados[coluna] / 60
+        if dimensao == 'Mês':
+            fig_perc.add_trace(go.Scatter(
+                x=list(dados.index), y=horas, name=coluna, mode='lines+markers',
+                line=dict(color=cor, width=3), marker=dict(size=7),
+                hovertemplate=f'{coluna}: %{{y:,.1f}} h<extra></extra>'
+            ))
+        else:
+            fig_perc.add_trace(go.Bar(
+                x=list(dados.index), y=horas, name=coluna, marker_color=cor, opacity=0.85,
+                hovertemplate=f'{coluna}: %{{y:,.1f}} h<extra></extra>'
+            ))
+
+    fig_perc.update_layout(
+        title=f'Percentis do Tempo de Ciclo por {dimensao}',
+        xaxis_title=dimensao,
+        yaxis_title='Horas',
+        barmode='group',
+        plot_bgcolor=COR_BRANCO,
+        height=450,
+        margin=dict(t=50, b=100, l=50, r=50),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        xaxis=dict(tickangle=45 if dimensao != 'Mês' else 0, gridcolor='rgba(0,0,0,0.05)'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.05)')
+    )
+
+    return fig_perc
+
+
+def criar_grafico_sincronizacoes_dia(sinc_por_dia_recente, periodo_recente):
+    """Gráfico de barras com as sincronizações por dia"""
+    fig_dias = go.Figure()
+
+    max_quant = sinc_por_dia_recente['Quantidade'].max()
+    min_quant = sinc_por_dia_recente['Quantidade'].min()
+
+    colors = []
+    for valor in sinc_por_dia_recente['Quantidade']:
+        if max_quant == min_quant:
+            colors.append(COR_AZUL_ESCURO)
+        else:
+            normalized = (valor - min_quant) / (max_quant - min_quant)
+            red = int(0 * normalized + 0 * (1 - normalized))
+            green = int(89 * normalized + 89 * (1 - normalized))
+            blue = int(115 * normalized + 115 * (1 - normalized))
+            colors.append(f'rgb({red}, {green}, {blue})')
+
+    fig_dias.add_trace(go.Bar(
+        x=sinc_por_dia_recente['Data_Formatada'],
+        y=sinc_por_dia_recente['Quantidade'],
+        name='Sincronizações',
+        text=sinc_por_dia_recente['Quantidade'],
+        textposition='outside',
+        marker_color=colors,
+        marker_line_color=COR_AZUL_PETROLEO,
+        marker_line_width=1.5,
+        opacity=0.8
+    ))
+
+    fig_dias.update_layout(
+        title='Sincronizações por Dia (Período Recente)' if periodo_recente else 'Sincronizações por Dia',
+        xaxis_title='Data (Dia/Mês)',
+        yaxis_title='Quantidade de Sincronizações',
+        height=400,
+        plot_bgcolor=COR_BRANCO,
+        showlegend=False,
+        margin=dict(t=50, b=50, l=50, r=50),
+        xaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            tickangle=45
+        ),
+        yaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            rangemode='tozero'
+        )
+    )
+
+    return fig_dias
+
+
+def criar_grafico_serie_diaria(serie_dia, titulo, limite_pontos=LIMITE_PONTOS_GRAFICO):
+    """Série diária longa em WebGL (Scattergl), amostrada por LTTB para o orçamento de pontos"""
+    serie_plot = amostrar_serie_diaria(serie_dia, limite=limite_pontos)
+    amostrada = len(serie_plot) < len(serie_dia)
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=pd.to_datetime(serie_plot['Data']),
+        y=serie_plot['Quantidade'],
+        mode='lines' if amostrada else 'lines+markers',
+        name='Sincronizações',
+        line=dict(color=COR_AZUL_ESCURO, width=2),
+        marker=dict(size=5, color=COR_AZUL_PETROLEO),
+        hovertemplate='Data: %{x|%d/%m/%Y}<br>Sincronizações: %{y}<extra></extra>'
+    ))
+
+    if amostrada:
+        titulo += f" ({len(serie_plot):,} de {len(serie_dia):,} dias - reduza o período para ver todos os pontos)"
+
+    fig.update_layout(
+        title=titulo,
+        xaxis_title='Data',
+        yaxis_title='Quantidade de Sincronizações',
+        height=400,
+        plot_bgcolor=COR_BRANCO,
+        showlegend=False,
+        margin=dict(t=50, b=50, l=50, r=50),
+        xaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            tickformat='%d/%m/%Y'
+        ),
+        yaxis=dict(
+            gridcolor='rgba(0,0,0,0.05)',
+            rangemode='tozero'
+        )
+    )
+
+    return fig
+
+
+def criar_grafico_sre_dia(pivot_sre):
+    """Gráfico de barras empilhadas com as sincronizações diárias por SRE"""
+    fig_sre = go.Figure()
+
+    for sre in pivot_sre.columns[1:]:
+        fig_sre.add_trace(go.Bar(
+            x=pivot_sre['Data'],
+            y=pivot_sre[sre],
+            name=sre,
+            hovertemplate='Data: %{x|%d/%m/%Y}<br>SRE: ' + sre + '<br>Quantidade: %{y}<extra></extra>'
+        ))
+
+    fig_sre.update_layout(
+        title='Sincronizações por SRE (Stacked)',
+        barmode='stack',
+        height=400,
+        xaxis_title="Data",
+        yaxis_title="Quantidade de Sincronizações",
+        xaxis=dict(
+            tickformat='%d/%m',
+            tickangle=45
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    return fig_sre
+
+
+def criar_grafico_tipo_dia(pivot_tipo, top_tipos):
+    """Gráfico de linhas com a evolução diária dos tipos mais frequentes"""
+    fig_tipo = go.Figure()
+
+    for tipo in top_tipos:
+        if tipo in pivot_tipo.columns:
+            serie_tipo = amostrar_serie_diaria(
+                pivot_tipo[['Data', tipo]].rename(columns={tipo: 'Quantidade'})
             )
-            if busca_chamado:
-                df = df[df['Chamado'].astype(str).str.contains(busca_chamado, na=False)]
-            
-            if 'Status' in df.columns:
-                status_opcoes = ['Todos'] + sorted(df['Status'].dropna().unique())
-                status_selecionado = st.selectbox(
-                    "📊 Status",
-                    options=status_opcoes,
-                    key="filtro_status"
-                )
-                if status_selecionado != 'Todos':
-                    df = df[df['Status'] == status_selecionado]
+            fig_tipo.add_trace(go.Scattergl(
+                x=serie_tipo['Data'],
+                y=serie_tipo['Quantidade'],
+                mode='lines+markers' if len(serie_tipo) == len(pivot_tipo) else 'lines',
+                name=tipo,
+                hovertemplate='Data: %{x|%d/%m/%Y}<br>Tipo: ' + tipo + '<br>Quantidade: %{y}<extra></extra>'
+            ))
+
+    fig_tipo.update_layout(
+        title='Evolução dos 5 Tipos Mais Frequentes',
+        height=350,
+        xaxis_title="Data",
+        yaxis_title="Quantidade",
+        xaxis=dict(
+            tickformat='%d/%m',
+            tickangle=45
+        ),
+        showlegend=True
+    )
+
+    return fig_tipo
+
+
+def criar_grafico_empresa_dia(pivot_empresa, top_empresas):
+    """Gráfico de área empilhado com as sincronizações diárias por empresa"""
+    fig_empresa = go.Figure()
+
+    for empresa in top_empresas:
+        if empresa in pivot_empresa.columns:
+            fig_empresa.add_trace(go.Scatter(
+                x=pivot_empresa['Data'],
+                y=pivot_empresa[empresa],
+                mode='lines',
+                name=empresa,
+                stackgroup='one',
+                hovertemplate='Data: %{x|%d/%m/%Y}<br>Empresa: ' + empresa + '<br>Quantidade: %{y}<extra></extra>'
+            ))
+
+    fig_empresa.update_layout(
+        title='Sincronizações por Empresa (Top 5) - Gráfico de Área Empilhado',
+        height=350,
+        xaxis_title="Data",
+        yaxis_title="Quantidade",
+        xaxis=dict(
+            tickformat='%d/%m',
+            tickangle=45
+        ),
+        showlegend=True
+    )
+
+    return fig_empresa
+
+
+def criar_grafico_dia_semana(dados_dia):
+    """Gráfico de barras e taxa de sincronização por dia da semana"""
+    fig_dias = go.Figure()
+
+    fig_dias.add_trace(go.Bar(
+        x=dados_dia['Dia'],
+        y=dados_dia['Total_Demandas'],
+        name='Total Demandas',
+        marker_color=COR_AZUL_ESCURO,
+        text=dados_dia['Total_Demandas'],
+        textposition='auto'
+    ))
+
+    fig_dias.add_trace(go.Bar(
+        x=dados_dia['Dia'],
+        y=dados_dia['Sincronizados'],
+        name='Sincronizados',
+        marker_color=COR_VERDE_ESCURO,
+        text=dados_dia['Sincronizados'],
+        textposition='auto'
+    ))
+
+    fig_dias.add_trace(go.Scatter(
+        x=dados_dia['Dia'],
+        y=dados_dia['Taxa_Sinc'],
+        name='Taxa Sinc (%)',
+        yaxis='y2',
+        mode='lines+markers',
+        line=dict(color=COR_LARANJA, width=3),
+        marker=dict(size=8)
+    ))
+
+    fig_dias.update_layout(
+        title='Demandas e Sincronizações por Dia da Semana',
+        barmode='group',
+        yaxis=dict(title='Quantidade'),
+        yaxis2=dict(
+            title='Taxa Sinc (%)',
+            overlaying='y',
+            side='right',
+            range=[0, 100]
+        ),
+        height=400,
+        showlegend=True
+    )
+
+    return fig_dias
+
+
+def criar_grafico_horas(dados_hora, subtitulo_hora):
+    """Gráfico de linhas com demandas e sincronizações por hora do dia"""
+    fig_horas = go.Figure()
+
+    fig_horas.add_trace(go.Scatter(
+        x=dados_hora['Hora'],
+        y=dados_hora['Total_Demandas'],
+        name='Total Demandas',
+        mode='lines+markers',
+        line=dict(color=COR_AZUL_ESCURO, width=3),
+        marker=dict(size=8)
+    ))
+
+    fig_horas.add_trace(go.Scatter(
+        x=dados_hora['Hora'],
+        y=dados_hora['Sincronizados'],
+        name='Sincronizados',
+        mode='lines+markers',
+        line=dict(color=COR_VERDE_ESCURO, width=3),
+        marker=dict(size=8)
+    ))
+
+    if not dados_hora.empty:
+        pico_demanda = dados_hora.loc[dados_hora['Total_Demandas'].idxmax()]
+        pico_sinc = dados_hora.loc[dados_hora['Sincronizados'].idxmax()]
+
+        hora_pico_demanda = f"{int(pico_demanda['Hora'])}:00h"
+        hora_pico_sinc = f"{int(pico_sinc['Hora'])}:00h"
+
+        fig_horas.add_annotation(
+            x=pico_demanda['Hora'],
+            y=pico_demanda['Total_Demandas'],
+            text=f"Pico Demandas: {int(pico_demanda['Total_Demandas'])}<br>{hora_pico_demanda}",
+            showarrow=True,
+            arrowhead=2,
+            ax=0,
+            ay=-40,
+            bgcolor="white",
+            bordercolor="black"
+        )
+
+        fig_horas.add_annotation(
+            x=pico_sinc['Hora'],
+            y=pico_sinc['Sincronizados'],
+            text=f"Pico Sinc: {int(pico_sinc['Sincronizados'])}<br>{hora_pico_sinc}",
+            showarrow=True,
+            arrowhead=2,
+            ax=0,
+            ay=40,
+            bgcolor="white",
+            bordercolor="green"
+        )
+
+    fig_horas.update_layout(
+        title=f'Demandas por Hora do Dia - {subtitulo_hora}',
+        xaxis_title='Hora do Dia',
+        yaxis_title='Quantidade',
+        height=400,
+        showlegend=True
+    )
+
+    return fig_horas
+
+
+def criar_grafico_sazonalidade_mensal(dados_mes, titulo_grafico):
+    """Gráfico de barras e taxa de sincronização por mês"""
+    fig_mes_saz = go.Figure()
+
+    fig_mes_saz.add_trace(go.Bar(
+        x=dados_mes['Mês'],
+        y=dados_mes['Total'],
+        name='Total Demandas',
+        marker_color=COR_AZUL_ESCURO,
+        text=dados_mes['Total'],
+        textposition='auto'
+    ))
+
+    fig_mes_saz.add_trace(go.Bar(
+        x=dados_mes['Mês'],
+        y=dados_mes['Sincronizados'],
+        name='Sincronizados',
+        marker_color=COR_VERDE_ESCURO,
+        text=dados_mes['Sincronizados'],
+        textposition='auto'
+    ))
+
+    fig_mes_saz.add_trace(go.Scatter(
+        x=dados_mes['Mês'],
+        y=dados_mes['Taxa_Sinc'],
+        name='Taxa Sinc (%)',
+        yaxis='y2',
+        mode='lines+markers',
+        line=dict(color=COR_LARANJA, width=3),
+        marker=dict(size=8)
+    ))
+
+    fig_mes_saz.update_layout(
+        title=titulo_grafico,
+        barmode='group',
+        yaxis=dict(title='Quantidade'),
+        yaxis2=dict(
+            title='Taxa Sinc (%)',
+            overlaying='y',
+            side='right',
+            range=[0, 100]
+        ),
+        height=400,
+        showlegend=True
+    )
+
+    return fig_mes_saz
+
+
+def criar_grafico_ipe_acumulado(df_acum):
+    """Gráfico de linha com a evolução do IPE acumulado por mês"""
+    fig_linha = go.Figure()
+    fig_linha.add_trace(go.Scatter(
+        x=df_acum['Mês'],
+        y=df_acum['IPE Acumulado (%)'],
+        mode='lines+markers+text',
+        line=dict(color=COR_AZUL_ESCURO, width=4),
+        marker=dict(size=12, color=COR_AZUL_PETROLEO),
+        text=df_acum['IPE Acumulado (%)'].apply(lambda x: f'{x:.1f}%'),
+        textposition='top center',
+        name='IPE Acumulado',
+        hovertemplate='<b>%{x}</b><br>IPE: %{y:.1f}%<br>CD: %{customdata[0]:,}<br>CA: %{customdata[1]:,}<br>CR: %{customdata[2]:,}<br>SREs: %{customdata[3]}<extra></extra>',
+        customdata=df_acum[['CD_Acum', 'CA_Acum', 'CR_Acum', 'NA_Acum']].values
+    ))
+    fig_linha.add_hline(y=95, line_dash="dash", line_color=COR_AZUL_PETROLEO, annotation_text="🎯 Meta 95%")
+    fig_linha.add_hline(y=100, line_dash="dot", line_color=COR_CINZA_TEXTO, annotation_text="Limite 100%")
+    fig_linha.add_trace(go.Scatter(x=df_acum['Mês'], y=df_acum['IPE Acumulado (%)'], fill='tozeroy', fillcolor='rgba(2, 138, 159, 0.1)', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig_linha.update_layout(title='📈 Evolução do IPE Acumulado por Mês', xaxis_title='Mês', yaxis_title='IPE Acumulado (%)', yaxis=dict(range=[0, 105]), height=500, plot_bgcolor=COR_BRANCO)
+
+    return fig_linha
+
+
+def criar_grafico_tendencia_percentis(df_tendencia, percentil_param):
+    """Gráfico de linhas com a evolução mensal dos percentis de sincronizações diárias"""
+    fig_tendencia = go.Figure()
+
+    # Adicionar faixa entre P25 e P90
+    fig_tendencia.add_trace(go.Scatter(
+        x=df_tendencia['Mês_Label'],
+        y=df_tendencia[f'P{percentil_param}'],
+        mode='lines+markers',
+        name=f'P{percentil_param}',
+        line=dict(color=COR_VERMELHO, width=3),
+        marker=dict(size=10, color=COR_VERMELHO)
+    ))
+
+    fig_tendencia.add_trace(go.Scatter(
+        x=df_tendencia['Mês_Label'],
+        y=df_tendencia['P50'],
+        mode='lines+markers',
+        name='P50 (Mediana)',
+        line=dict(color=COR_AZUL_ESCURO, width=2),
+        marker=dict(size=8, color=COR_AZUL_ESCURO)
+    ))
+
+    fig_tendencia.add_trace(go.Scatter(
+        x=df_tendencia['Mês_Label'],
+        y=df_tendencia['Média'],
+        mode='lines+markers',
+        name='Média',
+        line=dict(color=COR_VERDE_ESCURO, width=2, dash='dash'),
+        marker=dict(size=8, color=COR_VERDE_ESCURO)
+    ))
+
+    # Adicionar área entre P25 e P90
+    fig_tendencia.add_trace(go.Scatter(
+        x=df_tendencia['Mês_Label'],
+        y=df_tendencia['P90'],
+        mode='lines',
+        name='P25-P90 (Faixa)',
+        line=dict(width=0),
+        showlegend=False
+    ))
+
+    fig_tendencia.add_trace(go.Scatter(
+        x=df_tendencia['Mês_Label'],
+        y=df_tendencia['P25'],
+        mode='lines',
+        fill='tonexty',
+        fillcolor='rgba(2, 138, 159, 0.2)',
+        line=dict(width=0),
+        name='P25-P90 (Faixa)'
+    ))
+
+    fig_tendencia.update_layout(
+        title=f'Evolução dos Percentis de Sincronizações Diárias',
+        xaxis_title='Mês',
+        yaxis_title='Sincronizações por Dia',
+        height=450,
+        plot_bgcolor=COR_BRANCO,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        )
+    )
+
+    return fig_tendencia
+
+
+# Sessão em execução: fora do alcance da liberação das ociosas até o fim da execução
+registrar_acesso_sessao()
+
+# ============================================
+# SIDEBAR - FILTROS E CONTROLES
+# ============================================
+with st.sidebar:
+    st.markdown(f"""
+    <div style="text-align: center; padding: 1rem 0;">
+        <h3 style="color: {COR_AZUL_ESCURO}; margin: 0;">⚙️ Painel de Controle</h3>
+        <p style="color: {COR_CINZA_TEXTO}; margin: 0; font-size: 0.85rem;">Filtros e Configurações</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    if 'df_original' not in st.session_state:
+        st.session_state.df_original = None
+        st.session_state.df_filtrado = None
+        st.session_state.arquivo_atual = None
+        st.session_state.file_hash = None
+        st.session_state.uploaded_file_name = None
+        st.session_state.ultima_atualizacao = None
+        st.session_state.agregados_snapshot = None
+        st.session_state.versao_arquivo = None
+        st.session_state.versao_base = None
+        st.session_state.origem_base = None
+    
+    # Troca para a versão mais nova da base local, se o servidor já terminou de
+    # carregá-la; lida uma única vez, então este render usa uma versão coerente
+    versao_base = obter_repositorio_base().atual
+    versao_sessao = st.session_state.get('versao_base')
+    if versao_base is not None and versao_sessao is not None and versao_base.numero > versao_sessao:
+        adotar_versao_base(versao_base)
+        st.toast(f"🔄 Nova versão da base carregada: {len(versao_base.df):,} registros")
+    
+    if st.session_state.df_original is not None:
+        with st.container():
+            st.markdown('<div class="sidebar-section">', unsafe_allow_html=True)
+            st.markdown("**🔍 Filtros de Análise**")
             
-            if 'Tipo_Chamado' in df.columns:
-                tipos = ['Todos'] + sorted(df['Tipo_Chamado'].dropna().unique())
-                tipo_selecionado = st.selectbox(
-                    "📝 Tipo de Chamado",
-                    options=tipos,
-                    key="filtro_tipo"
-                )
-                if tipo_selecionado != 'Todos':
-                    df = df[df['Tipo_Chamado'] == tipo_selecionado]
+            df = st.session_state.df_original
             
-            if 'Empresa' in df.columns:
-                empresas = ['Todas'] + sorted(df['Empresa'].dropna().unique())
-                empresa_selecionada = st.selectbox(
-                    "🏢 Empresa",
-                    options=empresas,
-                    key="filtro_empresa"
-                )
-                if empresa_selecionada != 'Todas':
-                    df = df[df['Empresa'] == empresa_selecionada]
+            # Cada filtro oferece apenas as opções que restam após os anteriores
+            rotulos_filtros = {
+                'ano': ("📅 Ano", "filtro_ano"),
+                'mes': ("📆 Mês", "filtro_mes"),
+                'responsavel': ("👤 Responsável", "filtro_responsavel"),
+                'busca_chamado': ("🔎 Buscar Chamado", "busca_chamado"),
+                'status': ("📊 Status", "filtro_status"),
+                'tipo': ("📝 Tipo de Chamado", "filtro_tipo"),
+                'empresa': ("🏢 Empresa", "filtro_empresa"),
+                'sre': ("🔧 SRE Responsável", "filtro_sre")
+            }
             
-            if 'SRE' in df.columns:
-                sres = ['Todos'] + sorted(df['SRE'].dropna().unique())
-                sre_selecionado = st.selectbox(
-                    "🔧 SRE Responsável",
-                    options=sres,
-                    key="filtro_sre"
-                )
-                if sre_selecionado != 'Todos':
-                    df = df[df['SRE'] == sre_selecionado]
+            filtros_sidebar = {}
+            for nome_filtro, (rotulo, chave_widget) in rotulos_filtros.items():
+                if nome_filtro == 'busca_chamado':
+                    valor_filtro = st.text_input(
+                        rotulo,
+                        placeholder="Digite número do chamado...",
+                        key=chave_widget
+                    )
+                else:
+                    opcoes = esteira.opcoes_filtro(df, nome_filtro)
+                    if len(opcoes) <= 1 and nome_filtro in ('ano', 'mes'):
+                        continue
+                    if not opcoes:
+                        continue
+                    valor_filtro = st.selectbox(rotulo, options=opcoes, key=chave_widget)
+                
+                with medir(f"Filtro {nome_filtro}", linhas=len(df)):
+                    df = esteira.aplicar_filtro(df, nome_filtro, valor_filtro)
+                filtros_sidebar[nome_filtro] = valor_filtro
             
             st.session_state.df_filtrado = df
+            st.session_state.filtros_sidebar = filtros_sidebar
             
             st.markdown(f"**📈 Registros filtrados:** {len(df):,}")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1462,9 +2335,11 @@ with st.sidebar:
         if st.session_state.df_original is not None:
             arquivo_atual = st.session_state.arquivo_atual
             
-            if arquivo_atual and isinstance(arquivo_atual, str) and os.path.exists(arquivo_atual):
-                tamanho_kb = os.path.getsize(arquivo_atual) / 1024
-                ultima_mod = datetime.fromtimestamp(os.path.getmtime(arquivo_atual))
+            estado_arquivo = obter_monitor_arquivo().estado
+            
+            if arquivo_atual and arquivo_atual == estado_arquivo.caminho:
+                tamanho_kb = estado_arquivo.tamanho / 1024
+                ultima_mod = datetime.fromtimestamp(estado_arquivo.mtime)
                 
                 st.markdown(f"""
                 <div style="background: {COR_CINZA_FUNDO}; padding: 0.8rem; border-radius: 8px; margin-bottom: 1rem;">
@@ -1476,8 +2351,8 @@ with st.sidebar:
                 </div>
                 """, unsafe_allow_html=True)
                 
-                if verificar_e_atualizar_arquivo():
-                    st.warning("⚠️ O arquivo local foi modificado! Clique em 'Recarregar Local' para atualizar.")
+                if arquivo_local_atualizado():
+                    st.warning("⚠️ O arquivo local foi modificado! A nova versão está sendo carregada em segundo plano.")
             
             col_btn1, col_btn2 = st.columns(2)
             
@@ -1488,31 +2363,11 @@ with st.sidebar:
                            help="Recarrega os dados do arquivo local",
                            key="btn_recarregar"):
                     
-                    caminho_atual = encontrar_arquivo_dados()
+                    # Verificação explícita: o usuário pediu, então não espera o próximo ciclo do monitor
+                    estado_arquivo = obter_monitor_arquivo().verificar()
                     
-                    if caminho_atual and os.path.exists(caminho_atual):
-                        with st.spinner('Recarregando dados do arquivo local...'):
-                            try:
-                                carregar_dados.clear()
-                                
-                                df_atualizado, status, hash_conteudo = carregar_dados(caminho_arquivo=caminho_atual)
-                                
-                                if df_atualizado is not None:
-                                    st.session_state.df_original = df_atualizado
-                                    st.session_state.df_filtrado = df_atualizado.copy()
-                                    st.session_state.arquivo_atual = caminho_atual
-                                    st.session_state.file_hash = hash_conteudo
-                                    st.session_state.ultima_atualizacao = get_horario_brasilia()
-                                    
-                                    st.session_state.ultima_modificacao = os.path.getmtime(caminho_atual)
-                                    
-                                    st.success(f"✅ Dados atualizados! {len(df_atualizado):,} registros")
-                                    time.sleep(1)
-                                    st.rerun()
-                                else:
-                                    st.error(f"❌ Erro ao recarregar: {status}")
-                            except Exception as e:
-                                st.error(f"❌ Erro: {str(e)}")
+                    if estado_arquivo.caminho and os.path.exists(estado_arquivo.caminho):
+                        st.session_state.recarga_base = obter_repositorio_base().recarregar()
                     else:
                         st.error("❌ Arquivo local não encontrado.")
             
@@ -1520,17 +2375,20 @@ with st.sidebar:
                 if st.button("🗑️ Limpar Tudo", 
                            use_container_width=True,
                            type="secondary",
-                           help="Limpa todos os dados e cache",
+                           help="Limpa os dados desta sessão (o cache compartilhado é invalidado pelo conteúdo do arquivo)",
                            key="btn_limpar"):
                     
-                    st.cache_data.clear()
-                    
                     limpar_sessao_dados()
                     
-                    st.success("✅ Dados e cache limpos!")
+                    st.success("✅ Dados da sessão limpos!")
                     time.sleep(1)
                     st.rerun()
             
+            if st.session_state.get('recarga_base') is not None:
+                acompanhar_recarga_base()
+            if 'erro_recarga' in st.session_state:
+                st.error(f"❌ Erro ao recarregar: {st.session_state.pop('erro_recarga')}")
+            
             st.markdown("---")
         
         st.markdown("**📤 Importar Dados**")
@@ -1554,8 +2412,6 @@ with st.sidebar:
         )
         
         if uploaded_file is not None:
-            current_hash = calcular_hash_arquivo(uploaded_file.getvalue())
-            
             file_details = {
                 "Nome": uploaded_file.name,
                 "Tamanho": f"{uploaded_file.size / 1024:.1f} KB"
@@ -1566,15 +2422,15 @@ with st.sidebar:
             
             if st.button("📥 Processar Arquivo", use_container_width=True, type="primary", key="btn_processar"):
                 with st.spinner('Processando novo arquivo...'):
-                    temp_path = f"temp_{uploaded_file.name}"
-                    with open(temp_path, 'wb') as f:
-                        f.write(uploaded_file.getbuffer())
-                    
-                    df_novo, status, hash_conteudo = carregar_dados(caminho_arquivo=temp_path)
-                    os.remove(temp_path)
+                    # Processado direto do buffer do upload: sem arquivo temporário em disco
+                    df_novo, status, hash_conteudo = carregar_dados(conteudo=uploaded_file.getbuffer())
                     
                     if df_novo is not None:
-                        st.session_state.df_original = df_novo
+                        st.session_state.df_original = particionar(df_novo)
+                        st.session_state.agregados_snapshot = None
+                        st.session_state.versao_arquivo = None
+                        st.session_state.versao_base = None
+                        st.session_state.origem_base = None
                         st.session_state.df_filtrado = df_novo.copy()
                         st.session_state.arquivo_atual = uploaded_file.name
                         st.session_state.file_hash = hash_conteudo
@@ -1594,83 +2450,25 @@ with st.sidebar:
         st.markdown('</div>', unsafe_allow_html=True)
     
     if st.session_state.df_original is None:
-        caminho_encontrado = encontrar_arquivo_dados()
+        repositorio = obter_repositorio_base()
         
-        if caminho_encontrado:
+        # Só a primeira sessão do processo espera a carga; as demais adotam a versão pronta
+        if repositorio.atual is None and repositorio.monitor.caminho:
             with st.spinner('Carregando dados locais...'):
-                df_local, status, hash_conteudo = carregar_dados(caminho_arquivo=caminho_encontrado)
-                if df_local is not None:
-                    st.session_state.df_original = df_local
-                    st.session_state.df_filtrado = df_local.copy()
-                    st.session_state.arquivo_atual = caminho_encontrado
-                    st.session_state.file_hash = hash_conteudo
-                    st.session_state.ultima_atualizacao = get_horario_brasilia()
-                    if os.path.exists(caminho_encontrado):
-                        st.session_state.ultima_modificacao = os.path.getmtime(caminho_encontrado)
-                    st.rerun()
-                else:
-                    st.error(f"❌ {status}")
+                try:
+                    repositorio.recarregar().result()
+                except Exception as e:
+                    st.error(f"❌ {e}")
+        
+        if repositorio.atual is not None:
+            adotar_versao_base(repositorio.atual)
+            st.rerun()
+    
+    st.markdown("---")
+    exibir_diagnostico_inicializacao()
 
-# ============================================
-# HEADER - ESTILO GRADIENTE AZUL PETRÓLEO
-# ============================================
-st.markdown(f"""
-<div style="
-    background: linear-gradient(135deg, {COR_AZUL_PETROLEO} 0%, {COR_AZUL_ESCURO} 100%);
-    padding: 1.5rem 2rem;
-    margin-bottom: 1.5rem;
-    border-radius: 0;
-    box-shadow: 0 4px 15px rgba(2, 138, 159, 0.3);
-">
-    <div style="display: flex; align-items: center; justify-content: space-between; flex-wrap: wrap;">
-        <div>
-            <h1 style="
-                color: {COR_BRANCO};
-                margin: 0;
-                font-size: 1.6rem;
-                font-weight: 600;
-                letter-spacing: -0.3px;
-                text-shadow: 0 1px 2px rgba(0,0,0,0.1);
-            ">
-                📊 ESTEIRA SRE (Site Reliability Engineering)
-            </h1>
-            <p style="
-                color: rgba(255,255,255,0.9);
-                margin: 0.3rem 0 0 0;
-                font-size: 0.85rem;
-                font-weight: 400;
-            ">
-                Acompanhamento das validações da EAC | EMR | EMS | EMT | EPB | ERO | ESE | ESS | ETO
-            </p>
-        </div>
-        <div style="text-align: right;">
-            <p style="
-                color: rgba(255,255,255,0.9);
-                margin: 0;
-                font-size: 0.85rem;
-                font-weight: 500;
-            ">
-                Dashboard de Performance
-            </p>
-            <p style="
-                color: rgba(255,255,255,0.8);
-                margin: 0.2rem 0 0 0;
-                font-size: 0.75rem;
-            ">
-                v5.5 | Sistema de Performance SRE
-            </p>
-            <p style="
-                color: rgba(255,255,255,0.7);
-                margin: 0.3rem 0 0 0;
-                font-size: 0.7rem;
-                font-weight: 500;
-            ">
-                {datetime.now().strftime('%d/%m/%Y')}
-            </p>
-        </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+if st.session_state.df_original is not None:
+    registrar_marco('tempo_painel_com_dados')
 
 # ============================================
 # BOTÕES MANCHETE
@@ -1690,8 +2488,8 @@ if st.session_state.df_original is not None:
             st.session_state.show_popup = True
 
 if st.session_state.df_original is not None:
-    if verificar_e_atualizar_arquivo():
-        st.info("🔔 O arquivo local foi atualizado! Clique em 'Recarregar Local' na barra lateral para atualizar os dados.")
+    if arquivo_local_atualizado():
+        st.info("🔔 O arquivo local foi atualizado! A nova versão está sendo preparada e será usada na sua próxima interação com o painel.")
 
 if st.session_state.df_original is not None and st.session_state.show_popup:
     df = st.session_state.df_filtrado if st.session_state.df_filtrado is not None else st.session_state.df_original
@@ -1706,14 +2504,7 @@ if st.session_state.df_original is not None and st.session_state.show_popup:
         col_periodo1, col_periodo2 = st.columns(2)
         
         with col_periodo1:
-            periodo_opcoes = [
-                "Mês Atual",
-                "Últimos 30 dias", 
-                "Últimos 90 dias",
-                "Este Ano",
-                "Ano Passado",
-                "Todo o Período"
-            ]
+            periodo_opcoes = esteira.PERIODOS_MANCHETE
             periodo_selecionado = st.selectbox(
                 "Período de análise:",
                 options=periodo_opcoes,
@@ -1736,99 +2527,24 @@ if st.session_state.df_original is not None and st.session_state.show_popup:
                 ano_especifico = 'Selecionar ano...'
         
         hoje = datetime.now()
-        df_filtrado_periodo = df.copy()
-        periodo_titulo = ""
-        
-        if periodo_selecionado == "Mês Atual":
-            mes_atual = hoje.month
-            ano_atual = hoje.year
-            df_filtrado_periodo = df[(df['Criado'].dt.month == mes_atual) & 
-                                    (df['Criado'].dt.year == ano_atual)].copy()
-            periodo_titulo = f"Mês Atual ({mes_atual:02d}/{ano_atual})"
-            
-        elif periodo_selecionado == "Últimos 30 dias":
-            data_limite = hoje - timedelta(days=30)
-            df_filtrado_periodo = df[df['Criado'] >= data_limite].copy()
-            periodo_titulo = "Últimos 30 dias"
-            
-        elif periodo_selecionado == "Últimos 90 dias":
-            data_limite = hoje - timedelta(days=90)
-            df_filtrado_periodo = df[df['Criado'] >= data_limite].copy()
-            periodo_titulo = "Últimos 90 dias"
-            
-        elif periodo_selecionado == "Este Ano":
-            ano_atual = hoje.year
-            df_filtrado_periodo = df[df['Criado'].dt.year == ano_atual].copy()
-            periodo_titulo = f"Este Ano ({ano_atual})"
-            
-        elif periodo_selecionado == "Ano Passado":
-            ano_passado = hoje.year - 1
-            df_filtrado_periodo = df[df['Criado'].dt.year == ano_passado].copy()
-            periodo_titulo = f"Ano Passado ({ano_passado})"
-            
-        elif periodo_selecionado == "Todo o Período":
-            periodo_titulo = "Todo o Período Disponíve"
-            
-        elif ano_especifico != 'Selecionar ano...':
-            df_filtrado_periodo = df[df['Criado'].dt.year == int(ano_especifico)].copy()
-            periodo_titulo = f"Ano {ano_especifico}"
-        
-        total_cards = len(df_filtrado_periodo)
-        validados = len(df_filtrado_periodo[df_filtrado_periodo['Status'] == 'Sincronizado'])
-        com_erro = len(df_filtrado_periodo[df_filtrado_periodo['Revisões'] > 0])
-        sem_erro = validados - com_erro
-        
-        taxa_sucesso = (validados / total_cards * 100) if total_cards > 0 else 0
-        taxa_erro = (com_erro / validados * 100) if validados > 0 else 0
         
-        df_anterior = pd.DataFrame()
-        periodo_anterior_titulo = ""
+        df_filtrado_periodo, periodo_titulo, df_anterior, periodo_anterior_titulo = esteira.recortar_periodo_manchete(
+            df, periodo_selecionado, ano_especifico, hoje
+        )
         
-        try:
-            if periodo_selecionado == "Mês Atual":
-                mes_anterior = mes_atual - 1 if mes_atual > 1 else 12
-                ano_anterior = ano_atual if mes_atual > 1 else ano_atual - 1
-                df_anterior = df[(df['Criado'].dt.month == mes_anterior) & 
-                                (df['Criado'].dt.year == ano_anterior)].copy()
-                periodo_anterior_titulo = f"{mes_anterior:02d}/{ano_anterior}"
-                
-            elif periodo_selecionado == "Últimos 30 dias":
-                data_inicio_anterior = hoje - timedelta(days=60)
-                data_fim_anterior = hoje - timedelta(days=30)
-                df_anterior = df[(df['Criado'] >= data_inicio_anterior) & 
-                                (df['Criado'] < data_fim_anterior)].copy()
-                periodo_anterior_titulo = "30 dias anteriores"
-                
-            elif periodo_selecionado == "Últimos 90 dias":
-                data_inicio_anterior = hoje - timedelta(days=180)
-                data_fim_anterior = hoje - timedelta(days=90)
-                df_anterior = df[(df['Criado'] >= data_inicio_anterior) & 
-                                (df['Criado'] < data_fim_anterior)].copy()
-                periodo_anterior_titulo = "90 dias anteriores"
-                
-            elif periodo_selecionado == "Este Ano":
-                ano_anterior = ano_atual - 1
-                df_anterior = df[df['Criado'].dt.year == ano_anterior].copy()
-                periodo_anterior_titulo = f"Ano {ano_anterior}"
-                
-            elif periodo_selecionado == "Ano Passado":
-                ano_anterior_2 = ano_passado - 1
-                df_anterior = df[df['Criado'].dt.year == ano_anterior_2].copy()
-                periodo_anterior_titulo = f"Ano {ano_anterior_2}"
-                
-        except Exception as e:
-            df_anterior = pd.DataFrame()
+        kpis_periodo = esteira.calcular_kpis_periodo(df_filtrado_periodo)
+        total_cards = kpis_periodo['total_cards']
+        validados = kpis_periodo['validados']
+        com_erro = kpis_periodo['com_erro']
+        sem_erro = kpis_periodo['sem_erro']
+        taxa_sucesso = kpis_periodo['taxa_sucesso']
+        taxa_erro = kpis_periodo['taxa_erro']
         
-        if not df_anterior.empty:
-            total_cards_anterior = len(df_anterior)
-            validados_anterior = len(df_anterior[df_anterior['Status'] == 'Sincronizado'])
-            com_erro_anterior = len(df_anterior[df_anterior['Revisões'] > 0])
-            taxa_sucesso_anterior = (validados_anterior / total_cards_anterior * 100) if total_cards_anterior > 0 else 0
-        else:
-            total_cards_anterior = 0
-            validados_anterior = 0
-            com_erro_anterior = 0
-            taxa_sucesso_anterior = 0
+        kpis_anterior = esteira.calcular_kpis_periodo(df_anterior)
+        total_cards_anterior = kpis_anterior['total_cards']
+        validados_anterior = kpis_anterior['validados']
+        com_erro_anterior = kpis_anterior['com_erro']
+        taxa_sucesso_anterior = kpis_anterior['taxa_sucesso']
         
         st.markdown(f"#### 🎯 DESTAQUE DO PERÍODO: {periodo_titulo}")
         
@@ -2095,6 +2811,20 @@ if st.session_state.df_original is not None and st.session_state.show_popup:
         </div>
         """, unsafe_allow_html=True)
         
+        # Relatório identificado pela base carregada, filtros e período (relativo à data de hoje)
+        chave_relatorio_pdf = chave_filtros_sidebar() + (
+            periodo_selecionado, str(ano_especifico), hoje.date().isoformat()
+        )
+        
+        def acompanhar_relatorio_pdf(futuro):
+            """Aguarda o PDF sem bloquear a página; recarrega tudo quando fica pronto"""
+            if futuro.done():
+                st.rerun()
+            st.info("⏳ Gerando relatório PDF em segundo plano... você pode continuar usando o painel.")
+        
+        if hasattr(st, 'fragment'):
+            acompanhar_relatorio_pdf = st.fragment(run_every=1)(acompanhar_relatorio_pdf)
+        
         col_exportar, col_fechar = st.columns(2)
         
         with col_exportar:
@@ -2103,14 +2833,51 @@ if st.session_state.df_original is not None and st.session_state.show_popup:
                         use_container_width=True,
                         help="Gerar relatório completo em formato PDF",
                         key="btn_exportar_pdf_final"):
-                st.info("""
-                📄 **Funcionalidade de PDF em desenvolvimento...**
+                comparativo_pdf = None
+                if not df_anterior.empty and total_cards_anterior > 0:
+                    comparativo_pdf = {
+                        'periodos': [periodo_anterior_titulo, periodo_titulo],
+                        'totais': [total_cards_anterior, total_cards],
+                        'validados': [validados_anterior, validados],
+                        'taxas': [taxa_sucesso_anterior, taxa_sucesso]
+                    }
                 
-                Para uma implementação completa, você pode usar:
-                - `fpdf` ou `reportlab` para gerar PDFs
-                - `weasyprint` para converter HTML para PDF
-                - `pdfkit` (requer wkhtmltopdf)
-                """)
+                dias_unicos_pdf = df_filtrado_periodo['Criado'].dt.date.nunique() if total_cards > 0 else 0
+                
+                solicitar_relatorio_pdf(chave_relatorio_pdf, {
+                    'df_periodo': df_filtrado_periodo,
+                    'periodo_titulo': periodo_titulo,
+                    'gerado_em': get_horario_brasilia(),
+                    'comparativo': comparativo_pdf,
+                    'kpis': {
+                        'total_cards': total_cards,
+                        'validados': validados,
+                        'sem_erro': sem_erro,
+                        'com_erro': com_erro,
+                        'taxa_sucesso': taxa_sucesso,
+                        'taxa_erro': taxa_erro,
+                        'dias_unicos': dias_unicos_pdf,
+                        'media_diaria': total_cards / dias_unicos_pdf if dias_unicos_pdf > 0 else 0,
+                        'media_revisoes': df_filtrado_periodo['Revisões'].mean() if total_cards > 0 else 0
+                    }
+                })
+            
+            futuro_pdf = obter_cache_relatorios().obter(chave_relatorio_pdf)
+            
+            if futuro_pdf is not None and not futuro_pdf.done():
+                acompanhar_relatorio_pdf(futuro_pdf)
+            elif futuro_pdf is not None and futuro_pdf.exception() is not None:
+                st.error(f"❌ Erro ao gerar o PDF: {futuro_pdf.exception()}")
+                obter_cache_relatorios().descartar(chave_relatorio_pdf)
+            elif futuro_pdf is not None:
+                st.download_button(
+                    label="📄 Baixar Relatório PDF",
+                    data=futuro_pdf.result(),
+                    file_name=f"manchete_{hoje.strftime('%Y%m%d_%H%M%S')}.pdf",
+                    mime="application/pdf",
+                    use_container_width=True,
+                    key="btn_baixar_pdf"
+                )
         
         with col_fechar:
             if st.button("✕ **FECHAR**", 
@@ -2128,6 +2895,12 @@ if st.session_state.df_original is not None and st.session_state.show_popup:
         </div>
         """, unsafe_allow_html=True)
 
+# ============================================
+# PAINEL DE SLA (CARTÕES ABERTOS EM RISCO)
+# ============================================
+if st.session_state.df_original is not None:
+    exibir_painel_sla(obter_indice_sla(st.session_state.df_original))
+
 # ============================================
 # EXIBIR DASHBOARD SE HOUVER DADOS
 # ============================================
@@ -2139,7 +2912,7 @@ if st.session_state.df_original is not None:
     # ============================================
     tab_principal, tab_mapa, tab_ipe, tab_estatistica = st.tabs(["📊 Principal", "🗺️ Mapa", "📈 KPI", "📈 Análise Estatística"])
     
-    with tab_principal:
+    with tab_principal, medir("Aba 📊 Principal", linhas=len(df)):
         st.markdown("## 📊 Base de Dados")
         
         if 'Criado' in df.columns and not df.empty:
@@ -2188,14 +2961,15 @@ if st.session_state.df_original is not None:
         
         st.markdown("---")
         
-        tab1, tab2, tab3, tab4 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
             "📅 Evolução de Demandas", 
             "📊 Análise de Revisões", 
             "📈 Sincronização Diária",
-            "🏆 Análise Avançada SRE"
+            "🏆 Análise Avançada SRE",
+            "⏳ Tempo de Ciclo"
         ])
         
-        with tab1:
+        with tab1, medir("📅 Evolução de Demandas"):
             col_titulo, col_seletor = st.columns([3, 1])
             
             with col_titulo:
@@ -2214,70 +2988,11 @@ if st.session_state.df_original is not None:
                         )
             
             if 'Ano' in df.columns and 'Nome_Mês' in df.columns and anos_disponiveis:
-                df_ano = df[df['Ano'] == ano_selecionado].copy()
+                demandas_completas = obter_agregado('evolucao_mensal', df, ano=ano_selecionado)
                 
-                if not df_ano.empty:
-                    ordem_meses_abreviados = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                                             'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-                    
-                    todos_meses = pd.DataFrame({
-                        'Mês_Num': range(1, 13),
-                        'Nome_Mês': ordem_meses_abreviados
-                    })
-                    
-                    demandas_por_mes = df_ano.groupby('Mês_Num').size().reset_index()
-                    demandas_por_mes.columns = ['Mês_Num', 'Quantidade']
-                    
-                    demandas_completas = pd.merge(todos_meses, demandas_por_mes, on='Mês_Num', how='left')
-                    demandas_completas['Quantidade'] = demandas_completas['Quantidade'].fillna(0).astype(int)
-                    
-                    fig_mes = go.Figure()
-                    
-                    fig_mes.add_trace(go.Scatter(
-                        x=demandas_completas['Nome_Mês'],
-                        y=demandas_completas['Quantidade'],
-                        mode='lines+markers+text',
-                        name='Demandas',
-                        line=dict(color=COR_AZUL_ESCURO, width=3),
-                        marker=dict(size=10, color=COR_AZUL_PETROLEO),
-                        text=demandas_completas['Quantidade'],
-                        textposition='top center',
-                        textfont=dict(size=12, color=COR_AZUL_ESCURO)
-                    ))
-                    
-                    fig_mes.update_layout(
-                        title=f"Demandas em {ano_selecionado}",
-                        xaxis_title="Mês",
-                        yaxis_title="Número de Demandas",
-                        plot_bgcolor=COR_BRANCO,
-                        height=450,
-                        showlegend=False,
-                        margin=dict(t=50, b=50, l=50, r=50),
-                        xaxis=dict(
-                            gridcolor='rgba(0,0,0,0.05)',
-                            tickmode='array',
-                            tickvals=list(range(12)),
-                            ticktext=ordem_meses_abreviados
-                        ),
-                        yaxis=dict(
-                            gridcolor='rgba(0,0,0,0.05)',
-                            rangemode='tozero'
-                        )
-                    )
-                    
-                    total_ano = int(demandas_completas['Quantidade'].sum())
-                    fig_mes.add_annotation(
-                        x=0.5, y=0.95,
-                        xref="paper", yref="paper",
-                        text=f"Total no ano: {total_ano:,} demandas",
-                        showarrow=False,
-                        font=dict(size=12, color=COR_AZUL_ESCURO, weight="bold"),
-                        bgcolor="rgba(255,255,255,0.9)",
-                        bordercolor=COR_AZUL_ESCURO,
-                        borderwidth=1,
-                        borderpad=4
-                    )
-                    
+                if not demandas_completas.empty:
+                    fig_mes = obter_figura('fig_mes', criar_grafico_evolucao_mensal, demandas_completas,
+                                           ano_selecionado=ano_selecionado)
                     st.plotly_chart(fig_mes, use_container_width=True)
                     
                     col_stats1, col_stats2, col_stats3 = st.columns(3)
@@ -2293,7 +3008,7 @@ if st.session_state.df_original is not None:
                         media_mensal = int(demandas_completas['Quantidade'].mean())
                         st.metric("📊 Média mensal", f"{media_mensal:,}")
         
-        with tab2:
+        with tab2, medir("📊 Análise de Revisões"):
             st.markdown(f'<div class="section-title">📊 REVISÕES POR RESPONSÁVEL</div>', unsafe_allow_html=True)
             
             col_rev_filtro1, col_rev_filtro2 = st.columns(2)
@@ -2318,85 +3033,105 @@ if st.session_state.df_original is not None:
                         key="filtro_mes_revisoes"
                     )
             
-            df_rev = df.copy()
-            
-            if ano_rev != 'Todos os Anos':
-                df_rev = df_rev[df_rev['Ano'] == int(ano_rev)]
+            revisoes_por_responsavel = obter_agregado('revisoes_por_responsavel', df, ano=ano_rev, mes=mes_rev)
             
-            if mes_rev != 'Todos os Meses':
-                df_rev = df_rev[df_rev['Mês'] == int(mes_rev)]
+            if not revisoes_por_responsavel.empty:
+                periodo_rev = ''
+                if ano_rev != 'Todos os Anos':
+                    periodo_rev += f' - {ano_rev}'
+                if mes_rev != 'Todos os Meses':
+                    meses_nomes = {
+                        1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
+                        5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
+                        9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+                    }
+                    periodo_rev += f' - {meses_nomes[int(mes_rev)]}'
+                titulo_rev = 'Top 15 Responsáveis com Mais Revisões' + periodo_rev
+                
+                fig_revisoes = obter_figura('fig_revisoes', criar_grafico_revisoes, revisoes_por_responsavel,
+                                            titulo_rev=titulo_rev)
+                st.plotly_chart(fig_revisoes, use_container_width=True)
+                
+                revisoes_por_categoria = obter_agregado('revisoes_por_categoria', df, ano=ano_rev, mes=mes_rev)
+                if not revisoes_por_categoria.empty:
+                    fig_categorias = obter_figura(
+                        'fig_revisoes_categoria', criar_grafico_revisoes_categoria, revisoes_por_categoria,
+                        titulo_rev='Revisões por Categoria do Motivo' + periodo_rev
+                    )
+                    st.plotly_chart(fig_categorias, use_container_width=True)
             
-            if 'Revisões' in df_rev.columns and 'Responsável_Formatado' in df_rev.columns:
-                df_com_revisoes = df_rev[df_rev['Revisões'] > 0].copy()
+            indices_textos = obter_indices_textos(st.session_state.df_original)
+            if indices_textos:
+                st.markdown("---")
+                st.markdown(f'<div class="section-title">🔎 EXPLORADOR DE MOTIVOS DE REVISÃO</div>', unsafe_allow_html=True)
+                st.caption("Busca por termos (sem diferenciar acentos e maiúsculas) nos filtros da barra lateral e no período acima.")
                 
-                if not df_com_revisoes.empty:
-                    revisoes_por_responsavel = df_com_revisoes.groupby('Responsável_Formatado').agg({
-                        'Revisões': 'sum',
-                        'Chamado': 'count'
-                    }).reset_index()
-                    
-                    revisoes_por_responsavel.columns = ['Responsável', 'Total_Revisões', 'Chamados_Com_Revisão']
-                    revisoes_por_responsavel = revisoes_por_responsavel.sort_values('Total_Revisões', ascending=False)
-                    
-                    titulo_rev = 'Top 15 Responsáveis com Mais Revisões'
-                    if ano_rev != 'Todos os Anos':
-                        titulo_rev += f' - {ano_rev}'
-                    if mes_rev != 'Todos os Meses':
-                        meses_nomes = {
-                            1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
-                            5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
-                            9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
-                        }
-                        titulo_rev += f' - {meses_nomes[int(mes_rev)]}'
-                    
-                    fig_revisoes = go.Figure()
-                    
-                    max_revisoes = revisoes_por_responsavel['Total_Revisões'].max()
-                    min_revisoes = revisoes_por_responsavel['Total_Revisões'].min()
-                    
-                    colors = []
-                    for valor in revisoes_por_responsavel['Total_Revisões']:
-                        if max_revisoes == min_revisoes:
-                            colors.append(COR_VERMELHO)
-                        else:
-                            normalized = (valor - min_revisoes) / (max_revisoes - min_revisoes)
-                            red = int(198 * normalized + 40 * (1 - normalized))
-                            green = int(40 * normalized + 167 * (1 - normalized))
-                            blue = int(40 * normalized + 69 * (1 - normalized))
-                            colors.append(f'rgb({red}, {green}, {blue})')
-                    
-                    fig_revisoes.add_trace(go.Bar(
-                        x=revisoes_por_responsavel['Responsável'].head(15),
-                        y=revisoes_por_responsavel['Total_Revisões'].head(15),
-                        name='Total de Revisões',
-                        text=revisoes_por_responsavel['Total_Revisões'].head(15),
-                        textposition='outside',
-                        marker_color=colors[:15],
-                        marker_line_color=COR_PRETO_SUAVE,
-                        marker_line_width=1.5,
-                        opacity=0.8
-                    ))
-                    
-                    fig_revisoes.update_layout(
-                        title=titulo_rev,
-                        xaxis_title='Responsável',
-                        yaxis_title='Total de Revisões',
-                        plot_bgcolor=COR_BRANCO,
-                        height=500,
-                        showlegend=False,
-                        margin=dict(t=50, b=100, l=50, r=50),
-                        xaxis=dict(
-                            tickangle=45,
-                            gridcolor='rgba(0,0,0,0.05)'
-                        ),
-                        yaxis=dict(
-                            gridcolor='rgba(0,0,0,0.05)'
-                        )
+                campos_texto = {'Motivo Revisão': 'Motivo_Revisao', 'ChangeSet': 'ChangeSet'}
+                campos_texto = {rotulo: coluna for rotulo, coluna in campos_texto.items() if coluna in indices_textos}
+                col_busca_motivo, col_campo_motivo, col_prefixo_motivo = st.columns([3, 1, 1])
+                with col_busca_motivo:
+                    consulta_motivo = st.text_input(
+                        "Buscar termos:",
+                        placeholder="Ex.: changeset, coordenada, endereç...",
+                        key="busca_motivo"
                     )
-                    
-                    st.plotly_chart(fig_revisoes, use_container_width=True)
+                with col_campo_motivo:
+                    campo_motivo = st.selectbox("Campo:", options=list(campos_texto), key="campo_motivo")
+                with col_prefixo_motivo:
+                    st.markdown("<br>", unsafe_allow_html=True)
+                    prefixo_motivo = st.checkbox("Início da palavra", value=True, key="prefixo_motivo",
+                                                 help="Com a opção marcada, 'coord' encontra 'coordenada'")
+                
+                indice_texto = indices_textos[campos_texto[campo_motivo]]
+                base_textos = st.session_state.df_original
+                df_motivos = esteira.recortar_periodo(
+                    df,
+                    ano=None if ano_rev == 'Todos os Anos' else int(ano_rev),
+                    meses=None if mes_rev == 'Todos os Meses' else [int(mes_rev)]
+                )
+                posicoes_recorte = indice_texto.posicoes(df_motivos)
+                
+                if consulta_motivo.strip():
+                    encontrados = indice_texto.buscar(consulta_motivo, prefixo=prefixo_motivo,
+                                                      posicoes=posicoes_recorte)
+                    st.metric("📄 Cartões encontrados", f"{len(encontrados):,}")
+                    if len(encontrados):
+                        colunas_motivo = [c for c in ['Chamado', 'Criado', 'SRE', 'Responsável_Formatado', 'Revisões',
+                                                      'ChangeSet', 'Motivo_Revisao'] if c in base_textos.columns]
+                        st.dataframe(base_textos.iloc[encontrados][colunas_motivo], use_container_width=True,
+                                     hide_index=True, height=min(400, 40 + 35 * len(encontrados)))
+                    else:
+                        st.info("Nenhum cartão com esses termos no recorte.")
+                
+                agrupamentos_termos = {'Geral': None, 'SRE': 'SRE', 'Mês': 'Ano_Mês'}
+                agrupar_termos = st.selectbox(
+                    "🏷️ Termos mais frequentes por:",
+                    options=[rotulo for rotulo, coluna in agrupamentos_termos.items()
+                             if coluna is None or coluna in base_textos.columns],
+                    key="motivo_agrupar"
+                )
+                coluna_grupo = agrupamentos_termos[agrupar_termos]
+                if coluna_grupo is None:
+                    termos_topo = indice_texto.termos_frequentes(posicoes_recorte, n=15)
+                    if termos_topo.empty:
+                        st.info("Nenhum texto preenchido no recorte.")
+                    else:
+                        fig_termos = obter_figura('fig_termos_motivo', criar_grafico_termos_motivo, termos_topo,
+                                                  titulo=f'Termos mais frequentes - {campo_motivo}')
+                        st.plotly_chart(fig_termos, use_container_width=True)
+                else:
+                    termos_grupo = indice_texto.termos_frequentes(
+                        posicoes_recorte, rotulos=base_textos[coluna_grupo].to_numpy(), n=5
+                    )
+                    if termos_grupo.empty:
+                        st.info("Nenhum texto preenchido no recorte.")
+                    else:
+                        termos_grupo['Termos'] = termos_grupo['Termo'] + ' (' + termos_grupo['Cartões'].astype(str) + ')'
+                        resumo_termos = (termos_grupo.groupby('Grupo', sort=True)['Termos'].agg(', '.join)
+                                         .rename_axis(agrupar_termos).to_frame())
+                        st.dataframe(resumo_termos, use_container_width=True)
         
-        with tab3:
+        with tab3, medir("📈 Sincronização Diária"):
             st.markdown(f'<div class="section-title">📈 CHAMADOS SINCRONIZADOS POR DIA - ANÁLISE COMPLETA</div>', unsafe_allow_html=True)
             
             col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
@@ -2439,22 +3174,10 @@ if st.session_state.df_original is not None:
                         key="filtro_empresa_sinc"
                     )
             
-            df_sinc = df.copy()
-            
-            if ano_sinc != 'Todos os Anos':
-                df_sinc = df_sinc[df_sinc['Ano'] == int(ano_sinc)]
+            recorte_sinc = {'ano': ano_sinc, 'mes': mes_sinc, 'sre': sre_sinc, 'empresa': empresa_sinc}
             
-            if mes_sinc != 'Todos os Meses':
-                df_sinc = df_sinc[df_sinc['Mês'] == int(mes_sinc)]
-            
-            if sre_sinc != 'Todos os SREs':
-                df_sinc = df_sinc[df_sinc['SRE'] == sre_sinc]
-            
-            if empresa_sinc != 'Todas Empresas':
-                df_sinc = df_sinc[df_sinc['Empresa'] == empresa_sinc]
-            
-            if 'Status' in df_sinc.columns and 'Criado' in df_sinc.columns:
-                df_sincronizados = df_sinc[df_sinc['Status'] == 'Sincronizado'].copy()
+            if 'Status' in df.columns and 'Criado' in df.columns:
+                df_sincronizados = esteira.recortar_sincronizados(df, **recorte_sinc).copy()
                 
                 if not df_sincronizados.empty:
                     df_sincronizados['Data'] = df_sincronizados['Criado'].dt.date
@@ -2573,59 +3296,17 @@ if st.session_state.df_original is not None:
                     
                     sinc_por_dia = sinc_por_dia.sort_values('Data')
                     
-                    if len(sinc_por_dia) > 30:
-                        sinc_por_dia_recente = sinc_por_dia.tail(30)
-                    else:
-                        sinc_por_dia_recente = sinc_por_dia.copy()
-                    
-                    sinc_por_dia_recente['Data_Formatada'] = sinc_por_dia_recente['Data'].apply(lambda x: x.strftime('%d/%m'))
-                    
-                    fig_dias = go.Figure()
-                    
-                    max_quant = sinc_por_dia_recente['Quantidade'].max()
-                    min_quant = sinc_por_dia_recente['Quantidade'].min()
-                    
-                    colors = []
-                    for valor in sinc_por_dia_recente['Quantidade']:
-                        if max_quant == min_quant:
-                            colors.append(COR_AZUL_ESCURO)
-                        else:
-                            normalized = (valor - min_quant) / (max_quant - min_quant)
-                            red = int(0 * normalized + 0 * (1 - normalized))
-                            green = int(89 * normalized + 89 * (1 - normalized))
-                            blue = int(115 * normalized + 115 * (1 - normalized))
-                            colors.append(f'rgb({red}, {green}, {blue})')
-                    
-                    fig_dias.add_trace(go.Bar(
-                        x=sinc_por_dia_recente['Data_Formatada'],
-                        y=sinc_por_dia_recente['Quantidade'],
-                        name='Sincronizações',
-                        text=sinc_por_dia_recente['Quantidade'],
-                        textposition='outside',
-                        marker_color=colors,
-                        marker_line_color=COR_AZUL_PETROLEO,
-                        marker_line_width=1.5,
-                        opacity=0.8
-                    ))
-                    
-                    fig_dias.update_layout(
-                        title='Sincronizações por Dia (Período Recente)' if len(sinc_por_dia) > 30 else 'Sincronizações por Dia',
-                        xaxis_title='Data (Dia/Mês)',
-                        yaxis_title='Quantidade de Sincronizações',
-                        height=400,
-                        plot_bgcolor=COR_BRANCO,
-                        showlegend=False,
-                        margin=dict(t=50, b=50, l=50, r=50),
-                        xaxis=dict(
-                            gridcolor='rgba(0,0,0,0.05)',
-                            tickangle=45
-                        ),
-                        yaxis=dict(
-                            gridcolor='rgba(0,0,0,0.05)',
-                            rangemode='tozero'
-                        )
-                    )
+                    sinc_por_dia_janela = selecionar_janela_datas(sinc_por_dia, key="janela_sinc_dia")
                     
+                    if len(sinc_por_dia_janela) <= LIMITE_BARRAS_DIARIAS:
+                        sinc_por_dia_recente = sinc_por_dia_janela.copy()
+                        sinc_por_dia_recente['Data_Formatada'] = sinc_por_dia_recente['Data'].apply(lambda x: x.strftime('%d/%m'))
+                        
+                        fig_dias = obter_figura('fig_dias', criar_grafico_sincronizacoes_dia, sinc_por_dia_recente,
+                                                periodo_recente=len(sinc_por_dia_janela) < len(sinc_por_dia))
+                    else:
+                        fig_dias = obter_figura('fig_dias_longo', criar_grafico_serie_diaria, sinc_por_dia_janela,
+                                                titulo='Sincronizações por Dia')
                     st.plotly_chart(fig_dias, use_container_width=True)
                     
                     col_dia1, col_dia2, col_dia3 = st.columns(3)
@@ -2650,47 +3331,9 @@ if st.session_state.df_original is not None:
                     st.markdown("### 👥 Sincronizações por SRE")
                     
                     if 'SRE' in df_sincronizados.columns:
-                        sre_por_dia = df_sincronizados.groupby(['Data', 'SRE']).size().reset_index()
-                        sre_por_dia.columns = ['Data', 'SRE', 'Quantidade']
-                        
-                        pivot_sre = sre_por_dia.pivot_table(
-                            index='Data',
-                            columns='SRE',
-                            values='Quantidade',
-                            aggfunc='sum',
-                            fill_value=0
-                        ).reset_index()
-                        
-                        fig_sre = go.Figure()
-                        
-                        for sre in pivot_sre.columns[1:]:
-                            fig_sre.add_trace(go.Bar(
-                                x=pivot_sre['Data'],
-                                y=pivot_sre[sre],
-                                name=sre,
-                                hovertemplate='Data: %{x|%d/%m/%Y}<br>SRE: ' + sre + '<br>Quantidade: %{y}<extra></extra>'
-                            ))
-                        
-                        fig_sre.update_layout(
-                            title='Sincronizações por SRE (Stacked)',
-                            barmode='stack',
-                            height=400,
-                            xaxis_title="Data",
-                            yaxis_title="Quantidade de Sincronizações",
-                            xaxis=dict(
-                                tickformat='%d/%m',
-                                tickangle=45
-                            ),
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
+                        pivot_sre = obter_agregado('sincronizacoes_dia_por', df, coluna='SRE', **recorte_sinc)
                         
+                        fig_sre = obter_figura('fig_sre', criar_grafico_sre_dia, pivot_sre)
                         st.plotly_chart(fig_sre, use_container_width=True)
                     
                     st.markdown("### 📝 Sincronizações por Tipo de Chamado")
@@ -2699,43 +3342,12 @@ if st.session_state.df_original is not None:
                         col_tipo1, col_tipo2 = st.columns([2, 1])
                         
                         with col_tipo1:
-                            tipo_por_dia = df_sincronizados.groupby(['Data', 'Tipo_Chamado']).size().reset_index()
-                            tipo_por_dia.columns = ['Data', 'Tipo', 'Quantidade']
-                            
-                            pivot_tipo = tipo_por_dia.pivot_table(
-                                index='Data',
-                                columns='Tipo',
-                                values='Quantidade',
-                                aggfunc='sum',
-                                fill_value=0
-                            ).reset_index()
-                            
-                            fig_tipo = go.Figure()
+                            pivot_tipo = obter_agregado('sincronizacoes_dia_por', df, coluna='Tipo_Chamado', **recorte_sinc)
                             
                             top_tipos = df_sincronizados['Tipo_Chamado'].value_counts().head(5).index.tolist()
                             
-                            for tipo in top_tipos:
-                                if tipo in pivot_tipo.columns:
-                                    fig_tipo.add_trace(go.Scatter(
-                                        x=pivot_tipo['Data'],
-                                        y=pivot_tipo[tipo],
-                                        mode='lines+markers',
-                                        name=tipo,
-                                        hovertemplate='Data: %{x|%d/%m/%Y}<br>Tipo: ' + tipo + '<br>Quantidade: %{y}<extra></extra>'
-                                    ))
-                            
-                            fig_tipo.update_layout(
-                                title='Evolução dos 5 Tipos Mais Frequentes',
-                                height=350,
-                                xaxis_title="Data",
-                                yaxis_title="Quantidade",
-                                xaxis=dict(
-                                    tickformat='%d/%m',
-                                    tickangle=45
-                                ),
-                                showlegend=True
-                            )
-                            
+                            fig_tipo = obter_figura('fig_tipo', criar_grafico_tipo_dia, pivot_tipo,
+                                                    top_tipos=top_tipos)
                             st.plotly_chart(fig_tipo, use_container_width=True)
                         
                         with col_tipo2:
@@ -2758,44 +3370,12 @@ if st.session_state.df_original is not None:
                         col_empresa1, col_empresa2 = st.columns([2, 1])
                         
                         with col_empresa1:
-                            empresa_por_dia = df_sincronizados.groupby(['Data', 'Empresa']).size().reset_index()
-                            empresa_por_dia.columns = ['Data', 'Empresa', 'Quantidade']
-                            
-                            pivot_empresa = empresa_por_dia.pivot_table(
-                                index='Data',
-                                columns='Empresa',
-                                values='Quantidade',
-                                aggfunc='sum',
-                                fill_value=0
-                            ).reset_index()
-                            
-                            fig_empresa = go.Figure()
+                            pivot_empresa = obter_agregado('sincronizacoes_dia_por', df, coluna='Empresa', **recorte_sinc)
                             
                             top_empresas = df_sincronizados['Empresa'].value_counts().head(5).index.tolist()
                             
-                            for empresa in top_empresas:
-                                if empresa in pivot_empresa.columns:
-                                    fig_empresa.add_trace(go.Scatter(
-                                        x=pivot_empresa['Data'],
-                                        y=pivot_empresa[empresa],
-                                        mode='lines',
-                                        name=empresa,
-                                        stackgroup='one',
-                                        hovertemplate='Data: %{x|%d/%m/%Y}<br>Empresa: ' + empresa + '<br>Quantidade: %{y}<extra></extra>'
-                                    ))
-                            
-                            fig_empresa.update_layout(
-                                title='Sincronizações por Empresa (Top 5) - Gráfico de Área Empilhado',
-                                height=350,
-                                xaxis_title="Data",
-                                yaxis_title="Quantidade",
-                                xaxis=dict(
-                                    tickformat='%d/%m',
-                                    tickangle=45
-                                ),
-                                showlegend=True
-                            )
-                            
+                            fig_empresa = obter_figura('fig_empresa', criar_grafico_empresa_dia, pivot_empresa,
+                                                       top_empresas=top_empresas)
                             st.plotly_chart(fig_empresa, use_container_width=True)
                         
                         with col_empresa2:
@@ -2818,7 +3398,7 @@ if st.session_state.df_original is not None:
             else:
                 st.info("ℹ️ Selecione filtros para visualizar os dados de sincronização por dia.")
         
-        with tab4:
+        with tab4, medir("🏆 Análise Avançada SRE"):
             st.markdown(f'<div class="section-title">🏆 PERFORMANCE DOS SREs</div>', unsafe_allow_html=True)
             
             if 'SRE' in df.columns and 'Status' in df.columns and 'Revisões' in df.columns:
@@ -2844,44 +3424,18 @@ if st.session_state.df_original is not None:
                             key="filtro_mes_sre"
                         )
                 
-                df_sre = df.copy()
-                
-                if 'Ano' in df_sre.columns and ano_sre != 'Todos':
-                    df_sre = df_sre[df_sre['Ano'] == int(ano_sre)]
-                
-                if 'Mês' in df_sre.columns and mes_sre != 'Todos':
-                    df_sre = df_sre[df_sre['Mês'] == int(mes_sre)]
-                
-                def substituir_nome_sre(sre_nome):
-                    if pd.isna(sre_nome):
-                        return "Não informado"
-                    
-                    sre_nome_str = str(sre_nome).lower()
-                    
-                    if "kewin" in sre_nome_str or "ferreira" in sre_nome_str:
-                        return "Kewin Marcel"
-                    elif "pierry" in sre_nome_str or "perez" in sre_nome_str:
-                        return "Pierry Perez"
-                    elif "bruna" in sre_nome_str or "maciel" in sre_nome_str:
-                        return "Bruna Maciel"
-                    elif "ramiza" in sre_nome_str or "irineu" in sre_nome_str:
-                        return "Ramiza Irineu"
-                    else:
-                        return sre_nome
+                df_sre = recortar_periodo(
+                    df,
+                    ano=int(ano_sre) if 'Ano' in df.columns and ano_sre != 'Todos' else None,
+                    meses=[int(mes_sre)] if 'Mês' in df.columns and mes_sre != 'Todos' else None
+                ).copy()
                 
                 df_sincronizados = df_sre[df_sre['Status'] == 'Sincronizado'].copy()
                 
                 if not df_sincronizados.empty and 'SRE' in df_sincronizados.columns:
                     st.markdown("### 📈 Sincronizados por SRE")
                     
-                    sinc_por_sre = df_sincronizados.groupby('SRE').size().reset_index()
-                    sinc_por_sre.columns = ['SRE', 'Sincronizados']
-                    sinc_por_sre = sinc_por_sre.sort_values('Sincronizados', ascending=False)
-                    
-                    sinc_por_sre['SRE_Nome'] = sinc_por_sre['SRE'].apply(substituir_nome_sre)
-                    
-                    sinc_por_sre_nome = sinc_por_sre.groupby('SRE_Nome')['Sincronizados'].sum().reset_index()
-                    sinc_por_sre_nome = sinc_por_sre_nome.sort_values('Sincronizados', ascending=False)
+                    sinc_por_sre_nome = obter_agregado('sincronizados_por_sre', df, ano=ano_sre, mes=mes_sre)
                     
                     fig_sinc_bar = go.Figure()
                     
@@ -3067,7 +3621,7 @@ if st.session_state.df_original is not None:
                     
                     with col_saz_filtro2:
                         if ano_saz != 'Todos os Anos':
-                            meses_ano = df[df['Ano'] == int(ano_saz)]['Mês'].unique()
+                            meses_ano = recortar_periodo(df, ano=int(ano_saz))['Mês'].unique()
                             meses_opcoes = ['Todos os Meses'] + sorted([str(int(m)) for m in meses_ano])
                             mes_saz = st.selectbox(
                                 "Selecionar Mês:",
@@ -3084,13 +3638,11 @@ if st.session_state.df_original is not None:
                             index=0
                         )
                     
-                    df_saz = df.copy()
-                    
-                    if ano_saz != 'Todos os Anos':
-                        df_saz = df_saz[df_saz['Ano'] == int(ano_saz)]
-                    
-                    if mes_saz != 'Todos os Meses':
-                        df_saz = df_saz[df_saz['Mês'] == int(mes_saz)]
+                    df_saz = recortar_periodo(
+                        df,
+                        ano=int(ano_saz) if ano_saz != 'Todos os Anos' else None,
+                        meses=[int(mes_saz)] if mes_saz != 'Todos os Meses' else None
+                    ).copy()
                     
                     st.markdown("### 📅 Padrões por Dia da Semana")
                     
@@ -3113,50 +3665,7 @@ if st.session_state.df_original is not None:
                         dados_dia = pd.merge(demanda_dia, sinc_dia, on='Dia', how='left').fillna(0)
                         dados_dia['Taxa_Sinc'] = (dados_dia['Sincronizados'] / dados_dia['Total_Demandas'] * 100).round(1)
                         
-                        fig_dias = go.Figure()
-                        
-                        fig_dias.add_trace(go.Bar(
-                            x=dados_dia['Dia'],
-                            y=dados_dia['Total_Demandas'],
-                            name='Total Demandas',
-                            marker_color=COR_AZUL_ESCURO,
-                            text=dados_dia['Total_Demandas'],
-                            textposition='auto'
-                        ))
-                        
-                        fig_dias.add_trace(go.Bar(
-                            x=dados_dia['Dia'],
-                            y=dados_dia['Sincronizados'],
-                            name='Sincronizados',
-                            marker_color=COR_VERDE_ESCURO,
-                            text=dados_dia['Sincronizados'],
-                            textposition='auto'
-                        ))
-                        
-                        fig_dias.add_trace(go.Scatter(
-                            x=dados_dia['Dia'],
-                            y=dados_dia['Taxa_Sinc'],
-                            name='Taxa Sinc (%)',
-                            yaxis='y2',
-                            mode='lines+markers',
-                            line=dict(color=COR_LARANJA, width=3),
-                            marker=dict(size=8)
-                        ))
-                        
-                        fig_dias.update_layout(
-                            title='Demandas e Sincronizações por Dia da Semana',
-                            barmode='group',
-                            yaxis=dict(title='Quantidade'),
-                            yaxis2=dict(
-                                title='Taxa Sinc (%)',
-                                overlaying='y',
-                                side='right',
-                                range=[0, 100]
-                            ),
-                            height=400,
-                            showlegend=True
-                        )
-                        
+                        fig_dias = obter_figura('fig_dia_semana', criar_grafico_dia_semana, dados_dia)
                         st.plotly_chart(fig_dias, use_container_width=True)
                     
                     with col_dia2:
@@ -3176,7 +3685,7 @@ if st.session_state.df_original is not None:
                         
                         with col_hora_filtro2:
                             if ano_hora != 'Todos os Anos':
-                                meses_hora = df[df['Ano'] == int(ano_hora)]['Mês'].unique()
+                                meses_hora = recortar_periodo(df, ano=int(ano_hora))['Mês'].unique()
                                 meses_opcoes_hora = ['Todos os Meses'] + sorted([str(int(m)) for m in meses_hora])
                                 mes_hora = st.selectbox(
                                     "Mês para análise horária:",
@@ -3186,13 +3695,11 @@ if st.session_state.df_original is not None:
                             else:
                                 mes_hora = 'Todos os Meses'
                         
-                        df_hora = df.copy()
-                        
-                        if ano_hora != 'Todos os Anos':
-                            df_hora = df_hora[df_hora['Ano'] == int(ano_hora)]
-                        
-                        if mes_hora != 'Todos os Meses':
-                            df_hora = df_hora[df_hora['Mês'] == int(mes_hora)]
+                        df_hora = recortar_periodo(
+                            df,
+                            ano=int(ano_hora) if ano_hora != 'Todos os Anos' else None,
+                            meses=[int(mes_hora)] if mes_hora != 'Todos os Meses' else None
+                        ).copy()
                         
                         subtitulo_hora = "Análise por Hora"
                         if ano_hora != 'Todos os Anos':
@@ -3218,65 +3725,8 @@ if st.session_state.df_original is not None:
                         dados_hora = pd.merge(demanda_hora, sinc_hora, on='Hora', how='left').fillna(0)
                         dados_hora['Taxa_Sinc'] = (dados_hora['Sincronizados'] / dados_hora['Total_Demandas'] * 100).where(dados_hora['Total_Demandas'] > 0, 0).round(1)
                         
-                        fig_horas = go.Figure()
-                        
-                        fig_horas.add_trace(go.Scatter(
-                            x=dados_hora['Hora'],
-                            y=dados_hora['Total_Demandas'],
-                            name='Total Demandas',
-                            mode='lines+markers',
-                            line=dict(color=COR_AZUL_ESCURO, width=3),
-                            marker=dict(size=8)
-                        ))
-                        
-                        fig_horas.add_trace(go.Scatter(
-                            x=dados_hora['Hora'],
-                            y=dados_hora['Sincronizados'],
-                            name='Sincronizados',
-                            mode='lines+markers',
-                            line=dict(color=COR_VERDE_ESCURO, width=3),
-                            marker=dict(size=8)
-                        ))
-                        
-                        if not dados_hora.empty:
-                            pico_demanda = dados_hora.loc[dados_hora['Total_Demandas'].idxmax()]
-                            pico_sinc = dados_hora.loc[dados_hora['Sincronizados'].idxmax()]
-                            
-                            hora_pico_demanda = f"{int(pico_demanda['Hora'])}:00h"
-                            hora_pico_sinc = f"{int(pico_sinc['Hora'])}:00h"
-                            
-                            fig_horas.add_annotation(
-                                x=pico_demanda['Hora'],
-                                y=pico_demanda['Total_Demandas'],
-                                text=f"Pico Demandas: {int(pico_demanda['Total_Demandas'])}<br>{hora_pico_demanda}",
-                                showarrow=True,
-                                arrowhead=2,
-                                ax=0,
-                                ay=-40,
-                                bgcolor="white",
-                                bordercolor="black"
-                            )
-                            
-                            fig_horas.add_annotation(
-                                x=pico_sinc['Hora'],
-                                y=pico_sinc['Sincronizados'],
-                                text=f"Pico Sinc: {int(pico_sinc['Sincronizados'])}<br>{hora_pico_sinc}",
-                                showarrow=True,
-                                arrowhead=2,
-                                ax=0,
-                                ay=40,
-                                bgcolor="white",
-                                bordercolor="green"
-                            )
-                        
-                        fig_horas.update_layout(
-                            title=f'Demandas por Hora do Dia - {subtitulo_hora}',
-                            xaxis_title='Hora do Dia',
-                            yaxis_title='Quantidade',
-                            height=400,
-                            showlegend=True
-                        )
-                        
+                        fig_horas = obter_figura('fig_horas', criar_grafico_horas, dados_hora,
+                                                 subtitulo_hora=subtitulo_hora)
                         st.plotly_chart(fig_horas, use_container_width=True)
                         
                         if not dados_hora.empty:
@@ -3371,91 +3821,21 @@ if st.session_state.df_original is not None:
                         else:
                             st.markdown("**Todos os anos**")
                     
-                    if ano_saz_mes != 'Todos os Anos':
-                        df_saz_mes = df[df['Ano'] == int(ano_saz_mes)].copy()
-                    else:
-                        df_saz_mes = df.copy()
+                    dados_mes = obter_agregado('sazonalidade_mensal', df, ano=ano_saz_mes)
                     
-                    if not df_saz_mes.empty:
-                        meses_ordem = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+                    if not dados_mes.empty:
                         meses_nomes_completos = {
                             'Jan': 'Janeiro', 'Fev': 'Fevereiro', 'Mar': 'Março', 'Abr': 'Abril',
                             'Mai': 'Maio', 'Jun': 'Junho', 'Jul': 'Julho', 'Ago': 'Agosto',
                             'Set': 'Setembro', 'Out': 'Outubro', 'Nov': 'Novembro', 'Dez': 'Dezembro'
                         }
                         
-                        if 'Nome_Mês' in df_saz_mes.columns:
-                            df_saz_mes['Mês_Abrev'] = df_saz_mes['Nome_Mês']
-                        else:
-                            df_saz_mes['Mês_Abrev'] = df_saz_mes['Criado'].dt.month.map({
-                                1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr',
-                                5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
-                                9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
-                            })
-                        
-                        demanda_mes = df_saz_mes.groupby('Mês_Abrev').size().reset_index()
-                        demanda_mes.columns = ['Mês', 'Total']
-                        
-                        demanda_mes = demanda_mes.set_index('Mês').reindex(meses_ordem).reset_index()
-                        demanda_mes['Total'] = demanda_mes['Total'].fillna(0).astype(int)
-                        
-                        sinc_mes = df_saz_mes[df_saz_mes['Status'] == 'Sincronizado'].groupby('Mês_Abrev').size().reset_index()
-                        sinc_mes.columns = ['Mês', 'Sincronizados']
-                        
-                        sinc_mes = sinc_mes.set_index('Mês').reindex(meses_ordem).reset_index()
-                        sinc_mes['Sincronizados'] = sinc_mes['Sincronizados'].fillna(0).astype(int)
-                        
-                        dados_mes = pd.merge(demanda_mes, sinc_mes, on='Mês', how='left').fillna(0)
-                        dados_mes['Taxa_Sinc'] = (dados_mes['Sincronizados'] / dados_mes['Total'] * 100).where(dados_mes['Total'] > 0, 0).round(1)
-                        
                         titulo_grafico = f'Distribuição Mensal'
                         if ano_saz_mes != 'Todos os Anos':
                             titulo_grafico += f' - {ano_saz_mes}'
                         
-                        fig_mes_saz = go.Figure()
-                        
-                        fig_mes_saz.add_trace(go.Bar(
-                            x=dados_mes['Mês'],
-                            y=dados_mes['Total'],
-                            name='Total Demandas',
-                            marker_color=COR_AZUL_ESCURO,
-                            text=dados_mes['Total'],
-                            textposition='auto'
-                        ))
-                        
-                        fig_mes_saz.add_trace(go.Bar(
-                            x=dados_mes['Mês'],
-                            y=dados_mes['Sincronizados'],
-                            name='Sincronizados',
-                            marker_color=COR_VERDE_ESCURO,
-                            text=dados_mes['Sincronizados'],
-                            textposition='auto'
-                        ))
-                        
-                        fig_mes_saz.add_trace(go.Scatter(
-                            x=dados_mes['Mês'],
-                            y=dados_mes['Taxa_Sinc'],
-                            name='Taxa Sinc (%)',
-                            yaxis='y2',
-                            mode='lines+markers',
-                            line=dict(color=COR_LARANJA, width=3),
-                            marker=dict(size=8)
-                        ))
-                        
-                        fig_mes_saz.update_layout(
-                            title=titulo_grafico,
-                            barmode='group',
-                            yaxis=dict(title='Quantidade'),
-                            yaxis2=dict(
-                                title='Taxa Sinc (%)',
-                                overlaying='y',
-                                side='right',
-                                range=[0, 100]
-                            ),
-                            height=400,
-                            showlegend=True
-                        )
-                        
+                        fig_mes_saz = obter_figura('fig_mes_saz', criar_grafico_sazonalidade_mensal, dados_mes,
+                                                   titulo_grafico=titulo_grafico)
                         st.plotly_chart(fig_mes_saz, use_container_width=True)
                         
                         col_pico1, col_pico2, col_pico3 = st.columns(3)
@@ -3568,13 +3948,11 @@ if st.session_state.df_original is not None:
                     col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
                     
                     with col_filtro1:
-                        qtd_demandas = st.slider(
-                            "Número de demandas:",
-                            min_value=5,
-                            max_value=50,
-                            value=15,
-                            step=5,
-                            key="slider_demandas"
+                        tamanho_pagina = st.selectbox(
+                            "Demandas por página:",
+                            options=[10, 15, 25, 50, 100],
+                            index=1,
+                            key="tamanho_pagina_demandas"
                         )
                     
                     with col_filtro2:
@@ -3600,60 +3978,71 @@ if st.session_state.df_original is not None:
                             key="input_filtro_chamado"
                         )
                     
-                    ultimas_demandas = df.copy()
+                    ultimas_demandas = df
                     
                     if filtro_chamado_principal:
                         ultimas_demandas = ultimas_demandas[
                             ultimas_demandas['Chamado'].astype(str).str.contains(filtro_chamado_principal, na=False)
                         ]
                     
-                    if ordenar_por == 'Data (Mais Recente)':
-                        ultimas_demandas = ultimas_demandas.sort_values('Criado', ascending=False)
-                    elif ordenar_por == 'Data (Mais Antiga)':
-                        ultimas_demandas = ultimas_demandas.sort_values('Criado', ascending=True)
-                    elif ordenar_por == 'Revisões (Maior)':
-                        ultimas_demandas = ultimas_demandas.sort_values('Revisões', ascending=False)
-                    elif ordenar_por == 'Revisões (Menor)':
-                        ultimas_demandas = ultimas_demandas.sort_values('Revisões', ascending=True)
-                    
                     if filtro_chamado_tabela:
                         ultimas_demandas = ultimas_demandas[
                             ultimas_demandas['Chamado'].astype(str).str.contains(filtro_chamado_tabela, na=False)
                         ]
                     
-                    ultimas_demandas = ultimas_demandas.head(qtd_demandas)
-                    
-                    display_data = pd.DataFrame()
-                    
-                    if 'Chamado' in mostrar_colunas and 'Chamado' in ultimas_demandas.columns:
-                        display_data['Chamado'] = ultimas_demandas['Chamado']
-                    
-                    if 'Tipo_Chamado' in mostrar_colunas and 'Tipo_Chamado' in ultimas_demandas.columns:
-                        display_data['Tipo'] = ultimas_demandas['Tipo_Chamado']
-                    
-                    if 'Responsável' in mostrar_colunas and 'Responsável' in ultimas_demandas.columns:
-                        display_data['Responsável'] = ultimas_demandas['Responsável']
-                    
-                    if 'Responsável_Formatado' in mostrar_colunas and 'Responsável_Formatado' in ultimas_demandas.columns:
-                        display_data['Responsável Formatado'] = ultimas_demandas['Responsável_Formatado']
-                    
-                    if 'Status' in mostrar_colunas and 'Status' in ultimas_demandas.columns:
-                        display_data['Status'] = ultimas_demandas['Status']
-                    
-                    if 'Prioridade' in mostrar_colunas and 'Prioridade' in ultimas_demandas.columns:
-                        display_data['Prioridade'] = ultimas_demandas['Prioridade']
+                    ordenacoes = {
+                        'Data (Mais Recente)': ('Criado', False),
+                        'Data (Mais Antiga)': ('Criado', True),
+                        'Revisões (Maior)': ('Revisões', False),
+                        'Revisões (Menor)': ('Revisões', True)
+                    }
+                    coluna_ordem, ascendente = ordenacoes[ordenar_por]
+                    
+                    colunas_pagina = [
+                        coluna for coluna, (origem, _) in COLUNAS_ULTIMAS_DEMANDAS.items()
+                        if coluna in mostrar_colunas and origem in ultimas_demandas.columns
+                    ]
+                    
+                    total_resultados = len(ultimas_demandas)
+                    total_paginas = max(1, -(-total_resultados // tamanho_pagina))
+                    
+                    # A página vive só no Session State (sem value= no widget): o filtro
+                    # pode reduzir o total de páginas e a atual é trazida para o limite
+                    st.session_state.setdefault('pagina_demandas', 1)
+                    if st.session_state.pagina_demandas > total_paginas:
+                        st.session_state.pagina_demandas = total_paginas
+                    
+                    col_pagina, col_info_pagina = st.columns([1, 3])
+                    
+                    with col_pagina:
+                        pagina_atual = st.number_input(
+                            "Página:",
+                            min_value=1,
+                            max_value=total_paginas,
+                            step=1,
+                            key="pagina_demandas"
+                        )
                     
-                    if 'Revisões' in mostrar_colunas and 'Revisões' in ultimas_demandas.columns:
-                        display_data['Revisões'] = ultimas_demandas['Revisões']
+                    pagina_dados = paginar_demandas(
+                        ultimas_demandas,
+                        coluna_ordem,
+                        ascendente,
+                        pagina=int(pagina_atual) - 1,
+                        tamanho_pagina=tamanho_pagina,
+                        colunas=[COLUNAS_ULTIMAS_DEMANDAS[c][0] for c in colunas_pagina]
+                    )
                     
-                    if 'Empresa' in mostrar_colunas and 'Empresa' in ultimas_demandas.columns:
-                        display_data['Empresa'] = ultimas_demandas['Empresa']
+                    with col_info_pagina:
+                        if total_resultados > 0:
+                            primeiro_item = (int(pagina_atual) - 1) * tamanho_pagina + 1
+                            ultimo_item = primeiro_item + len(pagina_dados) - 1
+                            st.markdown(f"**📄 Exibindo {primeiro_item:,}–{ultimo_item:,} de {total_resultados:,} demandas** (página {int(pagina_atual)} de {total_paginas})")
                     
-                    if 'SRE' in mostrar_colunas and 'SRE' in ultimas_demandas.columns:
-                        display_data['SRE'] = ultimas_demandas['SRE']
+                    display_data = pagina_dados.copy()
+                    display_data.columns = [COLUNAS_ULTIMAS_DEMANDAS[c][1] for c in colunas_pagina]
                     
-                    if 'Data' in mostrar_colunas and 'Criado' in ultimas_demandas.columns:
-                        display_data['Data Criação'] = ultimas_demandas['Criado'].dt.strftime('%d/%m/%Y %H:%M')
+                    if 'Data Criação' in display_data.columns:
+                        display_data['Data Criação'] = display_data['Data Criação'].dt.strftime('%d/%m/%Y %H:%M')
                     
                     if not display_data.empty:
                         st.dataframe(
@@ -3662,19 +4051,76 @@ if st.session_state.df_original is not None:
                             height=400
                         )
                         
-                        csv = display_data.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button(
-                            label="📥 Exportar esta tabela",
-                            data=csv,
-                            file_name=f"ultimas_demandas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv",
-                            use_container_width=True,
+                        botao_download_sob_demanda(
+                            "📥 Exportar esta tabela",
+                            gerar_df=lambda: display_data,
+                            chave=chave_filtros_sidebar() + (
+                                filtro_chamado_principal, filtro_chamado_tabela, ordenar_por,
+                                tuple(colunas_pagina), int(tamanho_pagina), int(pagina_atual)
+                            ),
+                            nome_base="ultimas_demandas",
                             key="btn_exportar"
                         )
                     else:
                         st.info("Nenhum resultado encontrado com os filtros aplicados.")
     
-    with tab_mapa:
+        with tab5, medir("⏳ Tempo de Ciclo"):
+            st.markdown(f'<div class="section-title">⏳ TEMPO DE CICLO - DA CRIAÇÃO À SINCRONIZAÇÃO</div>', unsafe_allow_html=True)
+            st.caption("Tempo entre Criado e Modificado dos cartões sincronizados, nos filtros da barra lateral.")
+            
+            ciclo = obter_tempo_ciclo(df)
+            histograma_geral, tabela_geral = ciclo['geral']
+            
+            if not ciclo['dimensoes'] or tabela_geral['Cartões'].iloc[0] == 0:
+                st.info("Nenhum cartão sincronizado com datas válidas nos filtros aplicados.")
+            else:
+                resumo_geral = tabela_geral.iloc[0]
+                col_ciclo1, col_ciclo2, col_ciclo3, col_ciclo4 = st.columns(4)
+                with col_ciclo1:
+                    st.metric("📦 Cartões medidos", f"{int(resumo_geral['Cartões']):,}")
+                with col_ciclo2:
+                    st.metric("⏱️ P50 (mediana)", esteira.formatar_duracao(resumo_geral['P50']))
+                with col_ciclo3:
+                    st.metric("⏱️ P85", esteira.formatar_duracao(resumo_geral['P85']))
+                with col_ciclo4:
+                    st.metric("⏱️ P95", esteira.formatar_duracao(resumo_geral['P95']))
+                
+                col_ciclo_dim, col_ciclo_grupo = st.columns(2)
+                with col_ciclo_dim:
+                    dimensao_ciclo = st.selectbox(
+                        "📊 Agrupar por:",
+                        options=list(ciclo['dimensoes']),
+                        key="ciclo_dimensao"
+                    )
+                histograma_ciclo, tabela_ciclo = ciclo['dimensoes'][dimensao_ciclo]
+                with col_ciclo_grupo:
+                    grupo_ciclo = st.selectbox(
+                        "🔎 Distribuição de:",
+                        options=['Todos'] + list(tabela_ciclo.index),
+                        key=f"ciclo_grupo_{dimensao_ciclo}"
+                    )
+                
+                if grupo_ciclo == 'Todos':
+                    histograma_grupo = histograma_geral.iloc[0]
+                    titulo_hist = 'Distribuição do Tempo de Ciclo'
+                else:
+                    histograma_grupo = histograma_ciclo.loc[grupo_ciclo]
+                    titulo_hist = f'Distribuição do Tempo de Ciclo - {grupo_ciclo}'
+                
+                fig_hist_ciclo = obter_figura('fig_ciclo_histograma', criar_grafico_histograma_ciclo,
+                                              histograma_grupo, titulo=titulo_hist)
+                st.plotly_chart(fig_hist_ciclo, use_container_width=True)
+                
+                fig_perc_ciclo = obter_figura('fig_ciclo_percentis', criar_grafico_percentis_ciclo,
+                                              tabela_ciclo, dimensao=dimensao_ciclo)
+                st.plotly_chart(fig_perc_ciclo, use_container_width=True)
+                
+                tabela_exibicao = tabela_ciclo.copy()
+                for coluna in ['P50', 'P85', 'P95', 'Média']:
+                    tabela_exibicao[coluna] = tabela_exibicao[coluna].map(esteira.formatar_duracao)
+                st.dataframe(tabela_exibicao, use_container_width=True)
+
+    with tab_mapa, medir("Aba 🗺️ Mapa", linhas=len(df)):
         st.markdown("## 🗺️ Mapa de Sincronizações por Empresa")
         
         # Filtros para o mapa
@@ -3706,7 +4152,7 @@ if st.session_state.df_original is not None:
         
         with col_mapa_filtro3:
             if 'Mês' in df.columns and ano_filtro_mapa != 'Todos':
-                df_ano_mapa = df[df['Ano'] == int(ano_filtro_mapa)]
+                df_ano_mapa = recortar_periodo(df, ano=int(ano_filtro_mapa))
                 meses_disponiveis_mapa = sorted(df_ano_mapa['Mês'].dropna().unique().astype(int))
                 meses_opcoes_mapa = ['Todos'] + [f"{m:02d}" for m in meses_disponiveis_mapa]
                 mes_filtro_mapa = st.selectbox(
@@ -3719,11 +4165,11 @@ if st.session_state.df_original is not None:
                 mes_filtro_mapa = 'Todos'
         
         # Processar dados para o mapa
-        df_mapa, total_sinc_filtrado = processar_dados_mapa(
-            df,
-            empresas_selecionadas=empresas_selecionadas_mapa,
-            ano_filtro=ano_filtro_mapa,
-            mes_filtro=mes_filtro_mapa
+        df_mapa, total_sinc_filtrado = obter_agregado(
+            'mapa', df,
+            empresas=empresas_selecionadas_mapa,
+            ano=ano_filtro_mapa,
+            mes=mes_filtro_mapa
         )
         
         # Métricas do mapa
@@ -3786,9 +4232,10 @@ if st.session_state.df_original is not None:
         # Mapa Folium
         st.markdown('<div class="section-title">📍 MAPA DE BOLHAS </div>', unsafe_allow_html=True)
         
-        m = criar_mapa_folium(df_mapa)
+        with medir("Mapa Folium", linhas=len(df_mapa)):
+            m = criar_mapa_folium(df_mapa)
+            mapa_html = m._repr_html_() if m else None
         if m:
-            mapa_html = m._repr_html_()
             
             wrapper = f"""
             <div style="
@@ -3808,7 +4255,7 @@ if st.session_state.df_original is not None:
         # Ranking de barras ESTILIZADO
         st.markdown('<div class="section-title">🏆 RANKING DE SINCRONIZAÇÕES POR EMPRESA</div>', unsafe_allow_html=True)
         
-        fig_barras = criar_grafico_barras(df_mapa)
+        fig_barras = obter_figura('fig_barras', criar_grafico_barras, df_mapa)
         if fig_barras:
             st.plotly_chart(fig_barras, use_container_width=True, config={'displayModeBar': True})
         
@@ -3857,13 +4304,14 @@ if st.session_state.df_original is not None:
                     height=400
                 )
                 
-                csv = tabela_detalhes[['Empresa', 'UF', 'Estado', 'Região', 'Sincronizações', '% Total']].to_csv(index=False).encode('utf-8-sig')
-                st.download_button(
-                    label="📥 Exportar dados para CSV",
-                    data=csv,
-                    file_name=f"sincronismos_empresas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv",
-                    use_container_width=True
+                botao_download_sob_demanda(
+                    "📥 Exportar dados",
+                    gerar_df=lambda: tabela_detalhes[['Empresa', 'UF', 'Estado', 'Região', 'Sincronizações', '% Total']],
+                    chave=chave_filtros_sidebar() + (
+                        tuple(empresas_selecionadas_mapa), str(ano_filtro_mapa), str(mes_filtro_mapa)
+                    ),
+                    nome_base="sincronismos_empresas",
+                    key="btn_exportar_mapa"
                 )
         
         # Legenda
@@ -3909,46 +4357,11 @@ if st.session_state.df_original is not None:
     # ============================================
     # NOVA ABA: KPI IPE - ACUMULADO POR MÊS
     # ============================================
-    with tab_ipe:
+    with tab_ipe, medir("Aba 📈 KPI", linhas=len(df)):
         st.markdown(f'<div class="section-title">🎯 KPI IPE - ÍNDICE DE PERFORMANCE DO ESPECIALISTA</div>', unsafe_allow_html=True)
         
         if 'SRE' in df.columns and 'Status' in df.columns and 'Retorno_Cliente' in df.columns:
             
-            def is_retorno_sim(valor):
-                """Verifica se o valor indica retorno do cliente (Sim)"""
-                if pd.isna(valor):
-                    return False
-                valor_str = str(valor).strip().upper()
-                return valor_str in ['SIM', 'S', 'YES', 'Y', '1', 'TRUE']
-            
-            def calcular_ipe(ca, cr, cd, ct, na):
-                if cd <= 0 or na <= 0:
-                    return 0
-                numerador = ca - cr
-                termo1 = ct / cd
-                termo2 = termo1 / na
-                modulo = abs(termo2 - 1)
-                denominador = cd + modulo
-                if denominador <= 0:
-                    return 0
-                ipe = numerador / denominador
-                return min(ipe, 1.0)
-            
-            def substituir_nome_sre(sre_nome):
-                if pd.isna(sre_nome):
-                    return "Não informado"
-                sre_nome_str = str(sre_nome).lower()
-                if "kewin" in sre_nome_str or "ferreira" in sre_nome_str:
-                    return "Kewin Marcel"
-                elif "pierry" in sre_nome_str or "perez" in sre_nome_str:
-                    return "Pierry Perez"
-                elif "bruna" in sre_nome_str or "maciel" in sre_nome_str:
-                    return "Bruna Maciel"
-                elif "ramiza" in sre_nome_str or "irineu" in sre_nome_str:
-                    return "Ramiza Irineu"
-                else:
-                    return sre_nome
-            
             # FILTROS
             st.markdown("### 📅 Filtros de Período")
             col_filtro_ipe1, col_filtro_ipe2 = st.columns(2)
@@ -3963,7 +4376,7 @@ if st.session_state.df_original is not None:
             
             with col_filtro_ipe2:
                 if 'Mês' in df.columns:
-                    meses_map = {1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril', 5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto', 9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'}
+                    meses_map = NOMES_MESES_COMPLETOS
                     meses_disponiveis = sorted(df['Mês'].dropna().unique().astype(int))
                     meses_opcoes_ipe = [meses_map[m] for m in meses_disponiveis]
                     meses_selecionados_nomes = st.multiselect("📆 Selecionar Mês(es):", options=meses_opcoes_ipe, default=meses_opcoes_ipe, key="filtro_meses_ipe")
@@ -3972,38 +4385,11 @@ if st.session_state.df_original is not None:
                 else:
                     meses_selecionados_numeros = []
             
-            # APLICA FILTROS
-            df_ipe = df.copy()
-            if ano_ipe != 'Todos':
-                df_ipe = df_ipe[df_ipe['Ano'] == int(ano_ipe)]
-            if meses_selecionados_numeros:
-                df_ipe = df_ipe[df_ipe['Mês'].isin(meses_selecionados_numeros)]
-            
             # PERFORMANCE DETALHADA
             st.markdown("### 📊 Performance Detalhada - Período Selecionado")
-            cards_total_periodo = len(df_ipe)
-            total_sres_periodo = df_ipe['SRE'].nunique()
+            df_sres = obter_agregado('ipe_por_sre', df, ano=ano_ipe, meses=meses_selecionados_numeros)
             
-            sres_metrics = []
-            for sre in df_ipe['SRE'].dropna().unique():
-                df_sre_data = df_ipe[df_ipe['SRE'] == sre]
-                if len(df_sre_data) > 0:
-                    cd = len(df_sre_data)
-                    ca = len(df_sre_data[df_sre_data['Status'] == 'Sincronizado'])
-                    cr = len(df_sre_data[df_sre_data['Retorno_Cliente'].apply(is_retorno_sim)])
-                    
-                    ipe = calcular_ipe(ca, cr, cd, cards_total_periodo, total_sres_periodo)
-                    sres_metrics.append({
-                        'SRE': substituir_nome_sre(sre),
-                        'Cards Demandados': cd,
-                        'Cards Analisados': ca,
-                        'Cards Reabertos': cr,
-                        'IPE (%)': round(ipe * 100, 2),
-                        'Status': '✅ Meta' if ipe >= 0.95 else '⚠️ Abaixo'
-                    })
-            
-            if sres_metrics:
-                df_sres = pd.DataFrame(sres_metrics).sort_values('IPE (%)', ascending=False)
+            if not df_sres.empty:
                 st.dataframe(df_sres, use_container_width=True, column_config={
                     "SRE": st.column_config.TextColumn("SRE", width="small"),
                     "Cards Demandados": st.column_config.NumberColumn("Demandados", format="%d"),
@@ -4019,72 +4405,34 @@ if st.session_state.df_original is not None:
             st.markdown("### 📈 IPE Acumulado por Mês")
             st.caption("_Evolução do IPE acumulado mês a mês considerando TODO o período_")
             
-            if 'Criado' in df_ipe.columns and len(df_ipe) > 0:
-                df_ipe['Periodo'] = df_ipe['Criado'].dt.strftime('%Y-%m')
-                df_ipe['Nome_Mes_Completo'] = df_ipe['Criado'].dt.month.map({1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril', 5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto', 9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'})
-                meses_ordenados = sorted(df_ipe['Periodo'].unique())
+            df_acum = obter_agregado('ipe_acumulado', df, ano=ano_ipe, meses=meses_selecionados_numeros)
+            
+            if not df_acum.empty:
                 
-                acumulados = []
-                for periodo in meses_ordenados:
-                    df_ate = df_ipe[df_ipe['Periodo'] <= periodo]
-                    
-                    cd_acum = len(df_ate)
-                    ca_acum = len(df_ate[df_ate['Status'] == 'Sincronizado'])
-                    cr_acum = len(df_ate[df_ate['Retorno_Cliente'].apply(is_retorno_sim)])
-                    na_acum = df_ate['SRE'].nunique()
-                    
-                    ipe_acum = calcular_ipe(ca_acum, cr_acum, cd_acum, cd_acum, na_acum)
-                    
-                    df_ate_sorted = df_ate.sort_values('Criado')
-                    ultimo_mes_completo = df_ate_sorted['Nome_Mes_Completo'].iloc[-1] if len(df_ate_sorted) > 0 else periodo
-                    
-                    acumulados.append({
-                        'Mês': ultimo_mes_completo,
-                        'CD_Acum': cd_acum,
-                        'CA_Acum': ca_acum,
-                        'CR_Acum': cr_acum,
-                        'NA_Acum': na_acum,
-                        'IPE Acumulado (%)': round(ipe_acum * 100, 2)
-                    })
+                # GRÁFICO DE LINHA
+                fig_linha = obter_figura('fig_linha', criar_grafico_ipe_acumulado, df_acum)
+                st.plotly_chart(fig_linha, use_container_width=True)
                 
-                if acumulados:
-                    df_acum = pd.DataFrame(acumulados)
-                    
-                    # GRÁFICO DE LINHA
-                    fig_linha = go.Figure()
-                    fig_linha.add_trace(go.Scatter(
-                        x=df_acum['Mês'], 
-                        y=df_acum['IPE Acumulado (%)'], 
-                        mode='lines+markers+text', 
-                        line=dict(color=COR_AZUL_ESCURO, width=4), 
-                        marker=dict(size=12, color=COR_AZUL_PETROLEO), 
-                        text=df_acum['IPE Acumulado (%)'].apply(lambda x: f'{x:.1f}%'), 
-                        textposition='top center', 
-                        name='IPE Acumulado',
-                        hovertemplate='<b>%{x}</b><br>IPE: %{y:.1f}%<br>CD: %{customdata[0]:,}<br>CA: %{customdata[1]:,}<br>CR: %{customdata[2]:,}<br>SREs: %{customdata[3]}<extra></extra>',
-                        customdata=df_acum[['CD_Acum', 'CA_Acum', 'CR_Acum', 'NA_Acum']].values
-                    ))
-                    fig_linha.add_hline(y=95, line_dash="dash", line_color=COR_AZUL_PETROLEO, annotation_text="🎯 Meta 95%")
-                    fig_linha.add_hline(y=100, line_dash="dot", line_color=COR_CINZA_TEXTO, annotation_text="Limite 100%")
-                    fig_linha.add_trace(go.Scatter(x=df_acum['Mês'], y=df_acum['IPE Acumulado (%)'], fill='tozeroy', fillcolor='rgba(2, 138, 159, 0.1)', line=dict(width=0), showlegend=False, hoverinfo='skip'))
-                    fig_linha.update_layout(title='📈 Evolução do IPE Acumulado por Mês', xaxis_title='Mês', yaxis_title='IPE Acumulado (%)', yaxis=dict(range=[0, 105]), height=500, plot_bgcolor=COR_BRANCO)
-                    st.plotly_chart(fig_linha, use_container_width=True)
-                    
-                    # CARDS RESUMO
-                    ultimo = df_acum.iloc[-1]
-                    primeiro = df_acum.iloc[0]
-                    st.markdown("### 🎯 Resumo do Período Acumulado")
-                    col_r1, col_r2, col_r3, col_r4 = st.columns(4)
-                    with col_r1: st.metric("📅 Período", f"{primeiro['Mês']} - {ultimo['Mês']}")
-                    with col_r2: st.metric("📊 Total Cards", f"{ultimo['CD_Acum']:,}")
-                    with col_r3: st.metric("🎯 IPE Acumulado", f"{ultimo['IPE Acumulado (%)']:.2f}%", delta=f"{ultimo['IPE Acumulado (%)'] - 95:+.2f} pp", delta_color="normal" if ultimo['IPE Acumulado (%)'] >= 95 else "inverse")
-                    with col_r4: st.metric("👥 SREs Ativos", f"{ultimo['NA_Acum']}")
-                    
-                    # TABELA (EXPANDER)
-                    with st.expander("📋 Ver Tabela de Acumulados Mensais", expanded=False):
-                        st.dataframe(df_acum, use_container_width=True, column_config={"IPE Acumulado (%)": st.column_config.ProgressColumn("IPE %", format="%.2f%%", min_value=0, max_value=100)})
-                        csv_acum = df_acum.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button("📥 Exportar para CSV", data=csv_acum, file_name=f"ipe_acumulado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", mime="text/csv", use_container_width=True)
+                # CARDS RESUMO
+                ultimo = df_acum.iloc[-1]
+                primeiro = df_acum.iloc[0]
+                st.markdown("### 🎯 Resumo do Período Acumulado")
+                col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+                with col_r1: st.metric("📅 Período", f"{primeiro['Mês']} - {ultimo['Mês']}")
+                with col_r2: st.metric("📊 Total Cards", f"{ultimo['CD_Acum']:,}")
+                with col_r3: st.metric("🎯 IPE Acumulado", f"{ultimo['IPE Acumulado (%)']:.2f}%", delta=f"{ultimo['IPE Acumulado (%)'] - 95:+.2f} pp", delta_color="normal" if ultimo['IPE Acumulado (%)'] >= 95 else "inverse")
+                with col_r4: st.metric("👥 SREs Ativos", f"{ultimo['NA_Acum']}")
+                
+                # TABELA (EXPANDER)
+                with st.expander("📋 Ver Tabela de Acumulados Mensais", expanded=False):
+                    st.dataframe(df_acum, use_container_width=True, column_config={"IPE Acumulado (%)": st.column_config.ProgressColumn("IPE %", format="%.2f%%", min_value=0, max_value=100)})
+                    botao_download_sob_demanda(
+                        "📥 Exportar acumulados",
+                        gerar_df=lambda: df_acum,
+                        chave=chave_filtros_sidebar() + (str(ano_ipe), tuple(meses_selecionados_numeros)),
+                        nome_base="ipe_acumulado",
+                        key="btn_exportar_ipe"
+                    )
             
             # EXPLICAÇÃO
             with st.expander("📖 Entenda o Cálculo do IPE"):
@@ -4107,7 +4455,7 @@ if st.session_state.df_original is not None:
     # ============================================
     # NOVA ABA: ANÁLISE ESTATÍSTICA
     # ============================================
-    with tab_estatistica:
+    with tab_estatistica, medir("Aba 📈 Análise Estatística", linhas=len(df)):
         st.markdown("## 📈 ANÁLISE ESTATÍSTICA")
         st.markdown("_Análise de distribuição, percentis e tendência de sincronizações_")
         
@@ -4132,7 +4480,7 @@ if st.session_state.df_original is not None:
         with col_filtro_est2:
             if 'Mês' in df.columns:
                 if ano_est != 'Todos os Anos':
-                    df_ano_est = df[df['Ano'] == int(ano_est)]
+                    df_ano_est = recortar_periodo(df, ano=int(ano_est))
                     meses_est = sorted(df_ano_est['Mês'].dropna().unique().astype(int))
                     meses_opcoes_est = ['Todos os Meses'] + [f"{m:02d}" for m in meses_est]
                 else:
@@ -4161,11 +4509,11 @@ if st.session_state.df_original is not None:
             )
         
         # Aplicar filtros
-        df_est = df.copy()
-        if ano_est != 'Todos os Anos':
-            df_est = df_est[df_est['Ano'] == int(ano_est)]
-        if mes_est != 'Todos os Meses':
-            df_est = df_est[df_est['Mês'] == int(mes_est)]
+        df_est = recortar_periodo(
+            df,
+            ano=int(ano_est) if ano_est != 'Todos os Anos' else None,
+            meses=[int(mes_est)] if mes_est != 'Todos os Meses' else None
+        ).copy()
         
         # Filtrar apenas sincronizados para algumas análises
         df_sinc_est = df_est[df_est['Status'] == 'Sincronizado'].copy()
@@ -4183,20 +4531,15 @@ if st.session_state.df_original is not None:
             
             # Calcular métricas para sincronizados por dia
             if 'Criado' in df_sinc_est.columns:
-                df_sinc_est['Data'] = df_sinc_est['Criado'].dt.date
-                sinc_por_dia_est = df_sinc_est.groupby('Data').size().reset_index()
-                sinc_por_dia_est.columns = ['Data', 'Quantidade']
+                sinc_por_dia_est = obter_agregado('sincronizacoes_por_dia', df, ano=ano_est, mes=mes_est)
                 
                 if not sinc_por_dia_est.empty:
                     valores = sinc_por_dia_est['Quantidade']
                     
                     # Calcular medidas
-                    mediana = valores.median()
-                    q1 = valores.quantile(0.25)
-                    q3 = valores.quantile(0.75)
-                    p10 = valores.quantile(0.10)
-                    p90 = valores.quantile(0.90)
-                    p_selecionado = valores.quantile(percentil_param/100)
+                    medidas = esteira.calcular_medidas_separatrizes(valores, percentil_param)
+                    mediana, q1, q3 = medidas['mediana'], medidas['q1'], medidas['q3']
+                    p10, p90, p_selecionado = medidas['p10'], medidas['p90'], medidas['p_selecionado']
                     
                     # Gráfico principal - Curva de Distribuição com Percentis
                     fig_sep = go.Figure()
@@ -4251,6 +4594,16 @@ if st.session_state.df_original is not None:
                         st.metric("📊 Q3 (P75)", f"{q3:.0f}")
                     with col_sep5:
                         st.metric(f"🎯 P{percentil_param}", f"{p_selecionado:.0f}")
+
+                    # Série diária completa (WebGL + LTTB)
+                    st.markdown("#### 📅 Série Diária de Sincronizações")
+
+                    serie_dia_est = sinc_por_dia_est.sort_values('Data')
+                    serie_dia_est_janela = selecionar_janela_datas(serie_dia_est, key="janela_serie_est")
+
+                    fig_serie_est = obter_figura('fig_serie_est', criar_grafico_serie_diaria, serie_dia_est_janela,
+                                                 titulo='Sincronizações Diárias')
+                    st.plotly_chart(fig_serie_est, use_container_width=True)
             
             # ============================================
             # ANÁLISE DE PERCENTIL PARA TENDÊNCIA
@@ -4260,102 +4613,17 @@ if st.session_state.df_original is not None:
             st.markdown(f"_Evolução dos percentis ao longo do tempo - Percentil de Referência: {percentil_param}%_")
             
             if 'Criado' in df_sinc_est.columns:
-                # Criar colunas de período
-                df_sinc_est['Mes_Ano'] = df_sinc_est['Criado'].dt.strftime('%Y-%m')
-                df_sinc_est['Nome_Mes_Ano'] = df_sinc_est['Criado'].dt.strftime('%b/%Y')
-                
-                # Calcular percentis por mês
-                meses_unicos = sorted(df_sinc_est['Mes_Ano'].unique())
-                
-                dados_tendencia = []
-                for mes in meses_unicos:
-                    df_mes = df_sinc_est[df_sinc_est['Mes_Ano'] == mes]
-                    if not df_mes.empty:
-                        valores_mes = df_mes.groupby('Data').size()
-                        if not valores_mes.empty:
-                            dados_tendencia.append({
-                                'Mês': mes,
-                                'Mês_Label': df_mes['Nome_Mes_Ano'].iloc[0],
-                                'P25': valores_mes.quantile(0.25),
-                                'P50': valores_mes.quantile(0.50),
-                                f'P{percentil_param}': valores_mes.quantile(percentil_param/100),
-                                'P90': valores_mes.quantile(0.90),
-                                'Média': valores_mes.mean(),
-                                'Total': len(df_mes)
-                            })
+                # Percentis das sincronizações diárias, mês a mês
+                df_tendencia = obter_agregado('tendencia_percentis', df, ano=ano_est, mes=mes_est,
+                                              percentil=percentil_param)
                 
-                if dados_tendencia:
-                    df_tendencia = pd.DataFrame(dados_tendencia)
+                if not df_tendencia.empty:
                     
                     # Gráfico de tendência dos percentis
                     st.markdown("#### 📈 Evolução dos Percentis")
                     
-                    fig_tendencia = go.Figure()
-                    
-                    # Adicionar faixa entre P25 e P90
-                    fig_tendencia.add_trace(go.Scatter(
-                        x=df_tendencia['Mês_Label'],
-                        y=df_tendencia[f'P{percentil_param}'],
-                        mode='lines+markers',
-                        name=f'P{percentil_param}',
-                        line=dict(color=COR_VERMELHO, width=3),
-                        marker=dict(size=10, color=COR_VERMELHO)
-                    ))
-                    
-                    fig_tendencia.add_trace(go.Scatter(
-                        x=df_tendencia['Mês_Label'],
-                        y=df_tendencia['P50'],
-                        mode='lines+markers',
-                        name='P50 (Mediana)',
-                        line=dict(color=COR_AZUL_ESCURO, width=2),
-                        marker=dict(size=8, color=COR_AZUL_ESCURO)
-                    ))
-                    
-                    fig_tendencia.add_trace(go.Scatter(
-                        x=df_tendencia['Mês_Label'],
-                        y=df_tendencia['Média'],
-                        mode='lines+markers',
-                        name='Média',
-                        line=dict(color=COR_VERDE_ESCURO, width=2, dash='dash'),
-                        marker=dict(size=8, color=COR_VERDE_ESCURO)
-                    ))
-                    
-                    # Adicionar área entre P25 e P90
-                    fig_tendencia.add_trace(go.Scatter(
-                        x=df_tendencia['Mês_Label'],
-                        y=df_tendencia['P90'],
-                        mode='lines',
-                        name='P25-P90 (Faixa)',
-                        line=dict(width=0),
-                        showlegend=False
-                    ))
-                    
-                    fig_tendencia.add_trace(go.Scatter(
-                        x=df_tendencia['Mês_Label'],
-                        y=df_tendencia['P25'],
-                        mode='lines',
-                        fill='tonexty',
-                        fillcolor='rgba(2, 138, 159, 0.2)',
-                        line=dict(width=0),
-                        name='P25-P90 (Faixa)'
-                    ))
-                    
-                    fig_tendencia.update_layout(
-                        title=f'Evolução dos Percentis de Sincronizações Diárias',
-                        xaxis_title='Mês',
-                        yaxis_title='Sincronizações por Dia',
-                        height=450,
-                        plot_bgcolor=COR_BRANCO,
-                        hovermode='x unified',
-                        legend=dict(
-                            orientation="h",
-                            yanchor="bottom",
-                            y=1.02,
-                            xanchor="center",
-                            x=0.5
-                        )
-                    )
-                    
+                    fig_tendencia = obter_figura('fig_tendencia', criar_grafico_tendencia_percentis, df_tendencia,
+                                                 percentil_param=percentil_param)
                     st.plotly_chart(fig_tendencia, use_container_width=True)
                     
                     # Análise da tendência
@@ -4433,25 +4701,23 @@ if st.session_state.df_original is not None:
             with col_export1:
                 # Exportar dados de tendência
                 if 'df_tendencia' in locals() and not df_tendencia.empty:
-                    csv_tendencia = df_tendencia.to_csv(index=False).encode('utf-8-sig')
-                    st.download_button(
-                        label="📥 Exportar Tendência de Percentis",
-                        data=csv_tendencia,
-                        file_name=f"tendencia_percentis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
-                        use_container_width=True
+                    botao_download_sob_demanda(
+                        "📥 Exportar Tendência de Percentis",
+                        gerar_df=lambda: df_tendencia,
+                        chave=chave_filtros_sidebar() + (str(ano_est), str(mes_est), float(percentil_param)),
+                        nome_base="tendencia_percentis",
+                        key="btn_exportar_tendencia"
                     )
             
             with col_export2:
                 # Exportar dados de sincronização
                 if 'sinc_por_dia_est' in locals() and not sinc_por_dia_est.empty:
-                    csv_sinc = sinc_por_dia_est.to_csv(index=False).encode('utf-8-sig')
-                    st.download_button(
-                        label="📥 Exportar Sincronizações Diárias",
-                        data=csv_sinc,
-                        file_name=f"sincronizacoes_diarias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
-                        use_container_width=True
+                    botao_download_sob_demanda(
+                        "📥 Exportar Sincronizações Diárias",
+                        gerar_df=lambda: sinc_por_dia_est,
+                        chave=chave_filtros_sidebar() + (str(ano_est), str(mes_est)),
+                        nome_base="sincronizacoes_diarias",
+                        key="btn_exportar_sinc_diarias"
                     )
 
 else:
@@ -4494,3 +4760,24 @@ st.markdown(f"""
     </div>
 </div>
 """, unsafe_allow_html=True)
+
+# ============================================
+# DESEMPENHO E MEMÓRIA DA EXECUÇÃO (PAINÉIS, LIMITE E LOG)
+# ============================================
+# Registra o acesso desta sessão; acima do limite brando, as sessões ociosas soltam as bases
+registrar_acesso_sessao()
+
+with st.sidebar:
+    exibir_painel_desempenho(rastreador)
+    if st.query_params.get('admin') == '1':
+        exibir_painel_memoria()
+
+obter_registro_sessoes().liberar_ociosas(
+    SESSAO_OCIOSA_MINUTOS * 60, liberar_sessao_ociosa, limite_bytes=LIMITE_MEMORIA_MB * 1024 ** 2
+)
+
+obter_log_desempenho().gravar(rastreador.registro(
+    sessao=st.session_state.id_sessao,
+    versao_base=st.session_state.get('versao_base'),
+    registros=len(st.session_state.df_original) if st.session_state.get('df_original') is not None else 0
+))
@@ -0,0 +1,79 @@
+"""
+Núcleo de dados e análises da Esteira ADMS, independente do Streamlit.
+
+O APP.py é apenas a camada de visualização: carrega a base, aplica filtros e
+calcula indicadores por meio deste pacote, que também pode ser importado em
+scripts, benchmarks e pré-processamentos fora da interface.
+
+Os nomes abaixo são resolvidos sob demanda (PEP 562): `import esteira` e
+`esteira.constantes` não carregam o pandas; o submódulo só é importado no
+primeiro acesso a um nome dele.
+"""
+import importlib
+
+_EXPORTACOES = {
+    'dados': [
+        'ConjuntoDados', 'assinatura_origem', 'carregar_conjunto', 'carregar_dados',
+        'carregar_dados_em_cache', 'carregar_exports', 'calcular_hash_arquivo', 'calcular_hash_caminho',
+        'calcular_hash_origem', 'chave_arquivo', 'consolidar_exports', 'converter_datas',
+        'encontrar_arquivo_dados', 'formatar_nome_responsavel', 'listar_exports', 'processar_conteudo'
+    ],
+    'filtros': [
+        'FILTROS_SIDEBAR', 'PERIODOS_MANCHETE', 'aplicar_filtro', 'aplicar_filtros',
+        'calcular_kpis_periodo', 'opcoes_filtro', 'recortar_periodo_manchete'
+    ],
+    'analises': [
+        'analisar_tendencia_mensal_sre', 'calcular_evolucao_mensal', 'calcular_ipe',
+        'calcular_ipe_acumulado', 'calcular_ipe_por_sre', 'calcular_medidas_separatrizes',
+        'calcular_ranking_mapa', 'calcular_ranking_sre', 'calcular_revisoes_por_categoria',
+        'calcular_revisoes_por_responsavel', 'calcular_sazonalidade_mensal', 'calcular_sincronizados_por_sre',
+        'calcular_taxa_retorno_sre', 'calcular_tendencia_percentis', 'filtrar_ano_meses', 'is_retorno_sim',
+        'mascara_retorno_sim',
+        'pivot_sincronizacoes_dia', 'processar_dados_mapa', 'recortar_sincronizados',
+        'sincronizacoes_por_dia', 'substituir_nome_sre'
+    ],
+    'paginacao': ['COLUNAS_ULTIMAS_DEMANDAS', 'chave_ordenacao', 'paginar_demandas'],
+    'amostragem': [
+        'LIMITE_BARRAS_DIARIAS', 'LIMITE_PONTOS_GRAFICO', 'amostrar_serie_diaria', 'indices_lttb'
+    ],
+    'cache': ['CacheLRU', 'fingerprint_dados', 'medir_bytes'],
+    'exportacao': ['FORMATOS_EXPORTACAO', 'formatos_exportacao_disponiveis', 'serializar_exportacao'],
+    'relatorio_pdf': ['gerar_relatorio_pdf'],
+    'monitor': ['EstadoArquivo', 'MonitorArquivo'],
+    'desempenho': ['LogDesempenho', 'Rastreador', 'iniciar_rastreamento', 'medir', 'rastreador_atual'],
+    'memoria': ['RegistroSessoes', 'itens_memoria', 'medir_objeto', 'memoria_caches', 'rss_processo'],
+    'repositorio': ['RepositorioBase', 'VersaoBase'],
+    'particoes': [
+        'IndiceParticoes', 'filtrar_mascara', 'indice_particoes', 'mes_fechado', 'particionar',
+        'recortar_periodo'
+    ],
+    'materializados': [
+        'AGREGADOS_MENSAIS', 'AgregadosMensais', 'caminho_materializados_padrao', 'resumir_mes'
+    ],
+    'sla': ['COLUNAS_SLA', 'IndiceSLA'],
+    'motivos': [
+        'CATEGORIAS_REVISAO', 'CATEGORIA_OUTROS', 'REGRAS_CATEGORIA', 'SEM_MOTIVO', 'classificar_motivos',
+        'classificar_textos', 'normalizar_motivos', 'rotular_categorias', 'textos_memorizados'
+    ],
+    'textos': ['COLUNAS_TEXTO', 'IndiceInvertido', 'PALAVRAS_VAZIAS', 'indexar_textos', 'normalizar_textos',
+               'termos_consulta'],
+    'ciclo': [
+        'DIMENSOES_CICLO', 'PERCENTIS_CICLO', 'ROTULOS_CICLO', 'calcular_tempo_ciclo', 'formatar_duracao',
+        'minutos_ciclo', 'percentis_agrupados'
+    ],
+}
+
+_MODULO_DO_NOME = {nome: modulo for modulo, nomes in _EXPORTACOES.items() for nome in nomes}
+
+__all__ = sorted(_MODULO_DO_NOME)
+
+def __getattr__(nome):
+    modulo = _MODULO_DO_NOME.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module 'esteira' has no attribute '{nome}'")
+    valor = getattr(importlib.import_module(f'.{modulo}', __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
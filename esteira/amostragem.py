@@ -0,0 +1,57 @@
+"""Amostragem (LTTB) de séries temporais longas"""
+import numpy as np
+import pandas as pd
+
+# ============================================
+# AMOSTRAGEM DE SÉRIES TEMPORAIS LONGAS
+# ============================================
+LIMITE_PONTOS_GRAFICO = 1000      # ~1 ponto por pixel horizontal de um gráfico largo
+LIMITE_BARRAS_DIARIAS = 31        # até aqui a série diária continua em barras
+
+def indices_lttb(x, y, n_saida):
+    """
+    Largest-Triangle-Three-Buckets: escolhe `n_saida` índices que preservam a
+    forma visual da série (picos e vales). Retorna todos se já couber no limite.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+
+    tamanho_balde = (n - 2) / (n_saida - 2)
+    indices = np.empty(n_saida, dtype='int64')
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+
+    for i in range(n_saida - 2):
+        inicio = int(i * tamanho_balde) + 1
+        fim = int((i + 1) * tamanho_balde) + 1
+
+        prox_inicio = fim
+        prox_fim = min(int((i + 2) * tamanho_balde) + 1, n)
+        if prox_inicio >= prox_fim:
+            media_x, media_y = x[-1], y[-1]
+        else:
+            media_x = x[prox_inicio:prox_fim].mean()
+            media_y = y[prox_inicio:prox_fim].mean()
+
+        areas = np.abs(
+            (x[a] - media_x) * (y[inicio:fim] - y[a]) -
+            (x[a] - x[inicio:fim]) * (media_y - y[a])
+        )
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+def amostrar_serie_diaria(serie_dia, coluna_valor='Quantidade', limite=LIMITE_PONTOS_GRAFICO):
+    """Reduz uma série diária (colunas Data + valor) para no máximo `limite` pontos via LTTB"""
+    if len(serie_dia) <= limite:
+        return serie_dia
+
+    x = pd.to_datetime(serie_dia['Data']).to_numpy(dtype='datetime64[ns]').astype('int64')
+    indices = indices_lttb(x, serie_dia[coluna_valor].to_numpy(), limite)
+    return serie_dia.iloc[indices]
@@ -0,0 +1,447 @@
+"""Agregações e indicadores sobre a base de demandas (sem dependência do Streamlit)"""
+import pandas as pd
+
+from .constantes import MAPEAMENTO_EMPRESAS, NOMES_MESES, NOMES_MESES_COMPLETOS
+from .particoes import recortar_periodo
+from .motivos import rotular_categorias
+
+
+def _frame(dados):
+    """Aceita um ConjuntoDados ou um DataFrame e devolve o DataFrame"""
+    return getattr(dados, 'df', dados)
+
+# ============================================
+# INDICADORES POR SRE
+# ============================================
+def substituir_nome_sre(sre_nome):
+    """Nome curto de exibição para os SREs conhecidos"""
+    if pd.isna(sre_nome):
+        return "Não informado"
+    
+    sre_nome_str = str(sre_nome).lower()
+    
+    if "kewin" in sre_nome_str or "ferreira" in sre_nome_str:
+        return "Kewin Marcel"
+    elif "pierry" in sre_nome_str or "perez" in sre_nome_str:
+        return "Pierry Perez"
+    elif "bruna" in sre_nome_str or "maciel" in sre_nome_str:
+        return "Bruna Maciel"
+    elif "ramiza" in sre_nome_str or "irineu" in sre_nome_str:
+        return "Ramiza Irineu"
+    else:
+        return sre_nome
+
+def calcular_taxa_retorno_sre(df, sre_nome):
+    """Calcula taxa de retorno específica para um SRE"""
+    df = _frame(df)
+    df_sre = df[df['SRE'] == sre_nome].copy()
+    
+    if len(df_sre) == 0:
+        return 0, 0, 0
+    
+    total_cards = len(df_sre)
+    
+    if 'Revisões' in df_sre.columns:
+        cards_com_revisoes = len(df_sre[df_sre['Revisões'] > 0])
+        taxa_retorno = (cards_com_revisoes / total_cards * 100) if total_cards > 0 else 0
+    else:
+        taxa_retorno = 0
+        cards_com_revisoes = 0
+    
+    cards_sincronizados = len(df_sre[df_sre['Status'] == 'Sincronizado'])
+    
+    return taxa_retorno, cards_com_revisoes, cards_sincronizados
+
+def analisar_tendencia_mensal_sre(df, sre_nome):
+    """Analisa tendência mensal de sincronizações de um SRE"""
+    df = _frame(df)
+    df_sre = df[df['SRE'] == sre_nome].copy()
+    
+    if len(df_sre) == 0 or 'Criado' not in df_sre.columns:
+        return None
+    
+    df_sre['Mes_Ano'] = df_sre['Criado'].dt.strftime('%Y-%m')
+    
+    sinc_mes = df_sre[df_sre['Status'] == 'Sincronizado'].groupby('Mes_Ano').size().reset_index()
+    sinc_mes.columns = ['Mes_Ano', 'Sincronizados']
+    
+    total_mes = df_sre.groupby('Mes_Ano').size().reset_index()
+    total_mes.columns = ['Mes_Ano', 'Total']
+    
+    dados_mes = pd.merge(total_mes, sinc_mes, on='Mes_Ano', how='left').fillna(0)
+    
+    dados_mes = dados_mes.sort_values('Mes_Ano')
+    
+    return dados_mes
+
+def calcular_ranking_sre(df_periodo, limite=10):
+    """Ranking de SREs do período: sincronizados, cards com revisão e taxa de retorno"""
+    df_periodo = _frame(df_periodo)
+    if df_periodo.empty or 'SRE' not in df_periodo.columns:
+        return pd.DataFrame(columns=['SRE', 'Sincronizados', 'Com Revisão', 'Taxa Retorno (%)'])
+
+    df_sre = df_periodo[df_periodo['Status'] == 'Sincronizado'].dropna(subset=['SRE'])
+    ranking = df_sre.groupby('SRE').agg(
+        Sincronizados=('Chamado', 'size'),
+        Com_Revisao=('Revisões', lambda r: int((r > 0).sum()))
+    ).reset_index()
+    ranking.columns = ['SRE', 'Sincronizados', 'Com Revisão']
+    ranking['Taxa Retorno (%)'] = (ranking['Com Revisão'] / ranking['Sincronizados'] * 100).round(1)
+
+    return ranking.sort_values(['Sincronizados', 'SRE'], ascending=[False, True]).head(limite).reset_index(drop=True)
+
+def calcular_ranking_mapa(df_periodo, limite=15):
+    """Ranking de empresas por sincronismos no período, no mesmo formato do mapa"""
+    df_mapa, total_sinc = processar_dados_mapa(_frame(df_periodo))
+    if df_mapa.empty:
+        return df_mapa, total_sinc
+
+    ranking = df_mapa[df_mapa['sincronismos'] > 0].sort_values('sincronismos', ascending=False)
+    return ranking.head(limite).reset_index(drop=True), total_sinc
+
+# ============================================
+# FUNÇÕES DO MAPA - PROCESSAMENTO DE DADOS
+# ============================================
+def processar_dados_mapa(df, empresas_selecionadas=None, ano_filtro=None, mes_filtro=None):
+    """Processa os dados para gerar as métricas do mapa"""
+    
+    df = _frame(df)
+    
+    # Aplicar filtros de data (só as partições do período são lidas)
+    df = recortar_periodo(
+        df,
+        ano=int(ano_filtro) if ano_filtro and ano_filtro != 'Todos' else None,
+        meses=[int(mes_filtro)] if mes_filtro and mes_filtro != 'Todos' else None
+    )
+    
+    # Filtrar apenas sincronizados
+    df_sinc = df[df['Status'] == 'Sincronizado'].copy()
+    
+    # Filtrar empresas selecionadas
+    if empresas_selecionadas and 'Todas' not in empresas_selecionadas:
+        df_sinc = df_sinc[df_sinc['Empresa'].isin(empresas_selecionadas)]
+    
+    # Contar sincronismos por empresa
+    sinc_por_empresa = df_sinc['Empresa'].value_counts().reset_index()
+    sinc_por_empresa.columns = ['Empresa', 'Sincronismos']
+    
+    # Preparar dados para o mapa
+    dados_mapa = []
+    total_sinc = 0
+    
+    for empresa, info in MAPEAMENTO_EMPRESAS.items():
+        mask = sinc_por_empresa['Empresa'] == empresa
+        qtd = int(sinc_por_empresa[mask]['Sincronismos'].values[0]) if mask.any() else 0
+        
+        if empresas_selecionadas and 'Todas' not in empresas_selecionadas:
+            if empresa not in empresas_selecionadas:
+                continue
+        
+        dados_mapa.append({
+            'sigla': info['sigla'],
+            'estado': info['estado'],
+            'regiao': info['regiao'],
+            'empresa': empresa,
+            'empresa_nome': info['nome_completo'],
+            'sincronismos': qtd,
+            'latitude': info['latitude'],
+            'longitude': info['longitude']
+        })
+        total_sinc += qtd
+    
+    return pd.DataFrame(dados_mapa), total_sinc
+
+# ============================================
+# KPI IPE - ÍNDICE DE PERFORMANCE DO ESPECIALISTA
+# ============================================
+VALORES_RETORNO_SIM = ['SIM', 'S', 'YES', 'Y', '1', 'TRUE']
+
+def is_retorno_sim(valor):
+    """Verifica se o valor indica retorno do cliente (Sim)"""
+    if pd.isna(valor):
+        return False
+    valor_str = str(valor).strip().upper()
+    return valor_str in VALORES_RETORNO_SIM
+
+def mascara_retorno_sim(serie):
+    """Versão vetorizada de is_retorno_sim para uma coluna inteira"""
+    return serie.notna() & serie.astype(str).str.strip().str.upper().isin(VALORES_RETORNO_SIM)
+
+def calcular_ipe(ca, cr, cd, ct, na):
+    """IPE = (CA - CR) / (CD + |((CT/CD)/NA) - 1|), limitado a 1.0"""
+    if cd <= 0 or na <= 0:
+        return 0
+    numerador = ca - cr
+    termo1 = ct / cd
+    termo2 = termo1 / na
+    modulo = abs(termo2 - 1)
+    denominador = cd + modulo
+    if denominador <= 0:
+        return 0
+    ipe = numerador / denominador
+    return min(ipe, 1.0)
+
+def filtrar_ano_meses(df, ano='Todos', meses=None):
+    """Recorte por ano ('Todos' = sem filtro) e lista de meses (vazia = todos)"""
+    return recortar_periodo(
+        _frame(df), ano=None if ano == 'Todos' else int(ano), meses=meses or None
+    ).copy()
+
+def calcular_ipe_por_sre(df):
+    """IPE de cada SRE no recorte, ordenado do maior para o menor"""
+    df = _frame(df)
+    cards_total_periodo = len(df)
+    total_sres_periodo = df['SRE'].nunique()
+    retorno_sim = mascara_retorno_sim(df['Retorno_Cliente'])
+    
+    sres_metrics = []
+    for sre in df['SRE'].dropna().unique():
+        mascara_sre = df['SRE'] == sre
+        df_sre_data = df[mascara_sre]
+        if len(df_sre_data) > 0:
+            cd = len(df_sre_data)
+            ca = int((df_sre_data['Status'] == 'Sincronizado').sum())
+            cr = int(retorno_sim[mascara_sre].sum())
+            
+            ipe = calcular_ipe(ca, cr, cd, cards_total_periodo, total_sres_periodo)
+            sres_metrics.append({
+                'SRE': substituir_nome_sre(sre),
+                'Cards Demandados': cd,
+                'Cards Analisados': ca,
+                'Cards Reabertos': cr,
+                'IPE (%)': round(ipe * 100, 2),
+                'Status': '✅ Meta' if ipe >= 0.95 else '⚠️ Abaixo'
+            })
+    
+    if not sres_metrics:
+        return pd.DataFrame()
+    
+    return pd.DataFrame(sres_metrics).sort_values('IPE (%)', ascending=False)
+
+def calcular_ipe_acumulado(df):
+    """IPE acumulado mês a mês (cada mês considera todos os cards até ele)"""
+    df = _frame(df)
+    if 'Criado' not in df.columns or len(df) == 0:
+        return pd.DataFrame()
+    
+    periodo = df['Criado'].dt.strftime('%Y-%m')
+    retorno_sim = mascara_retorno_sim(df['Retorno_Cliente'])
+    meses_ordenados = sorted(periodo.unique())
+    
+    acumulados = []
+    for mes in meses_ordenados:
+        ate = periodo <= mes
+        df_ate = df[ate]
+        
+        cd_acum = len(df_ate)
+        ca_acum = int((df_ate['Status'] == 'Sincronizado').sum())
+        cr_acum = int(retorno_sim[ate].sum())
+        na_acum = df_ate['SRE'].nunique()
+        
+        ipe_acum = calcular_ipe(ca_acum, cr_acum, cd_acum, cd_acum, na_acum)
+        
+        ultimo_criado = df_ate['Criado'].max()
+        ultimo_mes_completo = NOMES_MESES_COMPLETOS[ultimo_criado.month] if pd.notna(ultimo_criado) else mes
+        
+        acumulados.append({
+            'Mês': ultimo_mes_completo,
+            'CD_Acum': cd_acum,
+            'CA_Acum': ca_acum,
+            'CR_Acum': cr_acum,
+            'NA_Acum': na_acum,
+            'IPE Acumulado (%)': round(ipe_acum * 100, 2)
+        })
+    
+    return pd.DataFrame(acumulados)
+
+# ============================================
+# ANÁLISE ESTATÍSTICA - PERCENTIS
+# ============================================
+def sincronizacoes_por_dia(df_sinc):
+    """Quantidade de sincronizações por data de criação"""
+    df_sinc = _frame(df_sinc)
+    sinc_por_dia = df_sinc.groupby(df_sinc['Criado'].dt.date).size().reset_index()
+    sinc_por_dia.columns = ['Data', 'Quantidade']
+    return sinc_por_dia
+
+def calcular_medidas_separatrizes(valores, percentil_param):
+    """P10, quartis, mediana, P90 e o percentil de referência de uma série"""
+    return {
+        'mediana': valores.median(),
+        'q1': valores.quantile(0.25),
+        'q3': valores.quantile(0.75),
+        'p10': valores.quantile(0.10),
+        'p90': valores.quantile(0.90),
+        'p_selecionado': valores.quantile(percentil_param / 100)
+    }
+
+def calcular_tendencia_percentis(df_sinc, percentil_param):
+    """Percentis das sincronizações diárias, mês a mês"""
+    df_sinc = _frame(df_sinc)
+    if 'Criado' not in df_sinc.columns or df_sinc.empty:
+        return pd.DataFrame()
+    
+    df_sinc = df_sinc.assign(
+        Data=df_sinc['Criado'].dt.date,
+        Mes_Ano=df_sinc['Criado'].dt.strftime('%Y-%m'),
+        Nome_Mes_Ano=df_sinc['Criado'].dt.strftime('%b/%Y')
+    )
+    
+    dados_tendencia = []
+    for mes, df_mes in df_sinc.groupby('Mes_Ano', sort=True):
+        valores_mes = df_mes.groupby('Data').size()
+        if not valores_mes.empty:
+            dados_tendencia.append({
+                'Mês': mes,
+                'Mês_Label': df_mes['Nome_Mes_Ano'].iloc[0],
+                'P25': valores_mes.quantile(0.25),
+                'P50': valores_mes.quantile(0.50),
+                f'P{percentil_param}': valores_mes.quantile(percentil_param/100),
+                'P90': valores_mes.quantile(0.90),
+                'Média': valores_mes.mean(),
+                'Total': len(df_mes)
+            })
+    
+    return pd.DataFrame(dados_tendencia)
+
+# ============================================
+# AGREGAÇÕES DAS ABAS DO PAINEL PRINCIPAL
+# ============================================
+def calcular_evolucao_mensal(df, ano):
+    """Demandas por mês do ano (Jan a Dez, meses sem demanda com zero)"""
+    df = _frame(df)
+    df_ano = recortar_periodo(df, ano=ano)
+    if df_ano.empty:
+        return pd.DataFrame()
+    
+    todos_meses = pd.DataFrame({
+        'Mês_Num': range(1, 13),
+        'Nome_Mês': list(NOMES_MESES.values())
+    })
+    
+    demandas_por_mes = df_ano.groupby('Mês_Num').size().reset_index()
+    demandas_por_mes.columns = ['Mês_Num', 'Quantidade']
+    
+    demandas_completas = pd.merge(todos_meses, demandas_por_mes, on='Mês_Num', how='left')
+    demandas_completas['Quantidade'] = demandas_completas['Quantidade'].fillna(0).astype(int)
+    return demandas_completas
+
+def calcular_revisoes_por_responsavel(df, ano='Todos os Anos', mes='Todos os Meses'):
+    """Total de revisões e chamados revisados por responsável, do maior para o menor"""
+    df_rev = _frame(df)
+    if 'Revisões' not in df_rev.columns or 'Responsável_Formatado' not in df_rev.columns:
+        return pd.DataFrame()
+    
+    df_rev = recortar_periodo(
+        df_rev,
+        ano=None if ano == 'Todos os Anos' else int(ano),
+        meses=None if mes == 'Todos os Meses' else [int(mes)]
+    )
+    
+    df_com_revisoes = df_rev[df_rev['Revisões'] > 0]
+    if df_com_revisoes.empty:
+        return pd.DataFrame()
+    
+    revisoes_por_responsavel = df_com_revisoes.groupby('Responsável_Formatado').agg({
+        'Revisões': 'sum',
+        'Chamado': 'count'
+    }).reset_index()
+    
+    revisoes_por_responsavel.columns = ['Responsável', 'Total_Revisões', 'Chamados_Com_Revisão']
+    return revisoes_por_responsavel.sort_values('Total_Revisões', ascending=False)
+
+def calcular_revisoes_por_categoria(df, ano='Todos os Anos', mes='Todos os Meses'):
+    """Total de revisões e chamados revisados por categoria do motivo, do maior para o menor"""
+    df_rev = _frame(df)
+    if 'Revisões' not in df_rev.columns or 'Categoria_Revisao' not in df_rev.columns:
+        return pd.DataFrame()
+    
+    df_rev = recortar_periodo(
+        df_rev,
+        ano=None if ano == 'Todos os Anos' else int(ano),
+        meses=None if mes == 'Todos os Meses' else [int(mes)]
+    )
+    
+    df_com_revisoes = df_rev[df_rev['Revisões'] > 0]
+    if df_com_revisoes.empty:
+        return pd.DataFrame()
+    
+    revisoes_por_categoria = df_com_revisoes.groupby(
+        rotular_categorias(df_com_revisoes['Categoria_Revisao']), observed=True
+    ).agg({
+        'Revisões': 'sum',
+        'Chamado': 'count'
+    }).reset_index()
+    
+    revisoes_por_categoria.columns = ['Categoria', 'Total_Revisões', 'Chamados_Com_Revisão']
+    revisoes_por_categoria['Categoria'] = revisoes_por_categoria['Categoria'].astype(str)
+    return revisoes_por_categoria.sort_values('Total_Revisões', ascending=False, kind='stable').reset_index(drop=True)
+
+def recortar_sincronizados(df, ano='Todos os Anos', mes='Todos os Meses',
+                           sre='Todos os SREs', empresa='Todas Empresas'):
+    """Chamados sincronizados no recorte de ano, mês, SRE e empresa"""
+    df = recortar_periodo(
+        _frame(df),
+        ano=None if ano == 'Todos os Anos' else int(ano),
+        meses=None if mes == 'Todos os Meses' else [int(mes)]
+    )
+    mascara = df['Status'] == 'Sincronizado'
+    if sre != 'Todos os SREs':
+        mascara &= df['SRE'] == sre
+    if empresa != 'Todas Empresas':
+        mascara &= df['Empresa'] == empresa
+    return df[mascara]
+
+def pivot_sincronizacoes_dia(df_sinc, coluna):
+    """Sincronizações por data (linhas) e valor da coluna (colunas)"""
+    df_sinc = _frame(df_sinc)
+    por_dia = df_sinc.groupby([df_sinc['Criado'].dt.date.rename('Data'), coluna]).size().reset_index()
+    por_dia.columns = ['Data', coluna, 'Quantidade']
+    
+    return por_dia.pivot_table(
+        index='Data',
+        columns=coluna,
+        values='Quantidade',
+        aggfunc='sum',
+        fill_value=0
+    ).reset_index()
+
+def calcular_sincronizados_por_sre(df, ano='Todos', mes='Todos'):
+    """Sincronizados por SRE (nomes substituídos), do maior para o menor"""
+    df = recortar_periodo(
+        _frame(df),
+        ano=None if ano == 'Todos' else int(ano),
+        meses=None if mes == 'Todos' else [int(mes)]
+    )
+    df_sinc = df[df['Status'] == 'Sincronizado']
+    
+    sinc_por_sre = df_sinc.groupby('SRE').size().reset_index()
+    sinc_por_sre.columns = ['SRE', 'Sincronizados']
+    sinc_por_sre['SRE_Nome'] = sinc_por_sre['SRE'].apply(substituir_nome_sre)
+    
+    sinc_por_sre_nome = sinc_por_sre.groupby('SRE_Nome')['Sincronizados'].sum().reset_index()
+    return sinc_por_sre_nome.sort_values('Sincronizados', ascending=False)
+
+def calcular_sazonalidade_mensal(df, ano='Todos os Anos'):
+    """Demandas, sincronizados e taxa de sincronização por mês do ano"""
+    df = recortar_periodo(_frame(df), ano=None if ano == 'Todos os Anos' else int(ano))
+    if df.empty:
+        return pd.DataFrame()
+    
+    meses_ordem = list(NOMES_MESES.values())
+    if 'Nome_Mês' in df.columns:
+        mes_abrev = df['Nome_Mês']
+    else:
+        mes_abrev = df['Criado'].dt.month.map(NOMES_MESES)
+    
+    demanda_mes = df.groupby(mes_abrev).size().reindex(meses_ordem).fillna(0).astype(int)
+    sinc_mes = (df[df['Status'] == 'Sincronizado'].groupby(mes_abrev).size()
+                .reindex(meses_ordem).fillna(0).astype(int))
+    
+    dados_mes = pd.DataFrame({
+        'Mês': meses_ordem,
+        'Total': demanda_mes.values,
+        'Sincronizados': sinc_mes.values
+    })
+    dados_mes['Taxa_Sinc'] = (dados_mes['Sincronizados'] / dados_mes['Total'] * 100).where(dados_mes['Total'] > 0, 0).round(1)
+    return dados_mes
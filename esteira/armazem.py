@@ -0,0 +1,295 @@
+"""
+Armazenamento opcional da base em SQLite (biblioteca padrão).
+
+Cada carga faz upsert das demandas numa tabela indexada, que acumula o
+histórico entre exports; filtros da barra lateral e agregações das abas viram
+consultas SQL com GROUP BY, e vários processos do painel podem compartilhar o
+mesmo arquivo. O armazém fica ativo quando o arquivo existe:
+
+    python -m esteira.armazem --entrada data/esteira_demandas.csv
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import warnings
+from contextlib import closing
+
+import pandas as pd
+
+from .constantes import CAMINHO_ARMAZEM_SQLITE, NOMES_MESES
+from .dados import carregar_exports, listar_exports, preparar_colunas
+from .filtros import FILTROS_SIDEBAR
+from .analises import substituir_nome_sre
+from .particoes import mes_fechado
+
+# Colunas do export (já renomeadas) guardadas na tabela; as derivadas são
+# refeitas por preparar_colunas na leitura
+COLUNAS_FONTE = [
+    'Chamado', 'Vencimento', 'Tipo_Chamado', 'ChangeSet', 'Empresa', 'Responsável',
+    'Sincronização', 'Status', 'SRE', 'Prioridade', 'Modificado', 'Revisões', 'Criado',
+    'Modificado_por', 'Motivo_Revisao', 'Retorno_Cliente'
+]
+# Derivadas guardadas só para WHERE/GROUP BY
+COLUNAS_CONSULTA = ['Responsável_Formatado', 'Ano', 'Mês']
+COLUNAS_DATA = ['Vencimento', 'Criado', 'Modificado']
+COLUNAS_INTEIRAS = ['Revisões', 'Ano', 'Mês']
+
+# Um Chamado pode ter vários cartões (Criado diferente) e até cartões repetidos
+# no mesmo export: a chave inclui a ocorrência do cartão dentro da carga
+CHAVE = ['chave_chamado', 'chave_criado', 'ocorrencia']
+
+def _q(coluna):
+    return f'"{coluna}"'
+
+def _esquema():
+    colunas = [f"{c} {'INTEGER' if c == 'ocorrencia' else 'TEXT'} NOT NULL" for c in CHAVE]
+    colunas += [f"{_q(c)} {'INTEGER' if c in COLUNAS_INTEIRAS else 'TEXT'}"
+                for c in COLUNAS_FONTE + COLUNAS_CONSULTA]
+    return [
+        f"CREATE TABLE IF NOT EXISTS demandas ({', '.join(colunas)}, PRIMARY KEY ({', '.join(CHAVE)}))",
+        'CREATE INDEX IF NOT EXISTS idx_demandas_criado ON demandas ("Criado")',
+        'CREATE INDEX IF NOT EXISTS idx_demandas_sre ON demandas ("SRE")',
+        'CREATE INDEX IF NOT EXISTS idx_demandas_empresa ON demandas ("Empresa")',
+        'CREATE INDEX IF NOT EXISTS idx_demandas_status ON demandas ("Status")',
+        'CREATE INDEX IF NOT EXISTS idx_demandas_ano_mes ON demandas ("Ano", "Mês")',
+        # Partições (Ano, Mês) da tabela; meses fechados são marcados como imutáveis
+        'CREATE TABLE IF NOT EXISTS particoes ("Ano" INTEGER NOT NULL, "Mês" INTEGER NOT NULL, '
+        'linhas INTEGER NOT NULL, fechada INTEGER NOT NULL, PRIMARY KEY ("Ano", "Mês"))',
+    ]
+
+def _registros(df):
+    """Linhas da tabela (tuplas de valores Python, None no lugar de NaN/NaT) a partir da base processada"""
+    tabela = pd.DataFrame(index=df.index)
+    tabela['chave_chamado'] = df['Chamado'].astype(str).str.strip()
+    tabela['chave_criado'] = df['Criado'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+    tabela['ocorrencia'] = tabela.groupby(['chave_chamado', 'chave_criado']).cumcount()
+
+    for coluna in COLUNAS_FONTE + COLUNAS_CONSULTA:
+        if coluna not in df.columns:
+            tabela[coluna] = None
+        elif coluna in COLUNAS_DATA:
+            tabela[coluna] = pd.to_datetime(df[coluna], errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S')
+        elif coluna in COLUNAS_INTEIRAS:
+            tabela[coluna] = df[coluna].astype('Int64')
+        else:
+            tabela[coluna] = df[coluna]
+
+    valores = tabela.astype(object).where(tabela.notna(), None)
+    return [tuple(int(v) if hasattr(v, 'item') else v for v in linha)
+            for linha in valores.itertuples(index=False, name=None)]
+
+# ============================================
+# ARMAZÉM SQLITE
+# ============================================
+class ArmazemSQLite:
+    """Base de demandas num arquivo SQLite; cada operação abre a própria conexão (seguro entre threads)"""
+
+    def __init__(self, caminho=CAMINHO_ARMAZEM_SQLITE):
+        self.caminho = caminho
+
+    @property
+    def ativo(self):
+        return os.path.exists(self.caminho)
+
+    def _conectar(self):
+        return sqlite3.connect(self.caminho, timeout=30)
+
+    def criar(self):
+        """Cria tabela e índices (idempotente); WAL deixa outros processos lerem durante o upsert"""
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute('PRAGMA journal_mode=WAL')
+            for comando in _esquema():
+                conexao.execute(comando)
+
+    def gravar(self, df):
+        """
+        Upsert da base processada: cartões novos entram, os existentes são
+        atualizados se o Modificado da carga não for mais antigo. Devolve o número de linhas.
+        """
+        self.criar()
+        colunas = CHAVE + COLUNAS_FONTE + COLUNAS_CONSULTA
+        atualizacoes = ', '.join(f'{_q(c)} = excluded.{_q(c)}' for c in COLUNAS_FONTE + COLUNAS_CONSULTA)
+        comando = (
+            f"INSERT INTO demandas ({', '.join(_q(c) for c in colunas)}) "
+            f"VALUES ({', '.join('?' for _ in colunas)}) "
+            f"ON CONFLICT ({', '.join(CHAVE)}) DO UPDATE SET {atualizacoes} "
+            'WHERE demandas."Modificado" IS NULL OR excluded."Modificado" >= demandas."Modificado"'
+        )
+        registros = _registros(df)
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.executemany(comando, registros)
+            contagens = conexao.execute(
+                'SELECT "Ano", "Mês", COUNT(*) FROM demandas WHERE "Ano" IS NOT NULL GROUP BY "Ano", "Mês"'
+            ).fetchall()
+            conexao.execute('DELETE FROM particoes')
+            conexao.executemany(
+                'INSERT INTO particoes VALUES (?, ?, ?, ?)',
+                [(ano, mes, linhas, int(mes_fechado(ano, mes))) for ano, mes, linhas in contagens]
+            )
+        return len(registros)
+
+    def _consultar(self, sql, parametros=()):
+        with closing(self._conectar()) as conexao:
+            return pd.read_sql_query(sql, conexao, params=list(parametros))
+
+    def carregar(self, **filtros):
+        """Base (como a de carregar_dados) com os filtros da barra lateral aplicados no SQL"""
+        where, parametros = condicoes_filtros(filtros)
+        colunas = ', '.join(_q(c) for c in COLUNAS_FONTE)
+        df = self._consultar(f'SELECT {colunas} FROM demandas{where} ORDER BY rowid', parametros)
+        # Texto como o CSV lê: str com NaN nos vazios (no pandas 2, astype('str')
+        # sozinho transformaria NULL no texto 'None')
+        for coluna in COLUNAS_FONTE:
+            if coluna not in COLUNAS_DATA and coluna not in COLUNAS_INTEIRAS:
+                df[coluna] = df[coluna].astype('str').where(df[coluna].notna())
+        return preparar_colunas(df)
+
+    def particoes(self):
+        """Partições (Ano, Mês) gravadas, com o número de linhas e se o mês já fechou (imutável)"""
+        return self._consultar('SELECT "Ano", "Mês", linhas, fechada FROM particoes ORDER BY "Ano", "Mês"')
+
+    def contar(self, **filtros):
+        where, parametros = condicoes_filtros(filtros)
+        return int(self._consultar(f'SELECT COUNT(*) AS n FROM demandas{where}', parametros)['n'].iloc[0])
+
+    # ============================================
+    # AGREGAÇÕES EM SQL (MESMO RESULTADO DE esteira.analises)
+    # ============================================
+    def agregar(self, nome, filtros, **parametros):
+        """Agregado de AGREGADOS_SQL sobre a base filtrada pela barra lateral"""
+        return getattr(self, AGREGADOS_SQL[nome])(filtros, **parametros)
+
+    def evolucao_mensal(self, filtros, ano):
+        where, parametros = condicoes_filtros(filtros, [('"Ano" = ?', int(ano))])
+        por_mes = self._consultar(
+            f'SELECT "Mês" AS "Mês_Num", COUNT(*) AS "Quantidade" FROM demandas{where} GROUP BY "Mês"',
+            parametros
+        )
+        if por_mes.empty:
+            return pd.DataFrame()
+
+        todos_meses = pd.DataFrame({'Mês_Num': range(1, 13), 'Nome_Mês': list(NOMES_MESES.values())})
+        demandas_completas = pd.merge(todos_meses, por_mes, on='Mês_Num', how='left')
+        demandas_completas['Quantidade'] = demandas_completas['Quantidade'].fillna(0).astype(int)
+        return demandas_completas
+
+    def revisoes_por_responsavel(self, filtros, ano='Todos os Anos', mes='Todos os Meses'):
+        extras = [('"Revisões" > 0', None), ('"Responsável_Formatado" IS NOT NULL', None)]
+        if ano != 'Todos os Anos':
+            extras.append(('"Ano" = ?', int(ano)))
+        if mes != 'Todos os Meses':
+            extras.append(('"Mês" = ?', int(mes)))
+        where, parametros = condicoes_filtros(filtros, extras)
+        revisoes = self._consultar(
+            'SELECT "Responsável_Formatado" AS "Responsável", SUM("Revisões") AS "Total_Revisões", '
+            f'COUNT("Chamado") AS "Chamados_Com_Revisão" FROM demandas{where} '
+            'GROUP BY "Responsável_Formatado" ORDER BY "Responsável_Formatado"',
+            parametros
+        )
+        if revisoes.empty:
+            return pd.DataFrame()
+        return revisoes.sort_values('Total_Revisões', ascending=False)
+
+    def sincronizados_por_sre(self, filtros, ano='Todos', mes='Todos'):
+        extras = [('"Status" = ?', 'Sincronizado'), ('"SRE" IS NOT NULL', None)]
+        if ano != 'Todos':
+            extras.append(('"Ano" = ?', int(ano)))
+        if mes != 'Todos':
+            extras.append(('"Mês" = ?', int(mes)))
+        where, parametros = condicoes_filtros(filtros, extras)
+        sinc_por_sre = self._consultar(
+            f'SELECT "SRE", COUNT(*) AS "Sincronizados" FROM demandas{where} GROUP BY "SRE" ORDER BY "SRE"',
+            parametros
+        )
+        sinc_por_sre['SRE_Nome'] = sinc_por_sre['SRE'].apply(substituir_nome_sre)
+        sinc_por_sre_nome = sinc_por_sre.groupby('SRE_Nome')['Sincronizados'].sum().reset_index()
+        return sinc_por_sre_nome.sort_values('Sincronizados', ascending=False)
+
+    def sazonalidade_mensal(self, filtros, ano='Todos os Anos'):
+        extras = [('"Ano" = ?', int(ano))] if ano != 'Todos os Anos' else []
+        where, parametros = condicoes_filtros(filtros, extras)
+        por_mes = self._consultar(
+            'SELECT "Mês", COUNT(*) AS "Total", SUM("Status" = \'Sincronizado\') AS "Sincronizados" '
+            f'FROM demandas{where} GROUP BY "Mês"',
+            parametros
+        )
+        if por_mes.empty:
+            return pd.DataFrame()
+
+        por_mes = por_mes.dropna(subset=['Mês']).set_index('Mês').reindex(range(1, 13), fill_value=0)
+        dados_mes = pd.DataFrame({
+            'Mês': list(NOMES_MESES.values()),
+            'Total': por_mes['Total'].astype(int).values,
+            'Sincronizados': por_mes['Sincronizados'].astype(int).values
+        })
+        dados_mes['Taxa_Sinc'] = (dados_mes['Sincronizados'] / dados_mes['Total'] * 100).where(dados_mes['Total'] > 0, 0).round(1)
+        return dados_mes
+
+# Nome do agregado (como em esteira.snapshot.AGREGADOS) -> método com a versão em SQL
+AGREGADOS_SQL = {
+    'evolucao_mensal': 'evolucao_mensal',
+    'revisoes_por_responsavel': 'revisoes_por_responsavel',
+    'sincronizados_por_sre': 'sincronizados_por_sre',
+    'sazonalidade_mensal': 'sazonalidade_mensal',
+}
+
+def condicoes_filtros(filtros, extras=()):
+    """
+    Cláusula WHERE equivalente a esteira.filtros.aplicar_filtros, mais condições
+    extras (sql, valor ou None). Retorna (' WHERE ...' ou '', parâmetros).
+    """
+    condicoes, parametros = [], []
+    for nome, valor in (filtros or {}).items():
+        coluna, valor_todos = FILTROS_SIDEBAR[nome]
+        if valor is None or valor == valor_todos or valor == '':
+            continue
+        if nome == 'busca_chamado':
+            condicoes.append('instr("Chamado", ?) > 0')
+        else:
+            condicoes.append(f'{_q(coluna)} = ?')
+            valor = int(valor) if nome in ('ano', 'mes') else valor
+        parametros.append(valor)
+
+    for condicao, valor in extras:
+        condicoes.append(condicao)
+        if valor is not None:
+            parametros.append(valor)
+
+    where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ''
+    return where, parametros
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.armazem',
+        description='Grava (upsert) exports do ADMS no armazém SQLite do painel.'
+    )
+    parser.add_argument('--entrada', default='data/esteira_demandas.csv',
+                        help='CSV exportado do ADMS, diretório ou padrão glob de exports (padrão: %(default)s)')
+    parser.add_argument('--banco', default=CAMINHO_ARMAZEM_SQLITE,
+                        help='arquivo SQLite (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    if not listar_exports(args.entrada):
+        print(f"Arquivo não encontrado: {args.entrada}", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    df, status, _ = carregar_exports(args.entrada)
+    if df is None:
+        print(f"Erro ao processar {args.entrada}: {status}", file=sys.stderr)
+        return 1
+
+    armazem = ArmazemSQLite(args.banco)
+    gravados = armazem.gravar(df)
+    print(f"{gravados:,} registros gravados em {args.banco} "
+          f"({armazem.contar():,} no total) em {time.perf_counter() - inicio:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
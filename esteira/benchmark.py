@@ -0,0 +1,217 @@
+"""
+Benchmarks dos caminhos quentes do painel sobre exports sintéticos
+(esteira.sintetico) de 10 mil a 5 milhões de linhas: tempo, vazão e pico de
+memória da carga, dos filtros da barra lateral, do mapa, do IPE, das
+agregações das abas, da tendência de percentis e da montagem de figuras.
+
+    python -m esteira.benchmark --tamanhos 10k,100k,1m --repeticoes 3
+    python -m esteira.benchmark --tamanhos 5m --saida resultados.json
+"""
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .dados import carregar_dados
+from .filtros import aplicar_filtros
+from .analises import (
+    calcular_evolucao_mensal, calcular_ipe_acumulado, calcular_ipe_por_sre,
+    calcular_revisoes_por_responsavel, calcular_sazonalidade_mensal, calcular_tendencia_percentis,
+    processar_dados_mapa, recortar_sincronizados, sincronizacoes_por_dia
+)
+from .amostragem import amostrar_serie_diaria
+from .particoes import particionar
+from .memoria import rss_processo
+from .sintetico import datas_invalidas, export_sintetico, interpretar_tamanho
+
+# ============================================
+# CARGAS DE TRABALHO
+# ============================================
+def filtros_tipicos(df):
+    """Cadeia de filtros de uso comum: ano/mês mais recentes, sincronizados, empresa e SRE mais frequentes"""
+    ano = int(df['Ano'].max())
+    mes = str(int(df.loc[df['Ano'] == ano, 'Mês'].max()))
+    return {
+        'ano': ano, 'mes': mes, 'status': 'Sincronizado',
+        'empresa': df['Empresa'].mode().iloc[0], 'sre': df['SRE'].mode().iloc[0]
+    }
+
+def figura_sincronizacoes_dia(df):
+    """Figura das sincronizações por dia como o painel a guarda no cache: série amostrada, JSON sem validação"""
+    import plotly.graph_objects as go
+    serie = amostrar_serie_diaria(sincronizacoes_por_dia(recortar_sincronizados(df)))
+    figura = go.Figure(go.Bar(x=serie['Data'], y=serie['Quantidade']))
+    return figura.to_json(validate=False)
+
+# Nome -> função(contexto); o contexto tem o caminho do export, a base carregada
+# (com partições registradas, como no painel) e os filtros típicos
+CARGAS = {
+    'carregar_dados': lambda ctx: carregar_dados(caminho_arquivo=ctx['caminho']),
+    'filtros_sidebar': lambda ctx: aplicar_filtros(ctx['df'], **ctx['filtros']),
+    'busca_chamado': lambda ctx: aplicar_filtros(ctx['df'], busca_chamado='3001'),
+    'processar_dados_mapa': lambda ctx: processar_dados_mapa(ctx['df'], ['Todas'], 'Todos', 'Todos'),
+    'ipe_por_sre': lambda ctx: calcular_ipe_por_sre(ctx['df']),
+    'ipe_acumulado': lambda ctx: calcular_ipe_acumulado(ctx['df']),
+    'tendencia_percentis': lambda ctx: calcular_tendencia_percentis(recortar_sincronizados(ctx['df']), 75),
+    'evolucao_mensal': lambda ctx: calcular_evolucao_mensal(ctx['df'], ctx['filtros']['ano']),
+    'revisoes_por_responsavel': lambda ctx: calcular_revisoes_por_responsavel(ctx['df']),
+    'sazonalidade_mensal': lambda ctx: calcular_sazonalidade_mensal(ctx['df']),
+    'figura_sincronizacoes_dia': lambda ctx: figura_sincronizacoes_dia(ctx['df']),
+}
+
+# ============================================
+# MEDIÇÃO
+# ============================================
+class MedidorPico:
+    """
+    Amostra o RSS do processo numa thread e guarda o pico acima do início.
+    Memória já devolvida ao alocador por execuções anteriores é reaproveitada
+    sem subir o RSS; por isso o tracemalloc mede junto o pico das alocações
+    do Python e do numpy (as strings do pyarrow não passam por ele).
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pico_bytes = 0
+        self.pico_alocado_bytes = 0
+        self._parar = threading.Event()
+
+    def _amostrar(self):
+        while not self._parar.is_set():
+            atual = rss_processo() or 0
+            self.pico_bytes = max(self.pico_bytes, atual - self._inicio)
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        self._inicio = rss_processo() or 0
+        tracemalloc.start()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *erro):
+        self._parar.set()
+        self._thread.join()
+        self.pico_alocado_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        atual = rss_processo() or 0
+        self.pico_bytes = max(self.pico_bytes, atual - self._inicio)
+
+def medir_carga(funcao, contexto, repeticoes):
+    """Tempos (ms) de `repeticoes` execuções, após uma de aquecimento, e o pico de memória de uma a mais"""
+    funcao(contexto)
+    tempos = []
+    # Coleta antes de cada execução e nunca durante: o custo do gc não cai ao acaso numa delas
+    for _ in range(repeticoes):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcao(contexto)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        finally:
+            gc.enable()
+    with MedidorPico() as medidor:
+        funcao(contexto)
+    return tempos, medidor
+
+def ambiente():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+def executar(tamanhos, repeticoes=3, cargas=None, diretorio=None, referencia=None, semente=0, progresso=None):
+    """Roda as cargas em cada tamanho e devolve {'ambiente', 'resultados': [...]}"""
+    cargas = cargas or list(CARGAS)
+    diretorio = diretorio or os.path.join(tempfile.gettempdir(), 'esteira_benchmark')
+    resultados = []
+
+    for tamanho in tamanhos:
+        linhas = interpretar_tamanho(tamanho)
+        caminho = export_sintetico(linhas, diretorio, semente=semente, referencia=referencia)
+        df, status, _ = carregar_dados(caminho_arquivo=caminho)
+        if df is None:
+            raise ValueError(status)
+        invalidas = {coluna: n for coluna, n in datas_invalidas(df).items() if n}
+        if invalidas:
+            raise ValueError(f"Datas não lidas no export sintético {caminho}: {invalidas}")
+        contexto = {'caminho': caminho, 'df': particionar(df), 'filtros': filtros_tipicos(df)}
+
+        for nome in cargas:
+            tempos, medidor = medir_carga(CARGAS[nome], contexto, repeticoes)
+            mediana = statistics.median(tempos)
+            resultado = {
+                'tamanho': str(tamanho), 'linhas': linhas, 'carga': nome,
+                'mediana_ms': round(mediana, 3), 'min_ms': round(min(tempos), 3),
+                'tempos_ms': [round(t, 3) for t in tempos],
+                'linhas_s': round(linhas / (mediana / 1000)) if mediana > 0 else None,
+                'pico_mb': round(medidor.pico_bytes / 1024 ** 2, 1),
+                'pico_alocado_mb': round(medidor.pico_alocado_bytes / 1024 ** 2, 1)
+            }
+            resultados.append(resultado)
+            if progresso:
+                progresso(resultado)
+        del contexto, df
+
+    return {'ambiente': ambiente(), 'repeticoes': repeticoes, 'semente': semente, 'resultados': resultados}
+
+def _imprimir(resultado):
+    print(f"{resultado['tamanho']:>6} {resultado['carga']:<26} "
+          f"{resultado['mediana_ms']:>11,.1f} ms  {resultado['min_ms']:>11,.1f} ms  "
+          f"{(resultado['linhas_s'] or 0):>14,} linhas/s  {resultado['pico_mb']:>8,.1f} MB  {resultado['pico_alocado_mb']:>8,.1f} MB", flush=True)
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.benchmark',
+        description='Benchmarks dos caminhos quentes do painel sobre exports sintéticos.'
+    )
+    parser.add_argument('--tamanhos', default='10k,100k',
+                        help='tamanhos separados por vírgula: 10k, 100k, 1m, 5m... (padrão: %(default)s)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='execuções cronometradas por carga (padrão: %(default)s)')
+    parser.add_argument('--cargas', default=','.join(CARGAS),
+                        help='cargas de trabalho separadas por vírgula (padrão: todas)')
+    parser.add_argument('--diretorio', default=None,
+                        help='onde os exports sintéticos são gerados e reaproveitados (padrão: temporário do sistema)')
+    parser.add_argument('--referencia', default='data/esteira_demandas.csv',
+                        help='export real de onde vêm as distribuições, se existir (padrão: %(default)s)')
+    parser.add_argument('--saida', default=None, help='grava os resultados em JSON')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    cargas = [c.strip() for c in args.cargas.split(',') if c.strip()]
+    desconhecidas = [c for c in cargas if c not in CARGAS]
+    if desconhecidas:
+        print(f"Cargas desconhecidas: {', '.join(desconhecidas)} (disponíveis: {', '.join(CARGAS)})", file=sys.stderr)
+        return 1
+
+    print(f"{'tamanho':>6} {'carga':<26} {'mediana':>14}  {'mínimo':>14}  {'vazão':>23}  {'pico RSS':>11}  {'alocado':>11}")
+    resultados = executar(
+        [t.strip() for t in args.tamanhos.split(',') if t.strip()], repeticoes=args.repeticoes,
+        cargas=cargas, diretorio=args.diretorio, referencia=args.referencia, progresso=_imprimir
+    )
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.saida}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Cache LRU thread-safe e impressão digital de dados"""
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ============================================
+# CACHE LRU E FINGERPRINT
+# ============================================
+class CacheLRU:
+    """
+    Cache LRU thread-safe limitado por número de entradas e, opcionalmente,
+    por bytes (tamanho de cada valor estimado por `medir`, padrão medir_bytes)
+    """
+
+    def __init__(self, max_entradas=256, max_bytes=None, medir=None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._medir = medir or medir_bytes
+        self._itens = OrderedDict()
+        self._tamanhos = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def obter(self, chave):
+        with self._lock:
+            if chave not in self._itens:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return self._itens[chave]
+
+    def guardar(self, chave, valor):
+        tamanho = self._medir(valor) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and tamanho > self.max_bytes:
+            # Maior que o limite inteiro: não é guardado nem expulsa os demais
+            self.descartar(chave)
+            return
+        with self._lock:
+            self.bytes += tamanho - self._tamanhos.get(chave, 0)
+            self._itens[chave] = valor
+            self._tamanhos[chave] = tamanho
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_entradas or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes):
+                antiga, _ = self._itens.popitem(last=False)
+                self.bytes -= self._tamanhos.pop(antiga)
+                self.descartes += 1
+
+    def descartar(self, chave):
+        with self._lock:
+            if self._itens.pop(chave, None) is not None:
+                self.bytes -= self._tamanhos.pop(chave)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._tamanhos.clear()
+            self.bytes = 0
+
+    def bytes_em_uso(self):
+        """Bytes ocupados: o total controlado quando há max_bytes, senão a soma medida agora"""
+        if self.max_bytes is not None:
+            return self.bytes
+        with self._lock:
+            valores = list(self._itens.values())
+        return sum(self._medir(v) for v in valores)
+
+    def __len__(self):
+        return len(self._itens)
+
+
+def medir_bytes(valor):
+    """Estimativa de memória de um valor em cache (DataFrames medidos com deep=True)"""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return len(valor)
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(medir_bytes(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(medir_bytes(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+def fingerprint_dados(*dados):
+    """Impressão digital (hash) dos dados agregados que alimentam um gráfico"""
+    h = hashlib.md5()
+    for item in dados:
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            colunas = list(item.columns) if isinstance(item, pd.DataFrame) else [item.name]
+            h.update(repr(colunas).encode('utf-8'))
+            h.update(pd.util.hash_pandas_object(item, index=True).values.tobytes())
+        else:
+            h.update(repr(item).encode('utf-8'))
+    return h.hexdigest()
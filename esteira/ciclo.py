@@ -0,0 +1,117 @@
+"""
+Tempo de ciclo (lead time) dos cartões sincronizados: minutos de Criado a
+Modificado, calculados na carga como inteiros (Tempo_Ciclo_Min). Histogramas
+em faixas fixas e percentis P50/P85/P95 por SRE, Empresa, Tipo de Chamado e
+mês, tudo com numpy sobre códigos de grupo, sem laço por linha.
+"""
+import numpy as np
+import pandas as pd
+
+# Limites inferiores das faixas, em minutos (a última é aberta)
+BORDAS_CICLO_MIN = np.array([0, 15, 30, 60, 120, 240, 480, 1440, 2880, 4320, 7200, 10080, 20160, 43200])
+ROTULOS_CICLO = [
+    '< 15 min', '15-30 min', '30 min-1 h', '1-2 h', '2-4 h', '4-8 h', '8 h-1 d',
+    '1-2 d', '2-3 d', '3-5 d', '5-7 d', '7-14 d', '14-30 d', '30 d +'
+]
+PERCENTIS_CICLO = (50, 85, 95)
+
+# Rótulo no painel -> coluna da base
+DIMENSOES_CICLO = {
+    'SRE': 'SRE',
+    'Empresa': 'Empresa',
+    'Tipo de Chamado': 'Tipo_Chamado',
+    'Mês': 'Ano_Mês',
+}
+
+def minutos_ciclo(criado, modificado):
+    """Minutos de Criado a Modificado (Int64; vazio sem alguma das datas ou com Modificado antes de Criado)"""
+    inicio = criado.to_numpy(dtype='datetime64[ns]').astype('int64')
+    fim = modificado.to_numpy(dtype='datetime64[ns]').astype('int64')
+    minutos = (fim - inicio) // 60_000_000_000
+    invalido = criado.isna().to_numpy() | modificado.isna().to_numpy() | (minutos < 0)
+    return pd.Series(pd.arrays.IntegerArray(minutos, invalido), index=criado.index)
+
+def duracoes_sincronizadas(df):
+    """Posições e minutos (int64) dos cartões sincronizados com tempo de ciclo conhecido"""
+    if 'Tempo_Ciclo_Min' not in df.columns or 'Status' not in df.columns:
+        return np.array([], dtype='int64'), np.array([], dtype='int64')
+    ciclo = df['Tempo_Ciclo_Min']
+    validos = (df['Status'] == 'Sincronizado').to_numpy() & ciclo.notna().to_numpy()
+    posicoes = np.flatnonzero(validos)
+    return posicoes, ciclo.to_numpy(dtype='int64', na_value=0)[posicoes]
+
+def faixas(minutos):
+    """Índice da faixa de cada duração"""
+    return np.searchsorted(BORDAS_CICLO_MIN, minutos, side='right') - 1
+
+def percentis_agrupados(codigos, valores, n_grupos, percentis=PERCENTIS_CICLO):
+    """
+    Percentis (interpolação linear, como Series.quantile) dos valores de cada
+    grupo: uma ordenação por (grupo, valor) e indexação direta nas fronteiras.
+    Devolve uma matriz grupos x percentis (NaN em grupos vazios).
+    """
+    ordem = np.lexsort((valores, codigos))
+    ordenados = valores[ordem].astype('float64')
+    contagens = np.bincount(codigos, minlength=n_grupos)
+    inicios = np.concatenate(([0], np.cumsum(contagens)[:-1]))
+    resultado = np.full((n_grupos, len(percentis)), np.nan)
+    com_dados = contagens > 0
+    if not com_dados.any():
+        return resultado
+    n, inicio = contagens[com_dados], inicios[com_dados]
+    for j, p in enumerate(percentis):
+        posicao = (n - 1) * (p / 100)
+        abaixo = np.floor(posicao).astype('int64')
+        acima = np.minimum(abaixo + 1, n - 1)
+        fracao = posicao - abaixo
+        baixo, alto = ordenados[inicio + abaixo], ordenados[inicio + acima]
+        resultado[com_dados, j] = baixo + (alto - baixo) * fracao
+    return resultado
+
+def _resumo_grupos(codigos, grupos, minutos, indices_faixa):
+    """Histograma (grupos x faixas) e tabela de percentis de uma dimensão"""
+    n_grupos, n_faixas = len(grupos), len(ROTULOS_CICLO)
+    contagem = np.bincount(codigos * n_faixas + indices_faixa, minlength=n_grupos * n_faixas)
+    histograma = pd.DataFrame(contagem.reshape(n_grupos, n_faixas), index=grupos, columns=ROTULOS_CICLO)
+
+    cartoes = np.bincount(codigos, minlength=n_grupos)
+    soma = np.bincount(codigos, weights=minutos, minlength=n_grupos)
+    tabela = pd.DataFrame(
+        percentis_agrupados(codigos, minutos, n_grupos), index=grupos,
+        columns=[f'P{p}' for p in PERCENTIS_CICLO]
+    )
+    tabela.insert(0, 'Cartões', cartoes)
+    tabela['Média'] = np.divide(soma, cartoes, out=np.full(n_grupos, np.nan), where=cartoes > 0)
+    return histograma, tabela
+
+def calcular_tempo_ciclo(df):
+    """
+    Tempo de ciclo dos sincronizados: {'geral': (histograma, tabela), 'dimensoes':
+    {rótulo: (histograma, tabela)}}, em minutos. Histogramas com as faixas de
+    ROTULOS_CICLO nas colunas; tabelas com Cartões, P50, P85, P95 e Média.
+    """
+    posicoes, minutos = duracoes_sincronizadas(df)
+    indices_faixa = faixas(minutos)
+
+    geral = _resumo_grupos(np.zeros(len(minutos), dtype='int64'), pd.Index(['Todos']), minutos, indices_faixa)
+    dimensoes = {}
+    for rotulo, coluna in DIMENSOES_CICLO.items():
+        if coluna not in df.columns:
+            continue
+        valores = df[coluna].take(posicoes)
+        codigos, grupos = pd.factorize(valores, sort=True)
+        conhecidos = codigos >= 0
+        dimensoes[rotulo] = _resumo_grupos(
+            codigos[conhecidos], pd.Index(grupos, name=rotulo), minutos[conhecidos], indices_faixa[conhecidos]
+        )
+    return {'geral': geral, 'dimensoes': dimensoes}
+
+def formatar_duracao(minutos):
+    """Minutos -> '45 min', '6,5 h' ou '3,2 d'"""
+    if minutos is None or pd.isna(minutos):
+        return '-'
+    if minutos < 60:
+        return f"{minutos:.0f} min"
+    if minutos < 48 * 60:
+        return f"{minutos / 60:.1f} h".replace('.', ',')
+    return f"{minutos / 1440:.1f} d".replace('.', ',')
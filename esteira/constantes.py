@@ -0,0 +1,169 @@
+"""Constantes compartilhadas: paleta, empresas e caminhos de dados"""
+import os
+from datetime import datetime
+
+# ============================================
+# PALETA DE CORES - NOVA IDENTIDADE VISUAL
+# ============================================
+# Cores principais
+COR_VERDE_ESCURO = "#2E7D32"      # Verde escuro - principal
+COR_AZUL_PETROLEO = "#028a9f"     # Azul petróleo - secundário
+COR_AZUL_ESCURO = "#005973"       # Azul escuro - destaque
+COR_LARANJA = "#F57C00"           # Laranja - alertas/positivo
+COR_VERMELHO = "#C62828"          # Vermelho - erros/negativo
+
+# Cores neutras
+COR_CINZA_FUNDO = "#F8F9FA"       # Cinza muito claro para fundos
+COR_CINZA_BORDA = "#E9ECEF"       # Cinza para bordas
+COR_CINZA_TEXTO = "#6C757D"       # Cinza para textos secundários
+COR_BRANCO = "#FFFFFF"            # Branco
+COR_PRETO_SUAVE = "#212529"       # Preto suave para textos principais
+
+# Cores para gráficos
+CORES_GRADIENTE = [
+    COR_VERDE_ESCURO,
+    COR_AZUL_PETROLEO,
+    COR_AZUL_ESCURO,
+    COR_LARANJA,
+    COR_VERMELHO,
+    "#1E88E5"  # Azul adicional
+]
+
+# ============================================
+# MAPEAMENTO COMPLETO DAS EMPRESAS
+# ============================================
+MAPEAMENTO_EMPRESAS = {
+    'EMR': {
+        'sigla': 'MG',
+        'estado': 'Minas Gerais',
+        'regiao': 'Sudeste',
+        'nome_completo': 'Energisa Minas Gerais',
+        'latitude': -19.9167,
+        'longitude': -43.9345
+    },
+    'EPB': {
+        'sigla': 'PB',
+        'estado': 'Paraíba',
+        'regiao': 'Nordeste',
+        'nome_completo': 'Energisa Paraíba',
+        'latitude': -7.1195,
+        'longitude': -36.7240
+    },
+    'ESE': {
+        'sigla': 'SE',
+        'estado': 'Sergipe',
+        'regiao': 'Nordeste',
+        'nome_completo': 'Energisa Sergipe',
+        'latitude': -10.9472,
+        'longitude': -37.0731
+    },
+    'ESS': {
+        'sigla': 'SP',
+        'estado': 'São Paulo',
+        'regiao': 'Sudeste',
+        'nome_completo': 'Energisa Sul/Sudeste',
+        'latitude': -23.5505,
+        'longitude': -46.6333
+    },
+    'EMS': {
+        'sigla': 'MS',
+        'estado': 'Mato Grosso do Sul',
+        'regiao': 'Centro-Oeste',
+        'nome_completo': 'Energisa Mato Grosso do Sul',
+        'latitude': -20.4697,
+        'longitude': -54.6201
+    },
+    'EMT': {
+        'sigla': 'MT',
+        'estado': 'Mato Grosso',
+        'regiao': 'Centro-Oeste',
+        'nome_completo': 'Energisa Mato Grosso',
+        'latitude': -12.6819,
+        'longitude': -56.9211
+    },
+    'ETO': {
+        'sigla': 'TO',
+        'estado': 'Tocantins',
+        'regiao': 'Norte',
+        'nome_completo': 'Energisa Tocantins',
+        'latitude': -10.1753,
+        'longitude': -48.2982
+    },
+    'ERO': {
+        'sigla': 'RO',
+        'estado': 'Rondônia',
+        'regiao': 'Norte',
+        'nome_completo': 'Energisa Rondônia',
+        'latitude': -10.9161,
+        'longitude': -61.8298
+    },
+    'EAC': {
+        'sigla': 'AC',
+        'estado': 'Acre',
+        'regiao': 'Norte',
+        'nome_completo': 'Energisa Acre',
+        'latitude': -9.0238,
+        'longitude': -70.8120
+    }
+}
+
+# ============================================
+# VARIÁVEIS GLOBAIS DE CONFIGURAÇÃO
+# ============================================
+CAMINHO_ARQUIVO_PRINCIPAL = "esteira_demandas.csv"
+# Datas do export do ADMS (dia primeiro)
+FORMATO_DATA_EXPORT = "%d/%m/%Y %H:%M"
+CAMINHOS_ALTERNATIVOS = [
+    "data/esteira_demandas.csv",
+    "dados/esteira_demandas.csv",
+    "database/esteira_demandas.csv",
+    "base_dados.csv",
+    "dados.csv"
+]
+
+# Um export do ADMS por mês ou distribuidora; quando o diretório tem CSVs, todos
+# são lidos em paralelo e consolidados no lugar do arquivo único
+DIRETORIO_EXPORTS = "data/exports"
+
+# Armazém SQLite opcional (python -m esteira.armazem); ativo quando o arquivo existe
+CAMINHO_ARMAZEM_SQLITE = "data/esteira_demandas.sqlite"
+
+# Log rotativo (JSON lines) dos tempos de cada execução do painel
+CAMINHO_LOG_DESEMPENHO = "logs/desempenho.jsonl"
+
+# Linha de base do portão de regressão de desempenho (python -m esteira.regressao)
+CAMINHO_LINHA_BASE = "benchmarks/linha_base.json"
+
+# Limite brando de memória do processo: acima dele, as bases guardadas por
+# sessões ociosas há mais de SESSAO_OCIOSA_MINUTOS são liberadas
+LIMITE_MEMORIA_MB = int(os.environ.get("ESTEIRA_LIMITE_MEMORIA_MB", 1536))
+SESSAO_OCIOSA_MINUTOS = int(os.environ.get("ESTEIRA_SESSAO_OCIOSA_MINUTOS", 10))
+
+# ============================================
+# FUSO HORÁRIO
+# ============================================
+# Exports e painel seguem o horário de Brasília, qualquer que seja o fuso do servidor
+FUSO_HORARIO = 'America/Sao_Paulo'
+
+def agora_brasilia():
+    """Instante atual em Brasília, sem fuso (como as datas do export)"""
+    try:
+        import pytz
+        return datetime.now(pytz.timezone(FUSO_HORARIO)).replace(tzinfo=None)
+    except Exception:
+        return datetime.now()
+
+# ============================================
+# NOMES DOS MESES
+# ============================================
+NOMES_MESES = {
+    1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr',
+    5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
+    9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
+}
+
+NOMES_MESES_COMPLETOS = {
+    1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
+    5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
+    9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+}
@@ -0,0 +1,448 @@
+"""Carregamento e preparação da base de demandas (sem dependência do Streamlit)"""
+import io
+import os
+import glob
+import time
+import codecs
+import hashlib
+import multiprocessing
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheLRU
+from .ciclo import minutos_ciclo
+from .motivos import classificar_motivos
+from .constantes import CAMINHO_ARQUIVO_PRINCIPAL, CAMINHOS_ALTERNATIVOS, DIRETORIO_EXPORTS, FORMATO_DATA_EXPORT
+from .filtros import aplicar_filtros
+from .desempenho import medir
+
+# ============================================
+# FUNÇÕES AUXILIARES
+# ============================================
+def formatar_nome_responsavel(nome):
+    """Formata nomes dos responsáveis"""
+    if pd.isna(nome):
+        return "Não informado"
+    
+    nome_str = str(nome).strip()
+    
+    if '@' in nome_str:
+        partes = nome_str.split('@')[0]
+        for separador in ['.', '_', '-']:
+            if separador in partes:
+                partes = partes.replace(separador, ' ')
+        
+        palavras = [p.capitalize() for p in partes.split() if not p.isdigit()]
+        nome_formatado = ' '.join(palavras)
+        
+        correcoes = {
+            ' Da ': ' da ',
+            ' De ': ' de ',
+            ' Do ': ' do ',
+            ' Das ': ' das ',
+            ' Dos ': ' dos ',
+            ' E ': ' e ',
+        }
+        
+        for errado, correto in correcoes.items():
+            nome_formatado = nome_formatado.replace(errado, correto)
+        
+        return nome_formatado
+    
+    return nome_str.title()
+
+def calcular_hash_arquivo(conteudo):
+    """Calcula hash do conteúdo do arquivo para detectar mudanças"""
+    return hashlib.md5(conteudo).hexdigest()
+
+def calcular_hash_caminho(caminho):
+    """MD5 de um arquivo em disco, lido em blocos (sem carregá-lo inteiro na memória)"""
+    h = hashlib.md5()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+# ============================================
+# FUNÇÃO PRINCIPAL DE CARREGAMENTO DE DADOS (ADAPTADA)
+# ============================================
+def carregar_dados(uploaded_file=None, caminho_arquivo=None, conteudo=None):
+    """
+    Carrega e processa os dados - Adaptado para o formato do arquivo ADMS.
+    `conteudo` aceita os bytes do CSV (bytes, memoryview...) já em memória;
+    uploads são lidos do próprio buffer, sem cópia e sem arquivo temporário.
+    """
+    try:
+        if conteudo is not None:
+            conteudo_bytes = conteudo
+        elif uploaded_file:
+            conteudo_bytes = uploaded_file.getbuffer()
+        elif caminho_arquivo and os.path.exists(caminho_arquivo):
+            with open(caminho_arquivo, 'rb') as f:
+                conteudo_bytes = f.read()
+        else:
+            return None, "Nenhum arquivo fornecido", None
+        
+        return processar_conteudo(conteudo_bytes, calcular_hash_arquivo(conteudo_bytes))
+    
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return None, f"Erro: {str(e)}", None
+
+def _inicio_cabecalho(conteudo):
+    """Posição da linha de cabeçalho do export (procura primeiro a mais completa)"""
+    for marcadores in (('"Chamado"', '"Tipo Chamado"'), ('"Chamado"',)):
+        posicao = 0
+        while posicao < len(conteudo):
+            fim = conteudo.find('\n', posicao)
+            fim = len(conteudo) if fim == -1 else fim
+            linha = conteudo[posicao:fim]
+            if all(marcador in linha for marcador in marcadores):
+                return posicao
+            posicao = fim + 1
+    return None
+
+def processar_conteudo(conteudo_bytes, hash_conteudo):
+    """Processa os bytes de um export ADMS já lidos e com o MD5 calculado"""
+    try:
+        conteudo = codecs.decode(conteudo_bytes, 'utf-8-sig')
+        
+        # ============================================
+        # 🔧 BUSCA MAIS FLEXÍVEL PELO CABEÇALHO
+        # ============================================
+        inicio = _inicio_cabecalho(conteudo)
+        
+        if inicio is None:
+            return None, "Formato de arquivo inválido - cabeçalho não encontrado", None
+        
+        # Lê a partir da linha do cabeçalho encontrada (sem cópia quando ela é a primeira)
+        df = pd.read_csv(io.StringIO(conteudo[inicio:]), quotechar='"')
+        
+        # ============================================
+        # 🔧 MAPEAMENTO DE COLUNAS MAIS ROBUSTO
+        # ============================================
+        col_mapping = {
+            'Chamado': 'Chamado',
+            'Tipo Chamado': 'Tipo_Chamado',
+            'Responsável': 'Responsável',
+            'Status': 'Status',
+            'Criado': 'Criado',
+            'Modificado': 'Modificado',
+            'Modificado por': 'Modificado_por',
+            'Prioridade': 'Prioridade',
+            'Sincronização': 'Sincronização',
+            'SRE': 'SRE',
+            'Empresa': 'Empresa',
+            'Revisões': 'Revisões',
+            'Motivo Revisão': 'Motivo_Revisao',
+            'Retorno Cliente': 'Retorno_Cliente'
+        }
+        
+        # Renomeia apenas colunas que existem
+        for old, new in col_mapping.items():
+            if old in df.columns:
+                df = df.rename(columns={old: new})
+        
+        df = preparar_colunas(df)
+        
+        timestamp = time.time()
+        
+        return df, "✅ Dados carregados com sucesso", f"{hash_conteudo}_{timestamp}"
+    
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return None, f"Erro: {str(e)}", None
+
+def converter_datas(valores):
+    """
+    Datas do export (dd/mm/aaaa HH:MM) com formato explícito: sem ele o pandas
+    deduz o formato da primeira linha e, se ela for ambígua (02/10/2025), lê
+    tudo com o mês primeiro. O que não segue o formato é tentado como ISO
+    (armazém SQLite) e, por fim, com o dia primeiro.
+    """
+    if pd.api.types.is_datetime64_any_dtype(valores):
+        return valores
+    datas = pd.to_datetime(valores, format=FORMATO_DATA_EXPORT, errors='coerce')
+    pendentes = datas.isna() & valores.notna()
+    if pendentes.any():
+        outras = pd.to_datetime(valores[pendentes], format='ISO8601', errors='coerce')
+        sem_iso = outras.isna()
+        if sem_iso.any():
+            outras[sem_iso] = pd.to_datetime(valores[pendentes][sem_iso], format='mixed', dayfirst=True, errors='coerce')
+        if datas.isna().all():
+            # Nenhuma no formato do export: fica com a resolução inferida das outras
+            return outras.reindex(valores.index)
+        datas[pendentes] = outras
+    return datas
+
+def preparar_colunas(df):
+    """Tipos e colunas derivadas (datas, mês/ano, responsável...) de uma base com colunas já renomeadas"""
+    # ============================================
+    # 🔧 PROCESSAMENTO DE DATAS COM FLEXIBILIDADE
+    # ============================================
+    date_columns = ['Criado', 'Modificado', 'Vencimento']
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = converter_datas(df[col])
+    
+    # ============================================
+    # 🔧 TEMPO DE CICLO (CRIADO -> MODIFICADO, EM MINUTOS)
+    # ============================================
+    if 'Criado' in df.columns and 'Modificado' in df.columns:
+        df['Tempo_Ciclo_Min'] = minutos_ciclo(df['Criado'], df['Modificado'])
+    
+    # ============================================
+    # 🔧 CRIAÇÃO DE COLUNAS DE DATA
+    # ============================================
+    if 'Criado' in df.columns:
+        df['Ano'] = df['Criado'].dt.year
+        df['Mês'] = df['Criado'].dt.month
+        df['Mês_Num'] = df['Criado'].dt.month
+        df['Dia'] = df['Criado'].dt.day
+        df['Hora'] = df['Criado'].dt.hour
+        df['Mês_Ano'] = df['Criado'].dt.strftime('%b/%Y')
+        df['Nome_Mês'] = df['Criado'].dt.month.map({
+            1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr',
+            5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
+            9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
+        })
+        df['Nome_Mês_Completo'] = df['Criado'].dt.month.map({
+            1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
+            5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
+            9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+        })
+        df['Ano_Mês'] = df['Criado'].dt.strftime('%Y-%m')
+    
+    # ============================================
+    # 🔧 PROCESSAMENTO DO RESPONSÁVEL
+    # ============================================
+    if 'Responsável' in df.columns:
+        df['Responsável_Formatado'] = df['Responsável'].apply(formatar_nome_responsavel)
+    
+    # ============================================
+    # 🔧 PROCESSAMENTO DE REVISÕES
+    # ============================================
+    if 'Revisões' in df.columns:
+        df['Revisões'] = pd.to_numeric(df['Revisões'], errors='coerce').fillna(0).astype(int)
+    
+    # ============================================
+    # 🔧 CATEGORIA DO MOTIVO DE REVISÃO (TEXTOS JÁ CLASSIFICADOS SÃO REAPROVEITADOS)
+    # ============================================
+    if 'Motivo_Revisao' in df.columns:
+        df['Categoria_Revisao'] = classificar_motivos(df['Motivo_Revisao'])
+    
+    # ============================================
+    # 🔧 PROCESSAMENTO DE EMPRESA (remove espaços extras)
+    # ============================================
+    if 'Empresa' in df.columns:
+        df['Empresa'] = df['Empresa'].astype(str).str.strip()
+    
+    # ============================================
+    # 🔧 PROCESSAMENTO DE SINCRONIZAÇÃO (remove espaços)
+    # ============================================
+    if 'Sincronização' in df.columns:
+        df['Sincronização'] = df['Sincronização'].astype(str).str.strip()
+    
+    return df
+
+def encontrar_arquivo_dados():
+    """
+    Tenta encontrar os dados em vários caminhos possíveis. O diretório de
+    exports mensais, quando tem CSVs, vem antes do arquivo único.
+    """
+    if listar_exports(DIRETORIO_EXPORTS):
+        return DIRETORIO_EXPORTS
+    
+    if os.path.exists(CAMINHO_ARQUIVO_PRINCIPAL):
+        return CAMINHO_ARQUIVO_PRINCIPAL
+    
+    for caminho in CAMINHOS_ALTERNATIVOS:
+        if os.path.exists(caminho):
+            return caminho
+    
+    return None
+
+# ============================================
+# INGESTÃO DE VÁRIOS EXPORTS (UM POR MÊS/DISTRIBUIDORA)
+# ============================================
+def listar_exports(origem):
+    """Arquivos de uma origem: CSV único, diretório (todos os *.csv) ou padrão glob"""
+    if not origem:
+        return []
+    if os.path.isdir(origem):
+        return sorted(glob.glob(os.path.join(origem, '*.csv')))
+    if glob.has_magic(origem):
+        return sorted(c for c in glob.glob(origem) if os.path.isfile(c))
+    return [origem] if os.path.isfile(origem) else []
+
+def assinatura_origem(origem):
+    """(caminho resolvido, tamanho, mtime_ns) de cada arquivo da origem; OSError se não houver nenhum"""
+    caminhos = listar_exports(origem)
+    if not caminhos:
+        raise FileNotFoundError(origem)
+    assinatura = []
+    for caminho in caminhos:
+        info = os.stat(caminho)
+        assinatura.append((os.path.realpath(caminho), info.st_size, info.st_mtime_ns))
+    return tuple(assinatura)
+
+def calcular_hash_origem(origem):
+    """MD5 do conteúdo da origem; para um único arquivo, igual ao calcular_hash_caminho"""
+    caminhos = listar_exports(origem)
+    if not caminhos:
+        raise FileNotFoundError(origem)
+    if len(caminhos) == 1:
+        return calcular_hash_caminho(caminhos[0])
+    h = hashlib.md5()
+    for caminho in caminhos:
+        h.update(f"{os.path.basename(caminho)}:{calcular_hash_caminho(caminho)}\n".encode('utf-8'))
+    return h.hexdigest()
+
+def consolidar_exports(dfs):
+    """
+    Concatena os exports sem repetir demandas: um cartão (Chamado + Criado)
+    presente em mais de um export fica só com as linhas do export em que seu
+    Modificado é mais recente (empate: o listado por último). Linhas de um mesmo
+    export nunca são descartadas, pois um Chamado pode ter vários cartões.
+    """
+    df = pd.concat(dfs, ignore_index=True)
+    if not {'Chamado', 'Criado', 'Modificado'}.issubset(df.columns):
+        return df
+    
+    cartoes = pd.DataFrame({
+        'chamado': df['Chamado'].astype(str).str.strip(),
+        'criado': df['Criado'],
+        'arquivo': np.repeat(np.arange(len(dfs)), [len(d) for d in dfs]),
+        'modificado': df['Modificado']
+    })
+    versoes = cartoes.groupby(['chamado', 'criado', 'arquivo'], dropna=False)['modificado'].max().reset_index()
+    vencedores = (versoes.sort_values(['modificado', 'arquivo'], kind='stable', na_position='first')
+                  .drop_duplicates(['chamado', 'criado'], keep='last')[['chamado', 'criado', 'arquivo']])
+    
+    mantidos = cartoes.merge(vencedores, how='left', indicator=True)['_merge'].eq('both').to_numpy()
+    return df[mantidos].reset_index(drop=True)
+
+def _carregar_export(caminho):
+    return carregar_dados(caminho_arquivo=caminho)
+
+def carregar_exports(origem, max_processos=None):
+    """
+    Carrega todos os arquivos da origem, cada um pelo carregar_dados, em
+    processos paralelos (um por núcleo), e consolida com consolidar_exports.
+    Retorna (df, status, file_hash) como carregar_dados.
+    """
+    caminhos = listar_exports(origem)
+    if not caminhos:
+        return None, "Nenhum arquivo fornecido", None
+    if len(caminhos) == 1:
+        return carregar_dados(caminho_arquivo=caminhos[0])
+    
+    processos = min(len(caminhos), max_processos or os.cpu_count() or 1)
+    # 'spawn': o painel roda várias threads, e fork com threads ativas pode travar o filho
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+        resultados = list(executor.map(_carregar_export, caminhos))
+    
+    for caminho, (df, status, _) in zip(caminhos, resultados):
+        if df is None:
+            return None, f"{os.path.basename(caminho)}: {status}", None
+    
+    dfs = [df for df, _, _ in resultados]
+    df = consolidar_exports(dfs)
+    descartados = sum(len(d) for d in dfs) - len(df)
+    
+    h = hashlib.md5()
+    for caminho, (_, _, file_hash) in zip(caminhos, resultados):
+        h.update(f"{os.path.basename(caminho)}:{file_hash.split('_')[0]}\n".encode('utf-8'))
+    
+    status = f"✅ {len(caminhos)} exports consolidados ({descartados:,} registros repetidos descartados)"
+    return df, status, f"{h.hexdigest()}_{time.time()}"
+
+# ============================================
+# CACHE DE CARREGAMENTO ENDEREÇADO POR CONTEÚDO
+# ============================================
+# Assinatura da origem (caminho, tamanho, mtime_ns de cada arquivo) -> MD5,
+# para não reler arquivos que não mudaram
+_IMPRESSOES_ARQUIVOS = CacheLRU(max_entradas=64)
+
+def chave_arquivo(caminho):
+    """Chave de cache de um arquivo ou diretório: (caminho resolvido, assinatura_origem, MD5 do conteúdo)"""
+    assinatura = assinatura_origem(caminho)
+    md5 = _IMPRESSOES_ARQUIVOS.obter(assinatura)
+    if md5 is None:
+        md5 = calcular_hash_origem(caminho)
+        _IMPRESSOES_ARQUIVOS.guardar(assinatura, md5)
+    return (os.path.realpath(caminho), assinatura, md5)
+
+def carregar_dados_em_cache(cache, caminho_arquivo=None, conteudo=None):
+    """
+    carregar_dados memorizado num CacheLRU, sem prazo de validade: arquivos (ou
+    diretórios de exports) pela chave_arquivo, conteúdo em memória (upload) pelo
+    MD5, calculado uma só vez.
+    Um arquivo alterado gera outra chave e um inalterado nunca é reprocessado.
+    Falhas não são guardadas.
+    """
+    if conteudo is not None:
+        md5 = calcular_hash_arquivo(conteudo)
+        chave = ('conteudo', md5)
+        carregar = lambda: processar_conteudo(conteudo, md5)
+    else:
+        try:
+            chave = chave_arquivo(caminho_arquivo)
+        except OSError:
+            return carregar_dados(caminho_arquivo=caminho_arquivo)
+        carregar = lambda: carregar_exports(caminho_arquivo)
+
+    with medir('Carga da base') as medicao:
+        resultado = cache.obter(chave)
+        medicao['cache'] = 'falha' if resultado is None else 'acerto'
+        if resultado is None:
+            resultado = carregar()
+            if resultado[0] is not None:
+                cache.guardar(chave, resultado)
+        medicao['linhas'] = len(resultado[0]) if resultado[0] is not None else 0
+    return resultado
+
+# ============================================
+# HANDLE DO CONJUNTO DE DADOS
+# ============================================
+@dataclass(frozen=True)
+class ConjuntoDados:
+    """
+    Base carregada e imutável: o DataFrame e sua identificação.
+    As funções de esteira.filtros e esteira.analises aceitam tanto o handle
+    quanto o DataFrame diretamente.
+    """
+    df: pd.DataFrame = field(repr=False)
+    versao: str                 # "<md5>_<timestamp>", o mesmo file_hash da sessão
+    origem: str = None          # caminho do arquivo ou nome do upload
+    filtros: tuple = ()         # filtros já aplicados sobre a base original
+
+    @property
+    def hash_conteudo(self):
+        return self.versao.split('_')[0]
+
+    def __len__(self):
+        return len(self.df)
+
+    def filtrar(self, **filtros):
+        """Novo handle com a cadeia de filtros da barra lateral aplicada"""
+        return ConjuntoDados(
+            df=aplicar_filtros(self.df, **filtros),
+            versao=self.versao,
+            origem=self.origem,
+            filtros=self.filtros + tuple(sorted(filtros.items()))
+        )
+
+def carregar_conjunto(uploaded_file=None, caminho_arquivo=None):
+    """Como carregar_dados, mas devolve um ConjuntoDados (ou ValueError com a mensagem)"""
+    df, status, versao = carregar_dados(uploaded_file=uploaded_file, caminho_arquivo=caminho_arquivo)
+    if df is None:
+        raise ValueError(status)
+    origem = caminho_arquivo or getattr(uploaded_file, 'name', None)
+    return ConjuntoDados(df=df, versao=versao, origem=origem)
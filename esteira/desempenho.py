@@ -0,0 +1,115 @@
+"""
+Medição leve de desempenho: tempo de cada seção de uma execução do painel
+(carga, filtros, abas, figuras), linhas processadas e acerto/falha de cache,
+com registro rotativo em JSON lines. Sem dependências pesadas (não carrega o pandas).
+"""
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from .constantes import CAMINHO_LOG_DESEMPENHO
+
+# ============================================
+# RASTREADOR DE UMA EXECUÇÃO
+# ============================================
+class Rastreador:
+    """Medições de uma execução, na ordem em que as seções começam (aninhadas por nível)"""
+
+    def __init__(self, rotulo=''):
+        self.rotulo = rotulo
+        self.inicio = time.perf_counter()
+        self.medicoes = []
+        self._nivel = 0
+
+    @contextmanager
+    def medir(self, secao, linhas=None):
+        """
+        Mede o bloco; a medição devolvida aceita `linhas` e `cache`
+        ('acerto'/'falha') preenchidos dentro dele
+        """
+        medicao = {'secao': secao, 'nivel': self._nivel, 'ms': None, 'linhas': linhas, 'cache': None}
+        self.medicoes.append(medicao)
+        self._nivel += 1
+        inicio = time.perf_counter()
+        try:
+            yield medicao
+        finally:
+            medicao['ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+            self._nivel -= 1
+
+    @property
+    def total_ms(self):
+        return round((time.perf_counter() - self.inicio) * 1000, 2)
+
+    def registro(self, **contexto):
+        """Linha do log: instante, total, contexto (sessão, base...) e medições"""
+        return {
+            'em': datetime.now().isoformat(timespec='seconds'),
+            'rotulo': self.rotulo,
+            'total_ms': self.total_ms,
+            **contexto,
+            'medicoes': self.medicoes
+        }
+
+# Rastreador ativo da thread (cada execução do painel roda na própria thread);
+# medir() fora de uma execução rastreada não custa nada
+_local = threading.local()
+
+def iniciar_rastreamento(rotulo=''):
+    """Novo rastreador para a thread atual (uma execução do painel)"""
+    _local.rastreador = Rastreador(rotulo)
+    return _local.rastreador
+
+def rastreador_atual():
+    return getattr(_local, 'rastreador', None)
+
+@contextmanager
+def medir(secao, linhas=None):
+    """Mede o bloco no rastreador da thread, se houver; senão só executa"""
+    rastreador = rastreador_atual()
+    if rastreador is None:
+        yield {}
+        return
+    with rastreador.medir(secao, linhas) as medicao:
+        yield medicao
+
+# ============================================
+# LOG ROTATIVO (JSON LINES)
+# ============================================
+class LogDesempenho:
+    """
+    Uma linha JSON por execução. Ao passar de `max_bytes` o arquivo vira .1
+    (os anteriores, .2, .3...) e só `manter` arquivos antigos são guardados.
+    As últimas execuções ficam também em memória para o painel.
+    """
+
+    def __init__(self, caminho=CAMINHO_LOG_DESEMPENHO, max_bytes=5 * 1024 ** 2, manter=3, recentes=200):
+        self.caminho = caminho
+        self.max_bytes = max_bytes
+        self.manter = manter
+        self.recentes = deque(maxlen=recentes)
+        self._lock = threading.Lock()
+
+    def _rotacionar(self):
+        for i in range(self.manter - 1, 0, -1):
+            if os.path.exists(f"{self.caminho}.{i}"):
+                os.replace(f"{self.caminho}.{i}", f"{self.caminho}.{i + 1}")
+        os.replace(self.caminho, f"{self.caminho}.1")
+
+    def gravar(self, registro):
+        linha = json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            self.recentes.append(registro)
+            try:
+                os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+                if os.path.exists(self.caminho) and os.path.getsize(self.caminho) + len(linha) > self.max_bytes:
+                    self._rotacionar()
+                with open(self.caminho, 'a', encoding='utf-8') as f:
+                    f.write(linha)
+            except OSError:
+                # Disco somente leitura/cheio: o painel continua com as execuções em memória
+                pass
@@ -0,0 +1,49 @@
+"""Serialização de tabelas para download (CSV, gzip, zip, Excel, Parquet)"""
+import io
+import gzip
+import zipfile
+import importlib.util
+
+# ============================================
+# FORMATOS DE EXPORTAÇÃO
+# ============================================
+# Rótulo -> (extensão, mime, módulo opcional necessário)
+FORMATOS_EXPORTACAO = {
+    'CSV': ('csv', 'text/csv', None),
+    'CSV (gzip)': ('csv.gz', 'application/gzip', None),
+    'CSV (zip)': ('zip', 'application/zip', None),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', 'pyarrow')
+}
+
+def formatos_exportacao_disponiveis():
+    """Formatos cujas dependências opcionais estão instaladas"""
+    return [
+        rotulo for rotulo, (_, _, modulo) in FORMATOS_EXPORTACAO.items()
+        if modulo is None or importlib.util.find_spec(modulo) is not None
+    ]
+
+def serializar_exportacao(df, formato, nome_base):
+    """Serializa o DataFrame no formato escolhido e retorna os bytes do arquivo"""
+    if formato == 'Excel':
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False, engine='openpyxl')
+        return buffer.getvalue()
+
+    if formato == 'Parquet':
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+
+    csv_bytes = df.to_csv(index=False).encode('utf-8-sig')
+
+    if formato == 'CSV (gzip)':
+        return gzip.compress(csv_bytes, compresslevel=6, mtime=0)
+
+    if formato == 'CSV (zip)':
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+            arquivo_zip.writestr(f"{nome_base}.csv", csv_bytes)
+        return buffer.getvalue()
+
+    return csv_bytes
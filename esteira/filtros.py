@@ -0,0 +1,173 @@
+"""Filtros da barra lateral e recortes de período da manchete"""
+from datetime import timedelta
+
+import pandas as pd
+
+from .particoes import filtrar_mascara, recortar_periodo
+
+# ============================================
+# FILTROS DA BARRA LATERAL
+# ============================================
+# Nome do filtro -> (coluna, valor que significa "sem filtro"), na ordem em que
+# são aplicados: as opções de cada filtro dependem dos filtros anteriores
+FILTROS_SIDEBAR = {
+    'ano': ('Ano', 'Todos os Anos'),
+    'mes': ('Mês', 'Todos os Meses'),
+    'responsavel': ('Responsável_Formatado', 'Todos'),
+    'busca_chamado': ('Chamado', ''),
+    'status': ('Status', 'Todos'),
+    'tipo': ('Tipo_Chamado', 'Todos'),
+    'empresa': ('Empresa', 'Todas'),
+    'sre': ('SRE', 'Todos')
+}
+
+def opcoes_filtro(df, nome):
+    """Opções do selectbox de um filtro: o valor 'todos' seguido dos valores presentes"""
+    coluna, valor_todos = FILTROS_SIDEBAR[nome]
+    if coluna not in df.columns:
+        return []
+
+    valores = df[coluna].dropna().unique()
+    if nome == 'ano':
+        return [valor_todos] + sorted(valores.astype(int))
+    if nome == 'mes':
+        return [valor_todos] + [str(m) for m in sorted(valores.astype(int))]
+    return [valor_todos] + sorted(valores)
+
+def aplicar_filtro(df, nome, valor):
+    """Aplica um único filtro da barra lateral; o valor 'todos' (ou vazio) não filtra"""
+    coluna, valor_todos = FILTROS_SIDEBAR[nome]
+    if valor is None or valor == valor_todos or coluna not in df.columns:
+        return df
+
+    if nome == 'busca_chamado':
+        # Trecho literal, como o instr() do armazém SQLite (não é expressão regular)
+        return filtrar_mascara(df, df['Chamado'].astype(str).str.contains(valor, regex=False, na=False))
+    if nome == 'ano':
+        return recortar_periodo(df, ano=int(valor))
+    if nome == 'mes':
+        return recortar_periodo(df, meses=[int(valor)])
+    return filtrar_mascara(df, df[coluna] == valor)
+
+def aplicar_filtros(df, **filtros):
+    """Aplica a cadeia completa de filtros (ex.: ano=2025, sre='Fulano')"""
+    df = getattr(df, 'df', df)
+    for nome in FILTROS_SIDEBAR:
+        if nome in filtros:
+            df = aplicar_filtro(df, nome, filtros[nome])
+    return df
+
+# ============================================
+# RECORTES DE PERÍODO DA MANCHETE
+# ============================================
+PERIODOS_MANCHETE = [
+    "Mês Atual",
+    "Últimos 30 dias",
+    "Últimos 90 dias",
+    "Este Ano",
+    "Ano Passado",
+    "Todo o Período"
+]
+
+def recortar_periodo_manchete(df, periodo_selecionado, ano_especifico, hoje):
+    """
+    Recorta o período da manchete e o período anterior equivalente.
+    Retorna (df_periodo, titulo, df_anterior, titulo_anterior).
+    """
+    df = getattr(df, 'df', df)
+    df_filtrado_periodo = df.copy()
+    periodo_titulo = ""
+
+    if periodo_selecionado == "Mês Atual":
+        mes_atual = hoje.month
+        ano_atual = hoje.year
+        df_filtrado_periodo = recortar_periodo(df, ano=ano_atual, meses=[mes_atual]).copy()
+        periodo_titulo = f"Mês Atual ({mes_atual:02d}/{ano_atual})"
+
+    elif periodo_selecionado == "Últimos 30 dias":
+        data_limite = hoje - timedelta(days=30)
+        df_filtrado_periodo = df[df['Criado'] >= data_limite].copy()
+        periodo_titulo = "Últimos 30 dias"
+
+    elif periodo_selecionado == "Últimos 90 dias":
+        data_limite = hoje - timedelta(days=90)
+        df_filtrado_periodo = df[df['Criado'] >= data_limite].copy()
+        periodo_titulo = "Últimos 90 dias"
+
+    elif periodo_selecionado == "Este Ano":
+        ano_atual = hoje.year
+        df_filtrado_periodo = recortar_periodo(df, ano=ano_atual).copy()
+        periodo_titulo = f"Este Ano ({ano_atual})"
+
+    elif periodo_selecionado == "Ano Passado":
+        ano_passado = hoje.year - 1
+        df_filtrado_periodo = recortar_periodo(df, ano=ano_passado).copy()
+        periodo_titulo = f"Ano Passado ({ano_passado})"
+
+    elif periodo_selecionado == "Todo o Período":
+        periodo_titulo = "Todo o Período Disponíve"
+
+    elif ano_especifico != 'Selecionar ano...':
+        df_filtrado_periodo = recortar_periodo(df, ano=int(ano_especifico)).copy()
+        periodo_titulo = f"Ano {ano_especifico}"
+
+    df_anterior = pd.DataFrame()
+    periodo_anterior_titulo = ""
+
+    try:
+        if periodo_selecionado == "Mês Atual":
+            mes_anterior = mes_atual - 1 if mes_atual > 1 else 12
+            ano_anterior = ano_atual if mes_atual > 1 else ano_atual - 1
+            df_anterior = recortar_periodo(df, ano=ano_anterior, meses=[mes_anterior]).copy()
+            periodo_anterior_titulo = f"{mes_anterior:02d}/{ano_anterior}"
+
+        elif periodo_selecionado == "Últimos 30 dias":
+            data_inicio_anterior = hoje - timedelta(days=60)
+            data_fim_anterior = hoje - timedelta(days=30)
+            df_anterior = df[(df['Criado'] >= data_inicio_anterior) &
+                            (df['Criado'] < data_fim_anterior)].copy()
+            periodo_anterior_titulo = "30 dias anteriores"
+
+        elif periodo_selecionado == "Últimos 90 dias":
+            data_inicio_anterior = hoje - timedelta(days=180)
+            data_fim_anterior = hoje - timedelta(days=90)
+            df_anterior = df[(df['Criado'] >= data_inicio_anterior) &
+                            (df['Criado'] < data_fim_anterior)].copy()
+            periodo_anterior_titulo = "90 dias anteriores"
+
+        elif periodo_selecionado == "Este Ano":
+            ano_anterior = ano_atual - 1
+            df_anterior = recortar_periodo(df, ano=ano_anterior).copy()
+            periodo_anterior_titulo = f"Ano {ano_anterior}"
+
+        elif periodo_selecionado == "Ano Passado":
+            ano_anterior_2 = ano_passado - 1
+            df_anterior = recortar_periodo(df, ano=ano_anterior_2).copy()
+            periodo_anterior_titulo = f"Ano {ano_anterior_2}"
+
+    except Exception:
+        df_anterior = pd.DataFrame()
+
+    return df_filtrado_periodo, periodo_titulo, df_anterior, periodo_anterior_titulo
+
+def calcular_kpis_periodo(df):
+    """Totais da manchete: cards, validados, com/sem erro e taxas"""
+    df = getattr(df, 'df', df)
+    if df.empty:
+        return {
+            'total_cards': 0, 'validados': 0, 'com_erro': 0, 'sem_erro': 0,
+            'taxa_sucesso': 0, 'taxa_erro': 0
+        }
+
+    total_cards = len(df)
+    validados = len(df[df['Status'] == 'Sincronizado'])
+    com_erro = len(df[df['Revisões'] > 0])
+
+    return {
+        'total_cards': total_cards,
+        'validados': validados,
+        'com_erro': com_erro,
+        'sem_erro': validados - com_erro,
+        'taxa_sucesso': (validados / total_cards * 100) if total_cards > 0 else 0,
+        'taxa_erro': (com_erro / validados * 100) if validados > 0 else 0
+    }
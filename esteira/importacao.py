@@ -0,0 +1,83 @@
+"""Importação sob demanda de módulos pesados e perfil de custo das importações"""
+import re
+import sys
+import time
+import threading
+import importlib
+import subprocess
+
+# ============================================
+# IMPORTAÇÃO SOB DEMANDA
+# ============================================
+# Módulo -> milissegundos gastos na primeira importação feita por este processo
+TEMPOS_IMPORTACAO = {}
+_lock_tempos = threading.Lock()
+
+def importar_medindo(nome):
+    """Importa o módulo e registra o tempo gasto se ele ainda não estava carregado"""
+    ja_carregado = nome in sys.modules
+    inicio = time.perf_counter()
+    # import_module espera caso outra thread esteja no meio da mesma importação
+    modulo = importlib.import_module(nome)
+    if not ja_carregado:
+        decorrido = (time.perf_counter() - inicio) * 1000
+        with _lock_tempos:
+            TEMPOS_IMPORTACAO.setdefault(nome, decorrido)
+    return modulo
+
+class ModuloSobDemanda:
+    """Representante de um módulo que só é importado no primeiro acesso a um atributo"""
+
+    def __init__(self, nome):
+        object.__setattr__(self, '_nome', nome)
+        object.__setattr__(self, '_modulo', None)
+
+    def _carregar(self):
+        if self._modulo is None:
+            object.__setattr__(self, '_modulo', importar_medindo(self._nome))
+        return self._modulo
+
+    @property
+    def carregado(self):
+        return self._modulo is not None or self._nome in sys.modules
+
+    def __getattr__(self, atributo):
+        return getattr(self._carregar(), atributo)
+
+    def __repr__(self):
+        estado = 'carregado' if self.carregado else 'pendente'
+        return f"<módulo sob demanda '{self._nome}' ({estado})>"
+
+def importar_sob_demanda(nome):
+    """Ex.: px = importar_sob_demanda('plotly.express') — importa só no primeiro px.bar(...)"""
+    return ModuloSobDemanda(nome)
+
+# ============================================
+# PERFIL DE IMPORTAÇÃO (python -X importtime)
+# ============================================
+_LINHA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def perfil_importacoes(modulos):
+    """
+    Custo de importação de cada módulo num interpretador limpo.
+    Retorna uma lista de dicts (modulo, proprio_ms, acumulado_ms, nivel),
+    na ordem do -X importtime; nivel 0 = importado diretamente.
+    """
+    comando = '; '.join(f"import {m}" for m in modulos)
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', comando],
+        capture_output=True, text=True, timeout=120
+    )
+
+    linhas = []
+    for linha in resultado.stderr.splitlines():
+        encontrado = _LINHA_IMPORTTIME.match(linha)
+        if encontrado:
+            proprio, acumulado, recuo, modulo = encontrado.groups()
+            linhas.append({
+                'modulo': modulo,
+                'proprio_ms': int(proprio) / 1000,
+                'acumulado_ms': int(acumulado) / 1000,
+                'nivel': (len(recuo) - 1) // 2
+            })
+    return linhas
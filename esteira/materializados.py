@@ -0,0 +1,336 @@
+"""
+Agregados materializados por mês (partição Ano, Mês) da base.
+
+Meses fechados não mudam: o resumo de cada um (contagens por status, SRE,
+empresa e tipo, revisões, vetores diários e componentes do IPE) é calculado uma
+vez, gravado em disco e reaproveitado nas recargas seguintes. Só o mês aberto
+(e algum mês fechado que tenha mudado) é resumido de novo, e os agregados das
+abas são montados somando os resumos.
+"""
+import os
+import glob
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .constantes import NOMES_MESES, NOMES_MESES_COMPLETOS
+from .analises import calcular_ipe, mascara_retorno_sim, substituir_nome_sre
+from .particoes import IndiceParticoes, indice_particoes, mes_fechado
+from .motivos import CATEGORIAS_REVISAO, SEM_MOTIVO, rotular_categorias
+
+# Incrementar sempre que o conteúdo dos resumos mudar de forma incompatível
+VERSAO_MATERIALIZADOS = 3
+
+# Chave do resumo das linhas sem Criado (fora de qualquer partição Ano, Mês);
+# só entra nos agregados de todo o período, como em esteira.analises
+SEM_DATA = (0, 0)
+
+# ============================================
+# RESUMO DE UM MÊS
+# ============================================
+def resumir_mes(df_mes):
+    """Componentes de um mês dos quais os agregados mensais das abas são montados"""
+    sincronizado = df_mes['Status'] == 'Sincronizado'
+    df_sinc = df_mes[sincronizado]
+    df_rev = df_mes[df_mes['Revisões'] > 0]
+
+    return {
+        'linhas': len(df_mes),
+        'por_status': df_mes.groupby('Status').size(),
+        'por_sre': df_mes.groupby('SRE').size(),
+        'por_empresa': df_mes.groupby('Empresa').size(),
+        'por_tipo': df_mes.groupby('Tipo_Chamado').size(),
+        'sincronizados_por_sre': df_sinc.groupby('SRE').size(),
+        'revisoes': int(df_mes['Revisões'].sum()),
+        'revisoes_por_responsavel': df_rev.groupby('Responsável_Formatado').agg(
+            Total_Revisões=('Revisões', 'sum'), Chamados_Com_Revisão=('Chamado', 'count')),
+        'revisoes_por_categoria': _revisoes_por_categoria_mes(df_rev),
+        'por_dia': df_mes.groupby(df_mes['Criado'].dt.date).size(),
+        'sincronizados_por_dia': df_sinc.groupby(df_sinc['Criado'].dt.date).size(),
+        'ipe': {
+            'cd': len(df_mes),
+            'ca': int(sincronizado.sum()),
+            'cr': int(mascara_retorno_sim(df_mes['Retorno_Cliente']).sum()),
+            'sres': frozenset(df_mes['SRE'].dropna().unique())
+        }
+    }
+
+def _revisoes_por_categoria_mes(df_rev):
+    if 'Categoria_Revisao' not in df_rev.columns:
+        return pd.DataFrame()
+    categorias = rotular_categorias(df_rev['Categoria_Revisao']).astype(str)
+    return df_rev.groupby(categorias).agg(
+        Total_Revisões=('Revisões', 'sum'), Chamados_Com_Revisão=('Chamado', 'count'))
+
+def _assinatura(posicoes, modificado):
+    """Linhas e Modificado mais recente da partição: muda se um cartão do mês for alterado"""
+    if modificado is None or len(posicoes) == 0:
+        return (len(posicoes), None)
+    return (len(posicoes), str(modificado[posicoes].max()))
+
+# ============================================
+# ARMAZÉM DE RESUMOS MENSAIS
+# ============================================
+def caminho_materializados_padrao(caminho_fonte):
+    """data/esteira_demandas.csv -> data/esteira_demandas.mensal.pkl; data/exports -> data/exports.mensal.pkl"""
+    base = caminho_fonte.rstrip('/\\')
+    if glob.has_magic(base):
+        base = os.path.join(os.path.dirname(base), 'exports')
+    return os.path.splitext(base)[0] + '.mensal.pkl'
+
+class AgregadosMensais:
+    """
+    Resumos mensais da base. Os de meses fechados ficam materializados (em
+    memória e, com `caminho`, em disco) e valem enquanto a assinatura da
+    partição não mudar; o mês aberto é sempre resumido de novo.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self._fechados = {}
+        self._lock = threading.Lock()
+        self.reaproveitados = 0
+        self.recalculados = 0
+        if caminho:
+            self._ler()
+
+    def _ler(self):
+        try:
+            with open(self.caminho, 'rb') as f:
+                conteudo = pickle.load(f)
+        except Exception:
+            # Ausente ou ilegível: os meses fechados são resumidos de novo
+            return
+        if (conteudo.get('versao_formato') == VERSAO_MATERIALIZADOS
+                and conteudo.get('versao_pandas') == pd.__version__):
+            self._fechados = conteudo['meses']
+
+    def _gravar(self):
+        conteudo = {
+            'versao_formato': VERSAO_MATERIALIZADOS,
+            'versao_pandas': pd.__version__,
+            'meses': dict(self._fechados)
+        }
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, self.caminho)
+
+    def resumos(self, df, hoje=None):
+        """
+        (Ano, Mês) -> resumo de todas as partições da base; só o que mudou é
+        recalculado. As linhas sem data ficam em SEM_DATA, sempre recalculado.
+        """
+        indice = indice_particoes(df) or IndiceParticoes.da_base(df)
+        modificado = df['Modificado'].to_numpy() if 'Modificado' in df.columns else None
+
+        resumos, novos = {}, False
+        with self._lock:
+            for chave, posicoes in indice.particoes.items():
+                assinatura = _assinatura(posicoes, modificado)
+                fechado = mes_fechado(*chave, hoje=hoje)
+                guardado = self._fechados.get(chave) if fechado else None
+                if guardado is not None and guardado[0] == assinatura:
+                    resumos[chave] = guardado[1]
+                    self.reaproveitados += 1
+                    continue
+
+                resumos[chave] = resumir_mes(df.take(posicoes))
+                self.recalculados += 1
+                if fechado:
+                    self._fechados[chave] = (assinatura, resumos[chave])
+                    novos = True
+
+            # Linhas com Criado vazio não caem em partição nenhuma
+            sem_data = np.ones(len(df), dtype=bool)
+            for posicoes in indice.particoes.values():
+                sem_data[posicoes] = False
+            if sem_data.any():
+                resumos[SEM_DATA] = resumir_mes(df.take(np.flatnonzero(sem_data)))
+                self.recalculados += 1
+
+            if novos and self.caminho:
+                try:
+                    self._gravar()
+                except OSError:
+                    # Sem permissão de escrita: segue só com a cópia em memória
+                    pass
+        return resumos
+
+# ============================================
+# AGREGADOS A PARTIR DOS RESUMOS (MESMO RESULTADO DE esteira.analises)
+# ============================================
+def _selecionar(resumos, ano=None, meses=None, sem_data=False):
+    """
+    Resumos do ano/meses pedidos (None = todos), em ordem cronológica. Com
+    sem_data=True, o período todo inclui também as linhas sem data (no fim).
+    """
+    selecionados = [
+        (chave, resumos[chave]) for chave in sorted(resumos)
+        if chave != SEM_DATA and (ano is None or chave[0] == int(ano)) and (meses is None or chave[1] in meses)
+    ]
+    if sem_data and ano is None and meses is None and SEM_DATA in resumos:
+        selecionados.append((SEM_DATA, resumos[SEM_DATA]))
+    return selecionados
+
+def evolucao_mensal(resumos, ano):
+    selecionados = _selecionar(resumos, ano=ano)
+    if not selecionados:
+        return pd.DataFrame()
+
+    demandas_por_mes = pd.DataFrame({
+        'Mês_Num': np.array([mes for (_, mes), _ in selecionados], dtype=np.int32),
+        'Quantidade': [resumo['linhas'] for _, resumo in selecionados]
+    })
+    todos_meses = pd.DataFrame({'Mês_Num': range(1, 13), 'Nome_Mês': list(NOMES_MESES.values())})
+    demandas_completas = pd.merge(todos_meses, demandas_por_mes, on='Mês_Num', how='left')
+    demandas_completas['Quantidade'] = demandas_completas['Quantidade'].fillna(0).astype(int)
+    return demandas_completas
+
+def sazonalidade_mensal(resumos, ano='Todos os Anos'):
+    selecionados = _selecionar(resumos, ano=None if ano == 'Todos os Anos' else ano)
+    if not selecionados:
+        return pd.DataFrame()
+
+    total, sincronizados = np.zeros(12, dtype=int), np.zeros(12, dtype=int)
+    for (_, mes), resumo in selecionados:
+        total[mes - 1] += resumo['linhas']
+        sincronizados[mes - 1] += resumo['por_status'].get('Sincronizado', 0)
+
+    dados_mes = pd.DataFrame({
+        'Mês': list(NOMES_MESES.values()),
+        'Total': total,
+        'Sincronizados': sincronizados
+    })
+    dados_mes['Taxa_Sinc'] = (dados_mes['Sincronizados'] / dados_mes['Total'] * 100).where(dados_mes['Total'] > 0, 0).round(1)
+    return dados_mes
+
+def revisoes_por_responsavel(resumos, ano='Todos os Anos', mes='Todos os Meses'):
+    selecionados = _selecionar(
+        resumos,
+        ano=None if ano == 'Todos os Anos' else ano,
+        meses=None if mes == 'Todos os Meses' else {int(mes)},
+        sem_data=True
+    )
+    partes = [resumo['revisoes_por_responsavel'] for _, resumo in selecionados
+              if not resumo['revisoes_por_responsavel'].empty]
+    if not partes:
+        return pd.DataFrame()
+
+    revisoes = pd.concat(partes).groupby(level=0).sum().reset_index()
+    revisoes.columns = ['Responsável', 'Total_Revisões', 'Chamados_Com_Revisão']
+    return revisoes.sort_values('Total_Revisões', ascending=False)
+
+def revisoes_por_categoria(resumos, ano='Todos os Anos', mes='Todos os Meses'):
+    selecionados = _selecionar(
+        resumos,
+        ano=None if ano == 'Todos os Anos' else ano,
+        meses=None if mes == 'Todos os Meses' else {int(mes)},
+        sem_data=True
+    )
+    partes = [resumo['revisoes_por_categoria'] for _, resumo in selecionados
+              if not resumo['revisoes_por_categoria'].empty]
+    if not partes:
+        return pd.DataFrame()
+
+    revisoes = pd.concat(partes).groupby(level=0).sum()
+    ordem = [categoria for categoria in CATEGORIAS_REVISAO + [SEM_MOTIVO] if categoria in revisoes.index]
+    revisoes = revisoes.reindex(ordem).reset_index()
+    revisoes.columns = ['Categoria', 'Total_Revisões', 'Chamados_Com_Revisão']
+    return revisoes.sort_values('Total_Revisões', ascending=False, kind='stable').reset_index(drop=True)
+
+def sincronizados_por_sre(resumos, ano='Todos', mes='Todos'):
+    selecionados = _selecionar(
+        resumos,
+        ano=None if ano == 'Todos' else ano,
+        meses=None if mes == 'Todos' else {int(mes)},
+        sem_data=True
+    )
+    partes = [resumo['sincronizados_por_sre'] for _, resumo in selecionados]
+    if partes:
+        por_sre = pd.concat(partes).groupby(level=0).sum()
+    else:
+        por_sre = pd.Series(dtype='int64', index=pd.Index([], dtype='str'))
+
+    sinc_por_sre = pd.DataFrame({'SRE': por_sre.index, 'Sincronizados': por_sre.values})
+    sinc_por_sre['SRE_Nome'] = sinc_por_sre['SRE'].apply(substituir_nome_sre)
+    sinc_por_sre_nome = sinc_por_sre.groupby('SRE_Nome')['Sincronizados'].sum().reset_index()
+    return sinc_por_sre_nome.sort_values('Sincronizados', ascending=False)
+
+def sincronizacoes_por_dia(resumos, ano='Todos os Anos', mes='Todos os Meses'):
+    selecionados = _selecionar(
+        resumos,
+        ano=None if ano == 'Todos os Anos' else ano,
+        meses=None if mes == 'Todos os Meses' else {int(mes)}
+    )
+    partes = [resumo['sincronizados_por_dia'] for _, resumo in selecionados]
+    if not partes:
+        partes = [pd.Series(dtype='int64', index=pd.Index([], dtype=object))]
+
+    sinc_por_dia = pd.concat(partes).reset_index()
+    sinc_por_dia.columns = ['Data', 'Quantidade']
+    return sinc_por_dia
+
+def tendencia_percentis(resumos, ano='Todos os Anos', mes='Todos os Meses', percentil=75):
+    selecionados = _selecionar(
+        resumos,
+        ano=None if ano == 'Todos os Anos' else ano,
+        meses=None if mes == 'Todos os Meses' else {int(mes)}
+    )
+
+    dados_tendencia = []
+    for (ano_mes, mes_num), resumo in selecionados:
+        valores_mes = resumo['sincronizados_por_dia']
+        if not valores_mes.empty:
+            inicio_mes = pd.Timestamp(ano_mes, mes_num, 1)
+            dados_tendencia.append({
+                'Mês': inicio_mes.strftime('%Y-%m'),
+                'Mês_Label': inicio_mes.strftime('%b/%Y'),
+                'P25': valores_mes.quantile(0.25),
+                'P50': valores_mes.quantile(0.50),
+                f'P{percentil}': valores_mes.quantile(percentil/100),
+                'P90': valores_mes.quantile(0.90),
+                'Média': valores_mes.mean(),
+                'Total': int(valores_mes.sum())
+            })
+
+    return pd.DataFrame(dados_tendencia)
+
+def ipe_acumulado(resumos, ano='Todos', meses=()):
+    selecionados = _selecionar(resumos, ano=None if ano == 'Todos' else ano, meses=set(meses) or None)
+
+    acumulados = []
+    cd_acum = ca_acum = cr_acum = 0
+    sres = set()
+    for (_, mes), resumo in selecionados:
+        cd_acum += resumo['ipe']['cd']
+        ca_acum += resumo['ipe']['ca']
+        cr_acum += resumo['ipe']['cr']
+        sres |= resumo['ipe']['sres']
+        na_acum = len(sres)
+
+        ipe_acum = calcular_ipe(ca_acum, cr_acum, cd_acum, cd_acum, na_acum)
+        acumulados.append({
+            'Mês': NOMES_MESES_COMPLETOS[mes],
+            'CD_Acum': cd_acum,
+            'CA_Acum': ca_acum,
+            'CR_Acum': cr_acum,
+            'NA_Acum': na_acum,
+            'IPE Acumulado (%)': round(ipe_acum * 100, 2)
+        })
+
+    return pd.DataFrame(acumulados)
+
+# Nome do agregado (como em esteira.snapshot.AGREGADOS) -> versão montada dos resumos
+AGREGADOS_MENSAIS = {
+    'evolucao_mensal': evolucao_mensal,
+    'revisoes_por_responsavel': revisoes_por_responsavel,
+    'revisoes_por_categoria': revisoes_por_categoria,
+    'sincronizados_por_sre': sincronizados_por_sre,
+    'sazonalidade_mensal': sazonalidade_mensal,
+    'sincronizacoes_por_dia': sincronizacoes_por_dia,
+    'tendencia_percentis': tendencia_percentis,
+    'ipe_acumulado': ipe_acumulado,
+}
@@ -0,0 +1,196 @@
+"""
+Contabilidade de memória: DataFrames guardados por sessão, caches do processo,
+RSS e liberação das sessões ociosas acima de um limite brando.
+
+As sessões são registradas pelo id de cada uma com o estado dela (o
+SessionState da sessão do Streamlit, que dura enquanto ela estiver conectada, e
+não o invólucro de cada execução; ou qualquer mapeamento). O estado fica
+guardado até a função `ativa` dizer que a sessão se desconectou.
+"""
+import sys
+import time
+import weakref
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from .cache import medir_bytes
+
+# ============================================
+# MEDIÇÕES
+# ============================================
+def rss_processo(pid=None):
+    """
+    Memória residente do processo (o atual ou `pid`) em bytes: psutil, /proc
+    no Linux ou, só para o atual, o pico via resource. None se não der para medir.
+    """
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except psutil.Error:
+        return None
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid is not None:
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+# id do objeto -> (referência fraca, bytes): memory_usage(deep=True) percorre
+# todas as strings, então cada DataFrame (imutável no painel) é medido uma vez
+_MEDIDAS = {}
+_lock_medidas = threading.Lock()
+
+def medir_objeto(valor):
+    """medir_bytes memorizado por objeto para DataFrames e Séries"""
+    if not isinstance(valor, (pd.DataFrame, pd.Series)):
+        return medir_bytes(valor)
+    chave = id(valor)
+    with _lock_medidas:
+        registro = _MEDIDAS.get(chave)
+    if registro is not None and registro[0]() is valor:
+        return registro[1]
+
+    tamanho = medir_bytes(valor)
+    def _remover(_ref, chave=chave):
+        with _lock_medidas:
+            if chave in _MEDIDAS and _MEDIDAS[chave][0] is _ref:
+                del _MEDIDAS[chave]
+    with _lock_medidas:
+        _MEDIDAS[chave] = (weakref.ref(valor, _remover), tamanho)
+    return tamanho
+
+def _contem_dados(valor):
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return True
+    return isinstance(valor, dict) and any(isinstance(v, (pd.DataFrame, pd.Series)) for v in valor.values())
+
+def itens_memoria(estado):
+    """DataFrames (e dicts de DataFrames, como os agregados) guardados num estado de sessão"""
+    valores = estado.filtered_state if hasattr(estado, 'filtered_state') else dict(estado)
+    itens = []
+    for chave, valor in valores.items():
+        if not _contem_dados(valor):
+            continue
+        if isinstance(valor, dict):
+            tamanho = sum(medir_objeto(v) for v in valor.values())
+            tipo, linhas = f'dict ({len(valor)})', None
+        else:
+            tamanho = medir_objeto(valor)
+            tipo, linhas = type(valor).__name__, len(valor)
+        itens.append({'chave': chave, 'tipo': tipo, 'linhas': linhas, 'bytes': tamanho, 'id': id(valor)})
+    return itens
+
+def memoria_caches(caches):
+    """Bytes, entradas e contadores de cada CacheLRU (nome -> cache)"""
+    return [
+        {
+            'cache': nome, 'entradas': len(cache), 'bytes': cache.bytes_em_uso(),
+            'limite_bytes': cache.max_bytes, 'acertos': cache.acertos,
+            'falhas': cache.falhas, 'descartes': cache.descartes
+        }
+        for nome, cache in caches.items()
+    ]
+
+# ============================================
+# REGISTRO DE SESSÕES
+# ============================================
+class RegistroSessoes:
+    """
+    Sessões do processo e o último acesso de cada uma. `ativa(id_runtime)`
+    diz se a sessão (pelo id dela no runtime do Streamlit) ainda está
+    conectada; as que não estão saem do registro.
+    """
+
+    def __init__(self, ativa=None):
+        self._sessoes = {}
+        # Reentrante: a liberação escreve no estado com o registro travado
+        self._lock = threading.RLock()
+        self.ativa = ativa
+        self.liberadas = 0
+
+    def tocar(self, id_sessao, estado, id_runtime=None):
+        """
+        Registra o acesso da sessão (no início e no fim de cada execução). Espera
+        uma liberação em andamento terminar, então uma execução nova nunca lê o
+        estado no meio dela.
+        """
+        with self._lock:
+            self._sessoes[id_sessao] = (estado, time.time(), id_runtime or id_sessao)
+
+    def sessoes(self):
+        """[(id, estado, segundos ociosa)] das sessões conectadas, da mais ociosa para a menos"""
+        agora = time.time()
+        with self._lock:
+            if self.ativa is not None:
+                for id_sessao in [i for i, (_, _, id_runtime) in self._sessoes.items() if not self.ativa(id_runtime)]:
+                    del self._sessoes[id_sessao]
+            vivas = [(id_sessao, estado, agora - acesso) for id_sessao, (estado, acesso, _) in self._sessoes.items()]
+        return sorted(vivas, key=lambda s: -s[2])
+
+    def relatorio(self, caches=None):
+        """Memória por sessão (exclusiva x compartilhada com outras sessões), caches e RSS"""
+        sessoes = [(id_sessao, ociosa, itens_memoria(estado)) for id_sessao, estado, ociosa in self.sessoes()]
+        referencias = {}
+        for _, _, itens in sessoes:
+            for item in itens:
+                referencias[item['id']] = referencias.get(item['id'], 0) + 1
+
+        linhas_sessoes = []
+        for id_sessao, ociosa, itens in sessoes:
+            for item in itens:
+                item['compartilhado'] = referencias[item['id']] > 1
+            linhas_sessoes.append({
+                'sessao': id_sessao,
+                'ociosa_s': round(ociosa),
+                'dataframes': len(itens),
+                'bytes_exclusivos': sum(i['bytes'] for i in itens if not i['compartilhado']),
+                'bytes_compartilhados': sum(i['bytes'] for i in itens if i['compartilhado']),
+                'itens': [{k: v for k, v in i.items() if k != 'id'} for i in itens]
+            })
+
+        return {
+            'em': datetime.now().isoformat(timespec='seconds'),
+            'rss_bytes': rss_processo(),
+            'sessoes': linhas_sessoes,
+            'caches': memoria_caches(caches or {}),
+            'sessoes_liberadas': self.liberadas
+        }
+
+    def liberar_ociosas(self, ociosa_s, liberar, limite_bytes=None, rss=rss_processo):
+        """
+        Com o RSS acima de `limite_bytes` (ou sempre, sem limite), chama
+        `liberar(estado)` para cada sessão ociosa há mais de `ociosa_s`
+        segundos, com o registro travado e o acesso conferido de novo (a sessão
+        pode ter voltado a executar). Devolve os ids liberados.
+        """
+        if limite_bytes is not None:
+            atual = rss()
+            if atual is None or atual <= limite_bytes:
+                return []
+
+        liberadas = []
+        for id_sessao, estado, ociosa in self.sessoes():
+            if ociosa < ociosa_s:
+                break
+            with self._lock:
+                registro = self._sessoes.get(id_sessao)
+                if registro is None or registro[0] is not estado or time.time() - registro[1] < ociosa_s:
+                    continue
+                if liberar(estado):
+                    liberadas.append(id_sessao)
+        with self._lock:
+            self.liberadas += len(liberadas)
+        return liberadas
@@ -0,0 +1,155 @@
+"""Monitor único por processo do arquivo de dados local"""
+import os
+import glob
+import time
+import fnmatch
+import threading
+from collections import namedtuple
+
+from .dados import assinatura_origem, calcular_hash_origem, encontrar_arquivo_dados
+
+# Estado publicado pelo monitor; substituído por inteiro a cada mudança, então
+# quem lê `monitor.estado` sempre vê caminho, versão e impressão digital coerentes
+EstadoArquivo = namedtuple('EstadoArquivo', ['caminho', 'versao', 'md5', 'tamanho', 'mtime', 'verificado_em'])
+
+ESTADO_VAZIO = EstadoArquivo(None, 0, None, None, None, None)
+
+# ============================================
+# MONITOR DO ARQUIVO DE DADOS
+# ============================================
+class MonitorArquivo:
+    """
+    Thread em segundo plano que acompanha o arquivo de dados e publica uma
+    versão: incrementada só quando o conteúdo (MD5) muda. As sessões guardam a
+    versão que carregaram e comparam com `monitor.versao`, sem tocar no disco.
+
+    Usa os eventos do sistema de arquivos (watchdog/inotify) quando disponíveis
+    para reagir na hora; a varredura periódica continua como rede de segurança.
+    """
+
+    def __init__(self, localizar=encontrar_arquivo_dados, intervalo=2.0, intervalo_com_eventos=30.0):
+        self._localizar = localizar
+        self.intervalo = intervalo
+        self.intervalo_com_eventos = intervalo_com_eventos
+        self.estado = ESTADO_VAZIO
+        self._assinatura = None
+        self._observador = None
+        self._inscritos = []
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name='monitor-arquivo', daemon=True)
+
+    @property
+    def versao(self):
+        return self.estado.versao
+
+    @property
+    def caminho(self):
+        return self.estado.caminho
+
+    @property
+    def usa_eventos(self):
+        return self._observador is not None
+
+    def iniciar(self):
+        """Faz a primeira verificação (síncrona) e inicia a thread"""
+        self.verificar()
+        self._observar_eventos()
+        self._thread.start()
+        return self
+
+    def inscrever(self, funcao):
+        """funcao(estado) é chamada (na thread de quem verificou) a cada nova versão"""
+        self._inscritos.append(funcao)
+
+    def parar(self):
+        self._parar.set()
+        self._acordar.set()
+        if self._observador is not None:
+            self._observador.stop()
+
+    def verificar(self):
+        """Compara tamanho/mtime e, se mudaram, recalcula o MD5; devolve o estado publicado"""
+        with self._lock:
+            anterior = self.estado
+            estado = self._verificar()
+        if estado.versao != anterior.versao and anterior.versao > 0:
+            for funcao in list(self._inscritos):
+                funcao(estado)
+        return estado
+
+    def _verificar(self):
+        caminho = self.estado.caminho
+        if not caminho or not os.path.exists(caminho):
+            caminho = self._localizar()
+        if caminho is None:
+            return self.estado
+
+        # Arquivo único ou diretório de exports: tamanho/mtime de cada CSV
+        try:
+            assinatura = assinatura_origem(caminho)
+        except OSError:
+            return self.estado
+
+        if assinatura == self._assinatura:
+            return self.estado
+
+        try:
+            md5 = calcular_hash_origem(caminho)
+        except OSError:
+            return self.estado
+        self._assinatura = assinatura
+
+        atual = self.estado
+        versao = atual.versao + 1 if md5 != atual.md5 or caminho != atual.caminho else atual.versao
+        tamanho = sum(t for _, t, _ in assinatura)
+        mtime = max(m for _, _, m in assinatura) / 1e9
+        self.estado = EstadoArquivo(caminho, versao, md5, tamanho, mtime, time.time())
+        return self.estado
+
+    def _executar(self):
+        while not self._parar.is_set():
+            self._acordar.wait(self.intervalo_com_eventos if self.usa_eventos else self.intervalo)
+            self._acordar.clear()
+            if self._parar.is_set():
+                break
+            try:
+                self.verificar()
+            except Exception:
+                # O monitor nunca pode derrubar o processo; tenta de novo no próximo ciclo
+                pass
+
+    def _observar_eventos(self):
+        """Inscreve o diretório dos dados no watchdog (inotify no Linux), se instalado"""
+        if self.estado.caminho is None:
+            return
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return
+
+        alvo = os.path.abspath(self.estado.caminho)
+        if os.path.isdir(alvo):
+            diretorio, relevante = alvo, lambda c: os.path.dirname(c) == alvo and c.endswith('.csv')
+        elif glob.has_magic(alvo):
+            diretorio, relevante = os.path.dirname(alvo), lambda c: fnmatch.fnmatch(c, alvo)
+        else:
+            diretorio, relevante = os.path.dirname(alvo), lambda c: c == alvo
+        acordar = self._acordar
+
+        class AoAlterar(FileSystemEventHandler):
+            def on_any_event(self, evento):
+                caminhos = {getattr(evento, 'src_path', None), getattr(evento, 'dest_path', None)}
+                if any(relevante(os.path.abspath(c)) for c in caminhos if c):
+                    acordar.set()
+
+        try:
+            observador = Observer()
+            observador.daemon = True
+            observador.schedule(AoAlterar(), diretorio, recursive=False)
+            observador.start()
+        except Exception:
+            return
+        self._observador = observador
@@ -0,0 +1,99 @@
+"""
+Classificação dos motivos de revisão (Motivo Revisão, texto livre) em
+categorias por regras de palavras-chave. Cada texto distinto é normalizado
+(minúsculas, sem acentos, espaços únicos) e classificado uma única vez; o
+resultado fica memorizado pelo hash do texto normalizado, de modo que uma
+nova importação só classifica os textos que ainda não tinham aparecido.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .textos import normalizar_textos
+
+# Categoria -> expressão regular sobre o texto normalizado. A ordem é a
+# prioridade: vale a primeira categoria cuja expressão aparece no texto.
+REGRAS_CATEGORIA = {
+    'Retrofit': r'\bretrofit',
+    'Coordenadas': r'coordenada',
+    'Pontos e sinais': r'\bpontos?\b|\bsina(l|is)\b|analogic|alarme|discretas|databasetag|dabasetag|\btags?\b',
+    'Descrição do equipamento': r'descric|denominac|nomenclatura|fabricante|modelo do equipamento|\bname\b'
+                                r'|nome d[oa]s? (equipamento|objeto|subestacao)',
+    'Comunicação e RTU': r'\bip\b|gprs|\bportas?\b|\brtu\b|unidade remota|\bremota\b|driver|comunicac'
+                         r'|\bclass\b|mensage|\bslave\b|\bmaster\b|endereco|enderecamento',
+    'Topologia e conectividade': r'conectividade|topolog|modelador|modelagem|\bbays?\b|circuito|by-?pass'
+                                 r'|aterramento|propriedades eletricas|\baor\b|excluid|remocao|existente na base',
+    'Tela e diagrama': r'\btelas?\b|unifilar|esquematica|sinotico|diagrama|\bpvi\b|\bpcmc\b|\bprj\b|projeto'
+                       r'|elipse|\bdjp\b|associac|quadro|objetos',
+    'Changeset': r'changeset|\bcs\b|\bsc\b|draft|elixs|\badms\b',
+    'Chamado e card': r'chamad|\bcard\b|solicitac|solicitado|atendimento|proprietario|informac',
+    'Desenvolvimento': r'desenvolv|incomplet|imcomplet|falt(a|ou)|migracao|sincronismo|alinha|inconsistencia'
+                       r'|inconformidade|padrao|errad|incorret|revisa',
+}
+CATEGORIA_OUTROS = 'Outros'
+CATEGORIAS_REVISAO = list(REGRAS_CATEGORIA) + [CATEGORIA_OUTROS]
+
+# Rótulo dos cartões revisados sem motivo preenchido, nos agregados
+SEM_MOTIVO = 'Sem motivo informado'
+
+# Hash do texto normalizado -> código da categoria (posição em CATEGORIAS_REVISAO)
+_memo = pd.Series(dtype='int8', index=pd.Index([], dtype='uint64'))
+_memo_lock = threading.Lock()
+
+def normalizar_motivos(textos):
+    """Textos normalizados para classificação: sem acentos, minúsculas e espaços únicos"""
+    return normalizar_textos(textos).str.replace(r'\s+', ' ', regex=True).str.strip()
+
+def classificar_textos(normalizados):
+    """Código da categoria de cada texto normalizado (a primeira regra que casa; senão Outros)"""
+    normalizados = pd.Series(normalizados, dtype='string').fillna('')
+    if normalizados.empty:
+        return np.array([], dtype='int8')
+    casamentos = [normalizados.str.contains(regra, regex=True).to_numpy(dtype=bool)
+                  for regra in REGRAS_CATEGORIA.values()]
+    return np.select(casamentos, np.arange(len(REGRAS_CATEGORIA)), default=len(REGRAS_CATEGORIA)).astype('int8')
+
+def classificar_motivos(motivos):
+    """
+    Categoria_Revisao (categórica, na ordem de CATEGORIAS_REVISAO) de cada
+    motivo; vazia onde não há texto. Só os textos distintos ainda não
+    memorizados passam pelas regras.
+    """
+    global _memo
+    codigos, textos = pd.factorize(motivos)
+    normalizados = normalizar_motivos(textos)
+    com_texto = normalizados.ne('').fillna(False).to_numpy(dtype=bool)
+    hashes = pd.util.hash_array(normalizados.fillna('').to_numpy(dtype=object))
+
+    memo = _memo
+    categoria_texto = memo.reindex(hashes).to_numpy(dtype='float64', copy=True)
+    novos = np.flatnonzero(np.isnan(categoria_texto) & com_texto)
+    if len(novos):
+        classificados = classificar_textos(normalizados.iloc[novos])
+        categoria_texto[novos] = classificados
+        novos_hashes = pd.Index(hashes[novos])
+        with _memo_lock:
+            acrescimo = pd.Series(classificados, index=novos_hashes).groupby(level=0).first()
+            acrescimo = acrescimo[~acrescimo.index.isin(_memo.index)]
+            _memo = pd.concat([_memo, acrescimo]).astype('int8')
+
+    # Código -1 (sem texto) cai na última posição, acrescentada como categoria vazia
+    categoria_texto = np.append(np.where(com_texto, np.nan_to_num(categoria_texto, nan=-1), -1), -1).astype('int64')
+    return pd.Series(
+        pd.Categorical.from_codes(categoria_texto[codigos], categories=CATEGORIAS_REVISAO),
+        index=getattr(motivos, 'index', None), name='Categoria_Revisao'
+    )
+
+def textos_memorizados():
+    """Quantidade de textos normalizados distintos já classificados no processo"""
+    return len(_memo)
+
+def rotular_categorias(categorias):
+    """Categorias com SEM_MOTIVO no lugar das vazias (para agrupar os cartões revisados)"""
+    categorias = pd.Series(categorias)
+    if not isinstance(categorias.dtype, pd.CategoricalDtype):
+        categorias = categorias.astype(pd.CategoricalDtype(CATEGORIAS_REVISAO))
+    if SEM_MOTIVO not in categorias.cat.categories:
+        categorias = categorias.cat.add_categories(SEM_MOTIVO)
+    return categorias.fillna(SEM_MOTIVO)
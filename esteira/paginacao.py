@@ -0,0 +1,58 @@
+"""Paginação das Últimas Demandas com seleção parcial (top-k)"""
+import numpy as np
+import pandas as pd
+
+# ============================================
+# PAGINAÇÃO DAS ÚLTIMAS DEMANDAS
+# ============================================
+# Coluna exibida -> (coluna de origem, rótulo na tabela), na ordem de exibição
+COLUNAS_ULTIMAS_DEMANDAS = {
+    'Chamado': ('Chamado', 'Chamado'),
+    'Tipo_Chamado': ('Tipo_Chamado', 'Tipo'),
+    'Responsável': ('Responsável', 'Responsável'),
+    'Responsável_Formatado': ('Responsável_Formatado', 'Responsável Formatado'),
+    'Status': ('Status', 'Status'),
+    'Prioridade': ('Prioridade', 'Prioridade'),
+    'Revisões': ('Revisões', 'Revisões'),
+    'Empresa': ('Empresa', 'Empresa'),
+    'SRE': ('SRE', 'SRE'),
+    'Data': ('Criado', 'Data Criação')
+}
+
+def chave_ordenacao(serie, ascendente=True):
+    """Converte a coluna de ordenação em float64 com nulos sempre ao final"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        chave = serie.to_numpy(dtype='datetime64[ns]').astype('int64').astype('float64')
+        chave[serie.isna().to_numpy()] = np.nan
+    else:
+        chave = pd.to_numeric(serie, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+    if not ascendente:
+        chave = -chave
+
+    return np.where(np.isnan(chave), np.inf, chave)
+
+def paginar_demandas(df, coluna_ordem, ascendente, pagina, tamanho_pagina, colunas):
+    """
+    Retorna apenas a página solicitada (0-based) sem ordenar o DataFrame inteiro.
+    Usa seleção parcial (np.partition) para achar os limites da página e ordena
+    somente as linhas candidatas, com empates resolvidos pela posição original.
+    """
+    total = len(df)
+    inicio = pagina * tamanho_pagina
+    fim = min(inicio + tamanho_pagina, total)
+
+    if inicio >= total or coluna_ordem not in df.columns:
+        return df.iloc[0:0][colunas]
+
+    chave = chave_ordenacao(df[coluna_ordem], ascendente)
+
+    limites = np.partition(chave, [inicio, fim - 1])
+    valor_inicio, valor_fim = limites[inicio], limites[fim - 1]
+
+    anteriores = int(np.count_nonzero(chave < valor_inicio))
+    candidatos = np.flatnonzero((chave >= valor_inicio) & (chave <= valor_fim))
+    candidatos = candidatos[np.lexsort((candidatos, chave[candidatos]))]
+    posicoes = candidatos[inicio - anteriores:fim - anteriores]
+
+    return df.iloc[posicoes, [df.columns.get_loc(c) for c in colunas]]
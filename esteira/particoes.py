@@ -0,0 +1,123 @@
+"""Partições (Ano, Mês) da base: recortes de período que só tocam as linhas do período"""
+import weakref
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .constantes import agora_brasilia
+
+# ============================================
+# ÍNDICE DE PARTIÇÕES
+# ============================================
+class IndiceParticoes:
+    """
+    Posições (ordenadas) das linhas de cada partição (Ano, Mês) de uma base.
+    A base não é reordenada: um recorte pega as posições das partições
+    escolhidas e devolve as linhas na ordem original, como uma máscara faria.
+    """
+
+    def __init__(self, particoes):
+        self.particoes = particoes
+
+    @classmethod
+    def da_base(cls, df):
+        if 'Ano' not in df.columns or 'Mês' not in df.columns or df.empty:
+            return cls({})
+        grupos = df.groupby(['Ano', 'Mês'], sort=True).indices
+        return cls({(int(ano), int(mes)): posicoes for (ano, mes), posicoes in grupos.items()})
+
+    def chaves(self):
+        return sorted(self.particoes)
+
+    def posicoes(self, ano=None, meses=None):
+        """Posições das partições do ano/meses pedidos (None = todos); poda as demais sem lê-las"""
+        if meses is not None:
+            meses = {int(m) for m in np.atleast_1d(meses)}
+        escolhidas = [
+            posicoes for (a, m), posicoes in self.particoes.items()
+            if (ano is None or a == int(ano)) and (meses is None or m in meses)
+        ]
+        if not escolhidas:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(escolhidas)) if len(escolhidas) > 1 else escolhidas[0]
+
+    def derivar(self, posicoes):
+        """Índice da sub-base formada pelas linhas `posicoes` (ordenadas) desta base"""
+        particoes = {}
+        for chave, atuais in self.particoes.items():
+            novas = np.searchsorted(posicoes, atuais)
+            dentro = novas < len(posicoes)
+            dentro[dentro] = posicoes[novas[dentro]] == atuais[dentro]
+            if dentro.any():
+                particoes[chave] = novas[dentro]
+        return IndiceParticoes(particoes)
+
+    def fechadas(self, hoje=None):
+        """Partições de meses já encerrados: imutáveis, seus agregados podem ser reaproveitados"""
+        return [chave for chave in self.chaves() if mes_fechado(*chave, hoje=hoje)]
+
+    def __len__(self):
+        return len(self.particoes)
+
+def mes_fechado(ano, mes, hoje=None):
+    """O mês terminou (é anterior ao mês de `hoje`, por padrão a data atual em Brasília)"""
+    hoje = hoje or agora_brasilia()
+    return (int(ano), int(mes)) < (hoje.year, hoje.month)
+
+# ============================================
+# REGISTRO DE ÍNDICES POR BASE
+# ============================================
+# id(df) -> (weakref da base, índice). A entrada some junto com a base, e
+# recortes feitos por aqui registram o índice da sub-base resultante
+_INDICES = {}
+_lock = threading.Lock()
+
+def _registrar(df, indice):
+    chave = id(df)
+    def _remover(_ref, chave=chave):
+        with _lock:
+            registro = _INDICES.get(chave)
+            if registro is not None and registro[0] is _ref:
+                del _INDICES[chave]
+    with _lock:
+        _INDICES[chave] = (weakref.ref(df, _remover), indice)
+    return df
+
+def particionar(df, indice=None):
+    """Registra o índice de partições da base (calculado se não for informado) e devolve a base"""
+    return _registrar(df, indice if indice is not None else IndiceParticoes.da_base(df))
+
+def indice_particoes(df):
+    """Índice registrado para esta base, ou None"""
+    registro = _INDICES.get(id(df))
+    if registro is None or registro[0]() is not df:
+        return None
+    return registro[1]
+
+def recortar_periodo(df, ano=None, meses=None):
+    """
+    Linhas do ano e mês(es) pedidos (None = sem filtro). Com índice registrado
+    só as partições do período são lidas; senão cai na máscara sobre a base toda.
+    """
+    if ano is None and meses is None:
+        return df
+    indice = indice_particoes(df)
+    if indice is not None:
+        posicoes = indice.posicoes(ano, meses)
+        return particionar(df.take(posicoes), indice.derivar(posicoes))
+
+    mascara = pd.Series(True, index=df.index)
+    if ano is not None:
+        mascara &= df['Ano'] == int(ano)
+    if meses is not None:
+        mascara &= df['Mês'].isin([int(m) for m in np.atleast_1d(meses)])
+    return df[mascara]
+
+def filtrar_mascara(df, mascara):
+    """df[mascara] que mantém o índice de partições na sub-base (filtros fora do período)"""
+    indice = indice_particoes(df)
+    resultado = df[mascara]
+    if indice is not None:
+        particionar(resultado, indice.derivar(np.flatnonzero(np.asarray(mascara))))
+    return resultado
@@ -0,0 +1,227 @@
+"""
+Portão de regressão de desempenho: grava uma linha de base versionada (JSON)
+com os tempos de cada carga do benchmark (ingestão, filtros, agregações e
+figuras) em tamanhos sintéticos fixos, e compara uma execução nova com ela,
+falhando quando um caminho quente fica mais lento além da tolerância.
+
+    python -m esteira.regressao gravar      # grava benchmarks/linha_base.json
+    python -m esteira.regressao comparar    # código de saída 1 se houver regressão
+
+Uma carga só regride quando a mediana nova passa da base por mais que o maior
+entre o limite relativo, algumas vezes o ruído das duas medições (desvio
+absoluto mediano) e um mínimo em ms. As suspeitas são medidas de novo e
+vale a rodada mais rápida: uma regressão de verdade aparece nas duas.
+"""
+import os
+import sys
+import json
+import argparse
+import warnings
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+from .benchmark import CARGAS, ambiente, executar
+from .constantes import CAMINHO_LINHA_BASE
+
+VERSAO_LINHA_BASE = 1
+
+# Tamanhos e repetições fixos: a linha de base só vale para eles
+TAMANHOS_REGRESSAO = ('10k', '100k')
+REPETICOES_REGRESSAO = 7
+
+LIMITE_RELATIVO = 0.25
+SIGMAS_RUIDO = 3.0
+MINIMO_MS = 5.0
+
+# ============================================
+# LINHA DE BASE
+# ============================================
+def resumir_tempos(tempos):
+    """Mediana, desvio absoluto mediano e número de execuções"""
+    tempos = np.asarray(tempos, dtype=float)
+    mediana = float(np.median(tempos))
+    return {
+        'mediana_ms': round(mediana, 3),
+        'mad_ms': round(float(np.median(np.abs(tempos - mediana))), 3),
+        'n': int(len(tempos)),
+        'tempos_ms': [round(float(t), 3) for t in tempos]
+    }
+
+def _chave(resultado):
+    return f"{resultado['carga']}@{resultado['tamanho']}"
+
+def medidas(resultados):
+    """'carga@tamanho' -> resumo dos tempos, a partir da saída de benchmark.executar"""
+    return {_chave(r): resumir_tempos(r['tempos_ms']) for r in resultados['resultados']}
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def gerar_linha_base(resultados):
+    return {
+        'versao': VERSAO_LINHA_BASE,
+        'criada_em': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'ambiente': resultados['ambiente'],
+        'semente': resultados['semente'],
+        'repeticoes': resultados['repeticoes'],
+        'medidas': medidas(resultados)
+    }
+
+def gravar_linha_base(caminho, linha_base):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(linha_base, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+def carregar_linha_base(caminho):
+    """Linha de base gravada; ValueError se for de outra versão do formato"""
+    with open(caminho, encoding='utf-8') as f:
+        linha_base = json.load(f)
+    if linha_base.get('versao') != VERSAO_LINHA_BASE:
+        raise ValueError(
+            f"Linha de base na versão {linha_base.get('versao')}, esperada {VERSAO_LINHA_BASE}: grave outra"
+        )
+    return linha_base
+
+# ============================================
+# COMPARAÇÃO
+# ============================================
+def ruido_ms(base, atual):
+    """Erro padrão aproximado da diferença das medianas (MAD -> desvio padrão)"""
+    variancia = sum((1.253 * 1.4826 * m['mad_ms']) ** 2 / max(m['n'], 1) for m in (base, atual))
+    return float(np.sqrt(variancia))
+
+def comparar(base, atual, limite=LIMITE_RELATIVO, sigmas=SIGMAS_RUIDO, minimo_ms=MINIMO_MS):
+    """
+    Uma linha por medida: base, atual, variação, tolerância e situação
+    ('regressão', 'melhora', 'ok', 'nova' ou 'ausente')
+    """
+    linhas = []
+    for chave in sorted(set(base) | set(atual)):
+        if chave not in atual or chave not in base:
+            linhas.append({'medida': chave, 'situacao': 'ausente' if chave not in atual else 'nova'})
+            continue
+        b, a = base[chave], atual[chave]
+        diferenca = a['mediana_ms'] - b['mediana_ms']
+        tolerancia = max(limite * b['mediana_ms'], sigmas * ruido_ms(b, a), minimo_ms)
+        situacao = 'regressão' if diferenca > tolerancia else 'melhora' if -diferenca > tolerancia else 'ok'
+        linhas.append({
+            'medida': chave,
+            'base_ms': b['mediana_ms'],
+            'atual_ms': a['mediana_ms'],
+            'variacao': round(diferenca / b['mediana_ms'], 4) if b['mediana_ms'] else None,
+            'tolerancia_ms': round(tolerancia, 3),
+            'situacao': situacao
+        })
+    return linhas
+
+def diferencas_ambiente(base, atual):
+    """Campos do ambiente que mudaram desde a linha de base (tempos pouco comparáveis)"""
+    return {campo: (base.get(campo), atual.get(campo)) for campo in atual if base.get(campo) != atual.get(campo)}
+
+def confirmar(atual, suspeitas, repeticoes, **parametros):
+    """Mede de novo as cargas suspeitas e fica, para cada uma, com a rodada de menor mediana"""
+    por_tamanho = {}
+    for chave in suspeitas:
+        carga, tamanho = chave.split('@')
+        por_tamanho.setdefault(tamanho, []).append(carga)
+    for tamanho, cargas in por_tamanho.items():
+        novas = medidas(executar([tamanho], repeticoes=repeticoes, cargas=cargas, **parametros))
+        for chave, medida in novas.items():
+            atual[chave] = min(atual[chave], medida, key=lambda m: m['mediana_ms'])
+    return atual
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def _imprimir_comparacao(linhas):
+    print(f"{'medida':<34} {'base':>11} {'atual':>11} {'variação':>9} {'tolerância':>11}  situação")
+    for linha in linhas:
+        if 'base_ms' not in linha:
+            print(f"{linha['medida']:<34} {'':>11} {'':>11} {'':>9} {'':>11}  {linha['situacao']}")
+            continue
+        variacao = f"{linha['variacao']:+.0%}" if linha['variacao'] is not None else '-'
+        print(f"{linha['medida']:<34} {linha['base_ms']:>8,.1f} ms {linha['atual_ms']:>8,.1f} ms {variacao:>9} "
+              f"{linha['tolerancia_ms']:>8,.1f} ms  {linha['situacao']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.regressao',
+        description='Portão de regressão de desempenho contra uma linha de base gravada.'
+    )
+    parser.add_argument('acao', choices=['gravar', 'comparar'], help='gravar a linha de base ou comparar com ela')
+    parser.add_argument('--linha-base', default=CAMINHO_LINHA_BASE, help='arquivo da linha de base (padrão: %(default)s)')
+    parser.add_argument('--tamanhos', default=','.join(TAMANHOS_REGRESSAO), help='tamanhos sintéticos (padrão: %(default)s)')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_REGRESSAO,
+                        help='execuções cronometradas por carga (padrão: %(default)s)')
+    parser.add_argument('--cargas', default=','.join(CARGAS), help='cargas de trabalho (padrão: todas)')
+    parser.add_argument('--limite', type=float, default=LIMITE_RELATIVO,
+                        help='piora relativa tolerada, em fração da base (padrão: %(default)s)')
+    parser.add_argument('--sigmas', type=float, default=SIGMAS_RUIDO,
+                        help='múltiplos do ruído das medições tolerados (padrão: %(default)s)')
+    parser.add_argument('--minimo-ms', type=float, default=MINIMO_MS,
+                        help='diferença mínima, em ms, para contar como regressão (padrão: %(default)s)')
+    parser.add_argument('--diretorio', default=None, help='onde os exports sintéticos são gerados e reaproveitados')
+    parser.add_argument('--saida', default=None, help='grava a comparação em JSON')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    tamanhos = [t.strip() for t in args.tamanhos.split(',') if t.strip()]
+    cargas = [c.strip() for c in args.cargas.split(',') if c.strip()]
+    desconhecidas = [c for c in cargas if c not in CARGAS]
+    if desconhecidas:
+        print(f"Cargas desconhecidas: {', '.join(desconhecidas)} (disponíveis: {', '.join(CARGAS)})", file=sys.stderr)
+        return 2
+
+    if args.acao == 'gravar':
+        resultados = executar(tamanhos, repeticoes=args.repeticoes, cargas=cargas, diretorio=args.diretorio)
+        gravar_linha_base(args.linha_base, gerar_linha_base(resultados))
+        print(f"Linha de base com {len(resultados['resultados'])} medidas gravada em {args.linha_base}")
+        return 0
+
+    try:
+        linha_base = carregar_linha_base(args.linha_base)
+    except FileNotFoundError:
+        print(f"Linha de base não encontrada em {args.linha_base}: rode 'python -m esteira.regressao gravar'",
+              file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    mudancas = diferencas_ambiente(linha_base['ambiente'], ambiente())
+    if mudancas:
+        print("Aviso: ambiente diferente da linha de base (" +
+              ', '.join(f"{campo}: {antes} -> {depois}" for campo, (antes, depois) in mudancas.items()) + ")")
+
+    tolerancias = {'limite': args.limite, 'sigmas': args.sigmas, 'minimo_ms': args.minimo_ms}
+    atual = medidas(executar(tamanhos, repeticoes=args.repeticoes, cargas=cargas, diretorio=args.diretorio,
+                             semente=linha_base['semente']))
+    linhas = comparar(linha_base['medidas'], atual, **tolerancias)
+    suspeitas = [linha['medida'] for linha in linhas if linha['situacao'] == 'regressão']
+    if suspeitas:
+        atual = confirmar(atual, suspeitas, args.repeticoes, diretorio=args.diretorio, semente=linha_base['semente'])
+        linhas = comparar(linha_base['medidas'], atual, **tolerancias)
+
+    _imprimir_comparacao(linhas)
+    regressoes = [linha['medida'] for linha in linhas if linha['situacao'] == 'regressão']
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'linha_base': args.linha_base, 'commit': _commit_atual(), 'tolerancias': tolerancias,
+                       'comparacao': linhas, 'medidas': atual}, f, ensure_ascii=False, indent=2)
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+        return 1
+    print("\nSem regressões.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
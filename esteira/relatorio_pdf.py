@@ -0,0 +1,282 @@
+"""Relatório PDF da manchete (fpdf + Pillow, importados sob demanda)"""
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .analises import calcular_ranking_sre, calcular_ranking_mapa
+from .constantes import (
+    COR_AZUL_ESCURO, COR_AZUL_PETROLEO, COR_BRANCO, COR_CINZA_BORDA,
+    COR_CINZA_FUNDO, COR_CINZA_TEXTO, COR_PRETO_SUAVE, COR_VERDE_ESCURO
+)
+
+# ============================================
+# RELATÓRIO PDF DA MANCHETE
+# ============================================
+def texto_pdf(texto):
+    """Remove caracteres fora do latin-1 (emojis etc.), não suportados pelo fpdf 1.7"""
+    return str(texto).encode('latin-1', 'ignore').decode('latin-1').strip()
+
+def cor_rgb(cor_hex):
+    """Converte '#RRGGBB' em tupla (R, G, B)"""
+    cor_hex = cor_hex.lstrip('#')
+    return tuple(int(cor_hex[i:i + 2], 16) for i in (0, 2, 4))
+
+def fonte_grafico(tamanho):
+    """Fonte TrueType com acentos (DejaVu, se instalada) ou a fonte padrão do Pillow"""
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype('DejaVuSans.ttf', tamanho)
+    except OSError:
+        pass
+    try:
+        return ImageFont.load_default(size=tamanho)
+    except TypeError:
+        return ImageFont.load_default()
+
+def rasterizar_barras_agrupadas(titulo, categorias, series, largura=1000, altura=460):
+    """
+    Desenha um gráfico de barras agrupadas em PNG usando apenas Pillow.
+    `series` é uma lista de (nome, valores, cor_hex), um valor por categoria.
+    """
+    from PIL import Image, ImageDraw
+
+    imagem = Image.new('RGB', (largura, altura), cor_rgb(COR_BRANCO))
+    desenho = ImageDraw.Draw(imagem)
+    fonte_titulo, fonte = fonte_grafico(22), fonte_grafico(15)
+
+    desenho.text((20, 12), titulo, fill=cor_rgb(COR_PRETO_SUAVE), font=fonte_titulo)
+
+    esq, topo, dir_, base = 70, 80, largura - 30, altura - 60
+    maximo = max([max(valores) for _, valores, _ in series if len(valores)] + [1])
+
+    desenho.line((esq, base, dir_, base), fill=cor_rgb(COR_CINZA_BORDA), width=2)
+
+    largura_grupo = (dir_ - esq) / max(len(categorias), 1)
+    largura_barra = largura_grupo * 0.7 / max(len(series), 1)
+
+    for i, categoria in enumerate(categorias):
+        x_grupo = esq + i * largura_grupo + largura_grupo * 0.15
+        for j, (_, valores, cor) in enumerate(series):
+            valor = valores[i]
+            altura_barra = (base - topo) * valor / maximo
+            x0 = x_grupo + j * largura_barra
+            desenho.rectangle((x0, base - altura_barra, x0 + largura_barra - 4, base), fill=cor_rgb(cor))
+            desenho.text((x0 + 4, base - altura_barra - 20), f"{valor:,}", fill=cor_rgb(COR_PRETO_SUAVE), font=fonte)
+        desenho.text((x_grupo, base + 10), str(categoria), fill=cor_rgb(COR_CINZA_TEXTO), font=fonte)
+
+    # Legenda (abaixo do título, à esquerda, para não cobrir os rótulos das barras)
+    x_legenda = 20
+    for j, (nome, _, cor) in enumerate(series):
+        x0 = x_legenda + j * 170
+        desenho.rectangle((x0, 48, x0 + 14, 62), fill=cor_rgb(cor))
+        desenho.text((x0 + 20, 46), nome, fill=cor_rgb(COR_PRETO_SUAVE), font=fonte)
+
+    buffer = io.BytesIO()
+    imagem.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def rasterizar_ranking(titulo, rotulos, valores, cor_hex, largura=1000, altura_linha=34):
+    """Desenha um ranking de barras horizontais em PNG usando apenas Pillow"""
+    from PIL import Image, ImageDraw
+
+    altura = 70 + altura_linha * max(len(rotulos), 1) + 20
+    imagem = Image.new('RGB', (largura, altura), cor_rgb(COR_BRANCO))
+    desenho = ImageDraw.Draw(imagem)
+    fonte_titulo, fonte = fonte_grafico(22), fonte_grafico(15)
+
+    desenho.text((20, 12), titulo, fill=cor_rgb(COR_PRETO_SUAVE), font=fonte_titulo)
+
+    esq, dir_ = 300, largura - 110
+    maximo = max(list(valores) + [1])
+
+    for i, (rotulo, valor) in enumerate(zip(rotulos, valores)):
+        y = 70 + i * altura_linha
+        comprimento = (dir_ - esq) * valor / maximo
+        desenho.text((20, y + 6), f"{i + 1}. {str(rotulo)[:30]}", fill=cor_rgb(COR_PRETO_SUAVE), font=fonte)
+        desenho.rectangle((esq, y + 4, esq + comprimento, y + altura_linha - 6), fill=cor_rgb(cor_hex))
+        desenho.text((esq + comprimento + 8, y + 6), f"{valor:,}", fill=cor_rgb(COR_CINZA_TEXTO), font=fonte)
+
+    buffer = io.BytesIO()
+    imagem.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+class RelatorioPDF:
+    """Monta o PDF da manchete com fpdf (importado só quando o relatório é gerado)"""
+
+    def __init__(self, titulo, subtitulo):
+        from fpdf import FPDF
+
+        self.pdf = FPDF(orientation='P', unit='mm', format='A4')
+        self.pdf.footer = self.rodape
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+        self.pdf.add_page()
+
+        self.pdf.set_fill_color(*cor_rgb(COR_AZUL_PETROLEO))
+        self.pdf.rect(0, 0, 210, 28, 'F')
+        self.pdf.set_text_color(*cor_rgb(COR_BRANCO))
+        self.pdf.set_font('Helvetica', 'B', 16)
+        self.pdf.set_xy(10, 7)
+        self.pdf.cell(0, 8, texto_pdf(titulo))
+        self.pdf.set_font('Helvetica', '', 10)
+        self.pdf.set_xy(10, 16)
+        self.pdf.cell(0, 6, texto_pdf(subtitulo))
+        self.pdf.set_text_color(*cor_rgb(COR_PRETO_SUAVE))
+        self.pdf.set_y(34)
+
+    def rodape(self):
+        self.pdf.set_y(-12)
+        self.pdf.set_font('Helvetica', 'I', 8)
+        self.pdf.set_text_color(*cor_rgb(COR_CINZA_TEXTO))
+        self.pdf.cell(0, 6, texto_pdf(f"Esteira ADMS - Relatório gerado pelo dashboard - Página {self.pdf.page_no()}"), align='C')
+
+    def secao(self, titulo, espaco_minimo=60):
+        # Evita título órfão no fim da página
+        if self.pdf.get_y() + espaco_minimo > 280:
+            self.pdf.add_page()
+        self.pdf.ln(3)
+        self.pdf.set_font('Helvetica', 'B', 12)
+        self.pdf.set_text_color(*cor_rgb(COR_AZUL_ESCURO))
+        self.pdf.cell(0, 7, texto_pdf(titulo), ln=1)
+        self.pdf.set_draw_color(*cor_rgb(COR_CINZA_BORDA))
+        self.pdf.line(10, self.pdf.get_y(), 200, self.pdf.get_y())
+        self.pdf.ln(2)
+        self.pdf.set_text_color(*cor_rgb(COR_PRETO_SUAVE))
+
+    def paragrafo(self, texto):
+        self.pdf.set_font('Helvetica', '', 10)
+        self.pdf.multi_cell(0, 5, texto_pdf(texto))
+
+    def tabela(self, cabecalho, linhas, larguras):
+        self.pdf.set_font('Helvetica', 'B', 9)
+        self.pdf.set_fill_color(*cor_rgb(COR_CINZA_FUNDO))
+        for titulo, largura in zip(cabecalho, larguras):
+            self.pdf.cell(largura, 7, texto_pdf(titulo), border=1, fill=True)
+        self.pdf.ln()
+
+        self.pdf.set_font('Helvetica', '', 9)
+        for linha in linhas:
+            if self.pdf.get_y() > 275:
+                self.pdf.add_page()
+            for valor, largura in zip(linha, larguras):
+                self.pdf.cell(largura, 6, texto_pdf(valor)[:48], border=1)
+            self.pdf.ln()
+
+    def imagem(self, caminho, largura_mm=190):
+        from PIL import Image
+
+        with Image.open(caminho) as img:
+            altura_mm = largura_mm * img.height / img.width
+        if self.pdf.get_y() + altura_mm > 280:
+            self.pdf.add_page()
+        self.pdf.image(caminho, x=10, y=self.pdf.get_y(), w=largura_mm, type='PNG')
+        self.pdf.set_y(self.pdf.get_y() + altura_mm + 2)
+
+    def bytes(self):
+        return self.pdf.output(dest='S').encode('latin-1')
+
+
+def gerar_relatorio_pdf(dados):
+    """
+    Gera o PDF da manchete. Roda em thread de segundo plano: recebe apenas dados
+    já recortados (dict) e não acessa st.session_state.
+    Os gráficos são rasterizados em paralelo antes da montagem do documento.
+    """
+    df_periodo = dados['df_periodo']
+    ranking_sre = calcular_ranking_sre(df_periodo)
+    ranking_mapa, total_sinc_mapa = calcular_ranking_mapa(df_periodo)
+
+    graficos = {}
+    if dados['comparativo'] is not None:
+        comp = dados['comparativo']
+        graficos['comparativo'] = (rasterizar_barras_agrupadas, (
+            'Comparativo: Período Atual vs Anterior',
+            comp['periodos'],
+            [('Total Cards', comp['totais'], COR_AZUL_ESCURO),
+             ('Validados', comp['validados'], COR_VERDE_ESCURO)]
+        ))
+    if not ranking_sre.empty:
+        graficos['sre'] = (rasterizar_ranking, (
+            'Ranking de SREs - Sincronizados',
+            ranking_sre['SRE'].tolist(), ranking_sre['Sincronizados'].tolist(), COR_AZUL_PETROLEO
+        ))
+    if not ranking_mapa.empty:
+        graficos['mapa'] = (rasterizar_ranking, (
+            'Ranking de Empresas - Sincronismos',
+            (ranking_mapa['sigla'] + ' - ' + ranking_mapa['empresa']).tolist(),
+            ranking_mapa['sincronismos'].tolist(), COR_VERDE_ESCURO
+        ))
+
+    with ThreadPoolExecutor(max_workers=max(len(graficos), 1), thread_name_prefix='raster_pdf') as executor:
+        futuros = {nome: executor.submit(funcao, *args) for nome, (funcao, args) in graficos.items()}
+        imagens = {nome: futuro.result() for nome, futuro in futuros.items()}
+
+    kpis = dados['kpis']
+    relatorio = RelatorioPDF(
+        "Esteira ADMS - Manchete do Período",
+        f"Período: {dados['periodo_titulo']}  |  Gerado em: {dados['gerado_em']}"
+    )
+
+    with tempfile.TemporaryDirectory(prefix='relatorio_pdf_') as pasta:
+        # fpdf 1.7 só lê imagens a partir de arquivo
+        caminhos = {}
+        for nome, png in imagens.items():
+            caminhos[nome] = os.path.join(pasta, f"{nome}.png")
+            with open(caminhos[nome], 'wb') as f:
+                f.write(png)
+
+        relatorio.secao("Indicadores do Período")
+        relatorio.tabela(
+            ['Indicador', 'Valor'],
+            [
+                ['Total de cards', f"{kpis['total_cards']:,}"],
+                ['Validados (sincronizados)', f"{kpis['validados']:,} ({kpis['taxa_sucesso']:.1f}%)"],
+                ['Sem erro', f"{kpis['sem_erro']:,}"],
+                ['Com erro (revisões > 0)', f"{kpis['com_erro']:,} ({kpis['taxa_erro']:.1f}%)"],
+                ['Dias com atividade', f"{kpis['dias_unicos']:,}"],
+                ['Média diária', f"{kpis['media_diaria']:.1f}"],
+                ['Média revisões/card', f"{kpis['media_revisoes']:.1f}"]
+            ],
+            [100, 90]
+        )
+
+        relatorio.secao("Comparação com Período Anterior", espaco_minimo=120)
+        if 'comparativo' in caminhos:
+            comp = dados['comparativo']
+            relatorio.imagem(caminhos['comparativo'])
+            relatorio.tabela(
+                ['Período', 'Total Cards', 'Validados', 'Taxa Sucesso'],
+                [[p, f"{t:,}", f"{v:,}", f"{tx:.1f}%"]
+                 for p, t, v, tx in zip(comp['periodos'], comp['totais'], comp['validados'], comp['taxas'])],
+                [70, 40, 40, 40]
+            )
+        else:
+            relatorio.paragrafo("Sem dados do período anterior para comparação.")
+
+        relatorio.secao("Ranking de SREs", espaco_minimo=120)
+        if 'sre' in caminhos:
+            relatorio.imagem(caminhos['sre'])
+            relatorio.tabela(
+                ['#', 'SRE', 'Sincronizados', 'Com Revisão', 'Taxa Retorno'],
+                [[i + 1, r['SRE'], f"{r['Sincronizados']:,}", f"{r['Com Revisão']:,}", f"{r['Taxa Retorno (%)']:.1f}%"]
+                 for i, r in ranking_sre.iterrows()],
+                [10, 80, 35, 35, 30]
+            )
+        else:
+            relatorio.paragrafo("Nenhum card sincronizado no período.")
+
+        relatorio.secao("Ranking do Mapa de Sincronizações", espaco_minimo=120)
+        if 'mapa' in caminhos:
+            relatorio.imagem(caminhos['mapa'])
+            relatorio.tabela(
+                ['#', 'Empresa', 'UF', 'Região', 'Sincronismos', '% Total'],
+                [[i + 1, r['empresa'], r['sigla'], r['regiao'], f"{r['sincronismos']:,}",
+                  f"{r['sincronismos'] / total_sinc_mapa * 100:.1f}%" if total_sinc_mapa else "0.0%"]
+                 for i, r in ranking_mapa.iterrows()],
+                [10, 60, 20, 40, 35, 25]
+            )
+        else:
+            relatorio.paragrafo("Nenhuma empresa mapeada com sincronismos no período.")
+
+        return relatorio.bytes()
+
@@ -0,0 +1,132 @@
+"""Versão atual da base local, recarregada em segundo plano e trocada atomicamente"""
+import time
+import threading
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .dados import carregar_exports
+from .particoes import IndiceParticoes, particionar
+from .materializados import AgregadosMensais, caminho_materializados_padrao
+from .snapshot import calcular_agregados, carregar_snapshot
+from .sla import IndiceSLA
+from .textos import indexar_textos
+
+# ============================================
+# VERSÕES DA BASE LOCAL
+# ============================================
+@dataclass(frozen=True)
+class VersaoBase:
+    """Base local pronta para uso: DataFrame, agregados e identificação. Nunca é alterada."""
+    numero: int
+    df: pd.DataFrame = field(repr=False)
+    agregados: dict = field(repr=False)
+    file_hash: str
+    caminho: str
+    versao_arquivo: int         # versão do MonitorArquivo lida antes da carga
+    origem: str                 # 'snapshot', 'csv' ou 'sqlite'
+    carregada_em: float
+    duracao: float              # segundos gastos para montar a versão
+    sla: IndiceSLA = field(default=None, repr=False)   # abertos por Vencimento
+    textos: dict = field(default=None, repr=False)     # coluna de texto -> IndiceInvertido
+
+class RepositorioBase:
+    """
+    Guarda a versão atual da base local para todas as sessões do processo.
+
+    A carga (snapshot ou CSV/exports + agregados) roda num worker em segundo plano e,
+    ao terminar, a referência `atual` é trocada de uma vez. Quem já está
+    renderizando continua com o objeto que leu; as sessões passam a usar a nova
+    versão na próxima interação. Mudanças publicadas pelo monitor disparam a
+    recarga automaticamente.
+
+    `carregar(origem)` processa o CSV (ou os exports) quando não há snapshot em dia
+    (o painel passa a versão com cache por conteúdo). Com um ArmazemSQLite
+    ativo, cada carga é gravada nele (upsert) e a versão passa a ser o histórico
+    completo do armazém. Os agregados mensais são montados dos resumos
+    materializados (AgregadosMensais): só o mês aberto é resumido a cada recarga.
+    O índice de SLA da versão anterior é atualizado por diferença e os textos
+    livres (Motivo Revisão, ChangeSet) ganham um índice invertido.
+    """
+
+    def __init__(self, monitor, carregar=carregar_exports, armazem=None):
+        self.monitor = monitor
+        self.armazem = armazem
+        self._carregar_csv = carregar
+        self.atual = None
+        self.ultimo_erro = None
+        self._contador = 0
+        self._pendente = None
+        self._mensais = None
+        self._sla = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recarga_base')
+        monitor.inscrever(lambda estado: self.recarregar())
+
+    @property
+    def recarregando(self):
+        return self._pendente is not None and not self._pendente.done()
+
+    def recarregar(self):
+        """Agenda a recarga e devolve o Future; pedidos durante uma recarga reaproveitam-na"""
+        with self._lock:
+            if self._pendente is None or self._pendente.done():
+                self._pendente = self._executor.submit(self._carregar)
+            return self._pendente
+
+    def _carregar(self):
+        while True:
+            estado = self.monitor.estado
+            if estado.caminho is None:
+                erro = ValueError("Arquivo local não encontrado")
+                self.ultimo_erro = erro
+                raise erro
+
+            inicio = time.perf_counter()
+            snapshot = carregar_snapshot(estado.caminho)
+            # Recortes de período da versão leem só as partições (Ano, Mês) pedidas
+            if snapshot is not None:
+                df, agregados, file_hash, origem = snapshot['df'], snapshot['agregados'], snapshot['file_hash'], 'snapshot'
+                particionar(df, IndiceParticoes(snapshot['particoes']))
+            else:
+                df, status, file_hash = self._carregar_csv(estado.caminho)
+                if df is None:
+                    erro = ValueError(status)
+                    self.ultimo_erro = erro
+                    raise erro
+                particionar(df)
+                agregados, origem = None, 'csv'
+
+            if self.armazem is not None and self.armazem.ativo:
+                self.armazem.gravar(df)
+                df = particionar(self.armazem.carregar())
+                agregados, origem = None, 'sqlite'
+
+            if agregados is None:
+                agregados = calcular_agregados(df, self._resumos_mensais(estado.caminho, df))
+            self._sla = IndiceSLA.da_base(df) if self._sla is None else self._sla.atualizar(df)
+            textos = indexar_textos(df)
+
+            nova = VersaoBase(
+                numero=0, df=df, agregados=agregados, file_hash=file_hash,
+                caminho=estado.caminho, versao_arquivo=estado.versao, origem=origem,
+                carregada_em=time.time(), duracao=time.perf_counter() - inicio, sla=self._sla,
+                textos=textos
+            )
+            with self._lock:
+                self._contador += 1
+                self.atual = replace(nova, numero=self._contador)
+                self.ultimo_erro = None
+                # Se o arquivo mudou de novo durante a leitura, repete com a versão
+                # mais nova; senão libera o próximo recarregar() para agendar outra carga
+                if self.monitor.versao == estado.versao:
+                    self._pendente = None
+                    return self.atual
+
+    def _resumos_mensais(self, caminho, df):
+        """Resumos mensais da base: meses fechados vêm materializados, só o mês aberto é refeito"""
+        caminho_mensais = caminho_materializados_padrao(caminho)
+        if self._mensais is None or self._mensais.caminho != caminho_mensais:
+            self._mensais = AgregadosMensais(caminho_mensais)
+        return self._mensais.resumos(df)
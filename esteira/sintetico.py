@@ -0,0 +1,223 @@
+"""
+Gerador de exports sintéticos do ADMS, no formato de data/esteira_demandas.csv:
+as mesmas 16 colunas, campos entre aspas, Motivo Revisão com quebras de linha,
+chamados com sufixo (30392579_2) e datas dd/mm/aaaa HH:MM. As distribuições
+de SRE, Empresa, Status etc. vêm de um export de referência, quando existe.
+
+    python -m esteira.sintetico --linhas 1m --saida /tmp/esteira_1m.csv
+"""
+import os
+import sys
+import argparse
+import warnings
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .constantes import FORMATO_DATA_EXPORT, MAPEAMENTO_EMPRESAS
+
+# Incrementar quando o conteúdo gerado mudar (os exports guardados são refeitos)
+VERSAO_SINTETICO = 2
+
+COLUNAS_EXPORT = [
+    'Chamado', 'Vencimento', 'Tipo Chamado', 'ChangeSet', 'Empresa', 'Responsável',
+    'Sincronização', 'Status', 'SRE', 'Prioridade', 'Modificado', 'Revisões', 'Criado',
+    'Modificado por', 'Motivo Revisão', 'Retorno Cliente'
+]
+
+# Colunas categóricas sorteadas pela frequência observada (None = vazio no export)
+COLUNAS_CATEGORICAS = [
+    'Tipo Chamado', 'ChangeSet', 'Empresa', 'Responsável', 'Sincronização', 'Status',
+    'SRE', 'Prioridade', 'Retorno Cliente'
+]
+
+# Distribuições usadas sem export de referência (proporções próximas das reais)
+DISTRIBUICOES_PADRAO = {
+    'Tipo Chamado': {'Correção/Ajuste': 0.45, 'Desenvolvimento': 0.39, 'Comissionamento': 0.14,
+                     'Projetos Internos': 0.02},
+    'ChangeSet': {'Telemetry': 0.61, 'Manual': 0.22, 'Elipse': 0.14, None: 0.03},
+    'Empresa': {'ESS': 0.26, 'EMS': 0.21, 'EMR': 0.20, 'ESE': 0.10, 'EMT': 0.095, 'EPB': 0.05,
+                'ETO': 0.04, 'ERO': 0.033, 'EAC': 0.012},
+    'Responsável': {f'Responsável {i:02d}': p for i, p in enumerate(
+        [0.16, 0.14, 0.13, 0.11, 0.07, 0.07, 0.055, 0.045, 0.04, 0.03, 0.03, 0.03, 0.03, 0.03, 0.02], 1)},
+    'Sincronização': {'Imediata': 0.995, 'Aguardar': 0.005},
+    'Status': {'Sincronizado': 0.981, 'Backlog': 0.008, 'SRE': 0.004, 'Dev': 0.003, 'Aguardando Sinc.': 0.004},
+    'SRE': {'SRE Um': 0.57, 'SRE Dois': 0.20, 'SRE Três': 0.10, 'SRE Quatro': 0.08, 'SRE Cinco': 0.03,
+            'SRE Seis': 0.005, None: 0.015},
+    'Prioridade': {'Normal': 0.725, 'Alta': 0.275},
+    'Retorno Cliente': {None: 0.999, 'NÃO': 0.0008, 'SIM': 0.0002},
+}
+DISTRIBUICAO_REVISOES = {0: 0.963, 1: 0.034, 2: 0.002, 3: 0.001}
+MOTIVOS_PADRAO = [
+    'Erro na descrição do equipamento\n', 'Coordenadas incorretas', 'Retrofit',
+    'Desenvolvimento incompleto', 'Changeset não encontrado no ADMS', 'Changeset bloqueado',
+    'Erro de topologia:\nchave sem conexão com o alimentador', 'Sem circuito no equipamento\n',
+    'Alteração de porta GPRS.', 'Faltou alinhamento para o sincronismo'
+]
+
+# Data fixa: a mesma semente gera o mesmo export em qualquer dia
+FIM_PADRAO = '2026-08-31'
+
+TAMANHOS_PADRAO = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '5m': 5_000_000}
+
+def interpretar_tamanho(texto):
+    """'10k', '1m', '250000' -> número de linhas"""
+    texto = str(texto).strip().lower().replace('_', '')
+    if texto in TAMANHOS_PADRAO:
+        return TAMANHOS_PADRAO[texto]
+    multiplicador = {'k': 1_000, 'm': 1_000_000}.get(texto[-1:], 1)
+    return int(float(texto.rstrip('km')) * multiplicador)
+
+# ============================================
+# DISTRIBUIÇÕES
+# ============================================
+@lru_cache(maxsize=4)
+def distribuicoes_referencia(caminho):
+    """Frequências das colunas categóricas, das revisões e dos motivos num export real"""
+    df = pd.read_csv(caminho, dtype=str)
+    distribuicoes = {}
+    for coluna in COLUNAS_CATEGORICAS:
+        frequencias = df[coluna].value_counts(dropna=False, normalize=True)
+        distribuicoes[coluna] = {None if pd.isna(v) else v: p for v, p in frequencias.items()}
+    revisoes = pd.to_numeric(df['Revisões'], errors='coerce').fillna(0).astype(int)
+    motivos = df['Motivo Revisão'].dropna()
+    return (
+        distribuicoes,
+        revisoes.value_counts(normalize=True).to_dict(),
+        motivos.unique().tolist() or MOTIVOS_PADRAO
+    )
+
+def _sortear(rng, distribuicao, n):
+    valores = list(distribuicao)
+    probabilidades = np.array(list(distribuicao.values()), dtype=float)
+    indices = rng.choice(len(valores), size=n, p=probabilidades / probabilidades.sum())
+    return pd.Series(np.array(valores, dtype=object)[indices])
+
+def _formatar_datas(datas):
+    return pd.Series(datas).dt.strftime(FORMATO_DATA_EXPORT)
+
+# ============================================
+# GERAÇÃO
+# ============================================
+def gerar_export(linhas, semente=0, referencia=None, fim=FIM_PADRAO, meses=24, primeiro_id=0):
+    """
+    DataFrame com as colunas do export (texto como no CSV; None = vazio).
+    Criado se espalha pelos `meses` anteriores a `fim`, em horário comercial.
+    Os números de chamado saem de [30_000_000 + primeiro_id, + 2 * linhas).
+    """
+    rng = np.random.default_rng(semente)
+    if referencia and os.path.exists(referencia):
+        distribuicoes, dist_revisoes, motivos = distribuicoes_referencia(referencia)
+    else:
+        distribuicoes, dist_revisoes, motivos = DISTRIBUICOES_PADRAO, DISTRIBUICAO_REVISOES, MOTIVOS_PADRAO
+    distribuicoes = {**DISTRIBUICOES_PADRAO, **distribuicoes}
+    distribuicoes['Empresa'] = {e: p for e, p in distribuicoes['Empresa'].items() if e in MAPEAMENTO_EMPRESAS} \
+        or DISTRIBUICOES_PADRAO['Empresa']
+
+    export = pd.DataFrame({coluna: _sortear(rng, distribuicoes[coluna], linhas) for coluna in COLUNAS_CATEGORICAS})
+
+    # Chamados de 8 dígitos; ~0,5% reaparecem como cartão novo com sufixo _2, _3...
+    base = 30_000_000 + primeiro_id + np.sort(rng.choice(np.arange(linhas * 2), size=linhas, replace=False))
+    chamados = pd.Series(base.astype(str))
+    repetidos = rng.random(linhas) < 0.005
+    sufixos = pd.Series(rng.integers(2, 4, size=linhas).astype(str))
+    export['Chamado'] = chamados.where(~repetidos, chamados + '_' + sufixos)
+
+    # Criado em dias úteis, das 8h às 18h; Modificado algumas horas (ou dias) depois
+    fim = pd.Timestamp(fim)
+    inicio = fim - pd.DateOffset(months=meses)
+    dias = pd.bdate_range(inicio, fim)
+    criado = (dias.values[rng.integers(0, len(dias), size=linhas)]
+              + (rng.integers(8 * 60, 18 * 60, size=linhas) * 60_000_000_000).astype('timedelta64[ns]'))
+    atraso = (rng.lognormal(mean=1.0, sigma=1.2, size=linhas) * 3_600_000_000_000).astype('timedelta64[ns]')
+    export['Criado'] = _formatar_datas(criado)
+    export['Modificado'] = _formatar_datas(criado + atraso)
+
+    # Vencimento só em ~4% dos chamados
+    vencimento = criado + (rng.integers(1, 30, size=linhas) * 86_400_000_000_000).astype('timedelta64[ns]')
+    com_vencimento = rng.random(linhas) < 0.04
+    export['Vencimento'] = _formatar_datas(vencimento).where(com_vencimento, None)
+
+    revisoes = _sortear(rng, dist_revisoes, linhas).astype(int)
+    export['Revisões'] = revisoes.astype(str)
+    # Motivo (texto livre, às vezes com várias linhas) só nos chamados revisados e em alguns outros
+    com_motivo = (revisoes > 0) | (rng.random(linhas) < 0.02)
+    export['Motivo Revisão'] = _sortear(rng, dict.fromkeys(motivos, 1.0), linhas).where(com_motivo, None)
+    export['Modificado por'] = export['SRE'].where(rng.random(linhas) < 0.95, export['Responsável'])
+
+    return export[COLUNAS_EXPORT]
+
+def _linhas_csv(bloco):
+    """Linhas do CSV: todo valor entre aspas (aspas internas dobradas), vazio sem aspas"""
+    campos = [
+        ('"' + bloco[coluna].astype(object).str.replace('"', '""', regex=False) + '"').fillna('')
+        for coluna in COLUNAS_EXPORT
+    ]
+    linha = campos[0]
+    for campo in campos[1:]:
+        linha = linha + ',' + campo
+    return linha
+
+def gravar_export(caminho, linhas, semente=0, referencia=None, bloco=500_000, **parametros):
+    """Gera e grava o export em blocos (memória limitada mesmo com milhões de linhas); os chamados não se repetem entre blocos"""
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(f'"{c}"' for c in COLUNAS_EXPORT) + '\n')
+        for i, inicio in enumerate(range(0, linhas, bloco)):
+            parte = gerar_export(min(bloco, linhas - inicio), semente=semente + i, referencia=referencia,
+                                 primeiro_id=inicio * 2, **parametros)
+            f.write('\n'.join(_linhas_csv(parte)) + '\n')
+    os.replace(temporario, caminho)
+    return caminho
+
+def export_sintetico(linhas, diretorio, semente=0, referencia=None):
+    """Caminho do export sintético de `linhas` linhas, gerado só se ainda não existir"""
+    caminho = os.path.join(diretorio, f"esteira_sintetico_v{VERSAO_SINTETICO}_{linhas}_{semente}.csv")
+    if not os.path.exists(caminho):
+        gravar_export(caminho, linhas, semente=semente, referencia=referencia)
+    return caminho
+
+def datas_invalidas(df):
+    """Datas não lidas (NaT) por coluna na base processada de um export sintético, que sempre as preenche"""
+    return {coluna: int(df[coluna].isna().sum()) for coluna in ('Criado', 'Modificado') if coluna in df.columns}
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.sintetico',
+        description='Gera um export sintético do ADMS no formato do painel.'
+    )
+    parser.add_argument('--linhas', default='100k', help='número de linhas: 10k, 100k, 1m, 5m... (padrão: %(default)s)')
+    parser.add_argument('--saida', required=True, help='arquivo CSV a gravar')
+    parser.add_argument('--semente', type=int, default=0, help='semente do gerador (padrão: %(default)s)')
+    parser.add_argument('--referencia', default='data/esteira_demandas.csv',
+                        help='export real de onde vêm as distribuições, se existir (padrão: %(default)s)')
+    parser.add_argument('--conferir', action='store_true',
+                        help='relê o export com carregar_exports e falha se alguma data não for lida')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    linhas = interpretar_tamanho(args.linhas)
+    gravar_export(args.saida, linhas, semente=args.semente, referencia=args.referencia)
+    print(f"{linhas:,} linhas gravadas em {args.saida} ({os.path.getsize(args.saida) / 1024 ** 2:,.1f} MB)")
+    if args.conferir:
+        from .dados import carregar_exports
+        df, status, _ = carregar_exports(args.saida)
+        if df is None:
+            print(status, file=sys.stderr)
+            return 1
+        invalidas = {coluna: n for coluna, n in datas_invalidas(df).items() if n}
+        if invalidas:
+            print(f"Datas não lidas na releitura: {invalidas}", file=sys.stderr)
+            return 1
+        print(f"Releitura conferida: {len(df):,} linhas, todas as datas lidas")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
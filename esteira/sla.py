@@ -0,0 +1,107 @@
+"""
+Índice de SLA: cartões abertos (Status diferente de Sincronizado) com
+Vencimento, ordenados pelo vencimento. "Vencidos agora", "vencendo nas
+próximas N horas" e "vencidos por SRE/Empresa" viram buscas binárias no
+vetor de vencimentos. A cada nova versão da base o índice é atualizado por
+diferença: cartões iguais ficam onde estão, os que fecharam ou mudaram saem
+e os novos são intercalados, sem reordenar tudo.
+"""
+import numpy as np
+import pandas as pd
+
+# Colunas guardadas no índice (as que existirem na base)
+COLUNAS_SLA = ['Chamado', 'Status', 'SRE', 'Empresa', 'Responsável_Formatado', 'Vencimento']
+
+def _nanossegundos(datas):
+    return datas.to_numpy(dtype='datetime64[ns]').astype('int64')
+
+def _abertos(df):
+    """Cartões abertos com vencimento, a chave de cada um (Chamado|Criado) e a assinatura do conteúdo"""
+    colunas = [c for c in COLUNAS_SLA if c in df.columns]
+    if 'Vencimento' not in df.columns or 'Status' not in df.columns:
+        return pd.DataFrame(columns=colunas), pd.Index([], dtype=object), np.array([], dtype='uint64')
+
+    abertos = (df['Status'] != 'Sincronizado').to_numpy() & df['Vencimento'].notna().to_numpy()
+    cartoes = df.loc[abertos, colunas].reset_index(drop=True)
+    chamados = cartoes['Chamado'].astype(str).str.strip() if 'Chamado' in cartoes.columns \
+        else pd.Series(np.flatnonzero(abertos).astype(str))
+    criado = _nanossegundos(df.loc[abertos, 'Criado']).astype(str) if 'Criado' in df.columns else ''
+    chaves = pd.Index((chamados + '|' + criado).to_numpy(dtype=object))
+    assinaturas = pd.util.hash_pandas_object(cartoes, index=False).to_numpy()
+    return cartoes, chaves, assinaturas
+
+class IndiceSLA:
+    """Cartões abertos ordenados por Vencimento; consultas por busca binária"""
+
+    def __init__(self, cartoes, chaves, assinaturas):
+        self.cartoes = cartoes
+        self.chaves = chaves
+        self.assinaturas = assinaturas
+        self.vencimentos = _nanossegundos(cartoes['Vencimento']) if len(cartoes) else np.array([], dtype='int64')
+        # Resultado da última atualização (cartões mantidos, inseridos e removidos)
+        self.mantidos, self.inseridos, self.removidos = 0, len(cartoes), 0
+
+    @classmethod
+    def da_base(cls, df):
+        cartoes, chaves, assinaturas = _abertos(df)
+        ordem = np.argsort(_nanossegundos(cartoes['Vencimento']), kind='stable') if len(cartoes) else np.array([], dtype='int64')
+        return cls(cartoes.take(ordem).reset_index(drop=True), chaves[ordem], assinaturas[ordem])
+
+    def atualizar(self, df):
+        """Índice da nova versão da base, aproveitando os cartões que não mudaram"""
+        cartoes, chaves, assinaturas = _abertos(df)
+        if not (self.chaves.is_unique and chaves.is_unique) or list(cartoes.columns) != list(self.cartoes.columns):
+            return IndiceSLA.da_base(df)
+
+        # Novo -> posição no índice atual; iguais = mesma chave e mesmo conteúdo
+        posicoes = self.chaves.get_indexer(chaves)
+        iguais = posicoes >= 0
+        iguais[iguais] = self.assinaturas[posicoes[iguais]] == assinaturas[iguais]
+        manter = np.zeros(len(self.chaves), dtype=bool)
+        manter[posicoes[iguais]] = True
+        novos = np.flatnonzero(~iguais)
+        if manter.all() and len(novos) == 0:
+            return self
+
+        vencimentos_novos = _nanossegundos(cartoes['Vencimento'].take(novos))
+        ordem = np.argsort(vencimentos_novos, kind='stable')
+        novos, vencimentos_novos = novos[ordem], vencimentos_novos[ordem]
+
+        # Intercala os novos (já ordenados) entre os mantidos (que continuam ordenados)
+        n_mantidos = int(manter.sum())
+        insercao = np.searchsorted(self.vencimentos[manter], vencimentos_novos, side='right')
+        final = np.insert(np.arange(n_mantidos), insercao, n_mantidos + np.arange(len(novos)))
+
+        indice = IndiceSLA(
+            pd.concat([self.cartoes[manter], cartoes.take(novos)], ignore_index=True).take(final).reset_index(drop=True),
+            self.chaves[manter].append(chaves[novos])[final],
+            np.concatenate([self.assinaturas[manter], assinaturas[novos]])[final]
+        )
+        indice.mantidos, indice.inseridos, indice.removidos = n_mantidos, len(novos), len(self.chaves) - n_mantidos
+        return indice
+
+    # ============================================
+    # CONSULTAS
+    # ============================================
+    def _posicao(self, instante, lado='left'):
+        return int(np.searchsorted(self.vencimentos, pd.Timestamp(instante).as_unit('ns').value, side=lado))
+
+    def __len__(self):
+        return len(self.cartoes)
+
+    def vencidos(self, agora):
+        """Abertos com Vencimento antes de `agora`, do mais antigo ao mais recente"""
+        return self.cartoes.iloc[:self._posicao(agora)]
+
+    def vencendo(self, agora, horas):
+        """Abertos que vencem de `agora` até `horas` horas depois"""
+        return self.cartoes.iloc[self._posicao(agora):self._posicao(pd.Timestamp(agora) + pd.Timedelta(hours=horas), 'right')]
+
+    def vencidos_por(self, coluna, agora):
+        """Quantidade de vencidos por valor de `coluna` (SRE, Empresa...), do maior para o menor"""
+        return self.vencidos(agora)[coluna].fillna('Sem informação').value_counts()
+
+    def resumo(self, agora, horas):
+        inicio = self._posicao(agora)
+        fim = self._posicao(pd.Timestamp(agora) + pd.Timedelta(hours=horas), 'right')
+        return {'abertos': len(self), 'vencidos': inicio, 'vencendo': fim - inicio}
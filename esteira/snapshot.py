@@ -0,0 +1,276 @@
+"""
+Snapshot pré-calculado da base: DataFrame processado + agregados das abas.
+
+Gerado fora do horário de uso (ex.: job noturno) para que o painel não precise
+ler o CSV:
+
+    python -m esteira.snapshot --entrada data/esteira_demandas.csv
+    python -m esteira.snapshot --entrada data/exports      # um CSV por mês
+"""
+import os
+import sys
+import glob
+import copy
+import time
+import pickle
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .dados import assinatura_origem, calcular_hash_origem, carregar_exports, listar_exports
+from .analises import (
+    calcular_evolucao_mensal, calcular_ipe_acumulado, calcular_ipe_por_sre,
+    calcular_revisoes_por_categoria, calcular_revisoes_por_responsavel, calcular_sazonalidade_mensal,
+    calcular_sincronizados_por_sre, calcular_tendencia_percentis, filtrar_ano_meses,
+    pivot_sincronizacoes_dia, processar_dados_mapa, recortar_sincronizados,
+    sincronizacoes_por_dia
+)
+from .ciclo import calcular_tempo_ciclo
+from .particoes import IndiceParticoes
+from .materializados import AGREGADOS_MENSAIS, AgregadosMensais, caminho_materializados_padrao
+
+# Incrementar sempre que o conteúdo do snapshot mudar de forma incompatível
+VERSAO_SNAPSHOT = 5
+
+# ============================================
+# REGISTRO DE AGREGADOS
+# ============================================
+# Nome -> função(df, **parâmetros). O painel chama a mesma função quando o
+# agregado não está no snapshot (base filtrada na barra lateral, recorte novo...)
+AGREGADOS = {
+    'evolucao_mensal': calcular_evolucao_mensal,
+    'revisoes_por_responsavel': calcular_revisoes_por_responsavel,
+    'revisoes_por_categoria': calcular_revisoes_por_categoria,
+    'sincronizacoes_dia_por': lambda df, coluna, **recorte: pivot_sincronizacoes_dia(
+        recortar_sincronizados(df, **recorte), coluna),
+    'sincronizados_por_sre': calcular_sincronizados_por_sre,
+    'sazonalidade_mensal': calcular_sazonalidade_mensal,
+    'mapa': lambda df, empresas, ano, mes: processar_dados_mapa(
+        df, empresas_selecionadas=list(empresas), ano_filtro=ano, mes_filtro=mes),
+    'ipe_por_sre': lambda df, ano, meses: calcular_ipe_por_sre(filtrar_ano_meses(df, ano, list(meses))),
+    'ipe_acumulado': lambda df, ano, meses: calcular_ipe_acumulado(filtrar_ano_meses(df, ano, list(meses))),
+    'sincronizacoes_por_dia': lambda df, ano, mes: sincronizacoes_por_dia(
+        recortar_sincronizados(df, ano=ano, mes=mes)),
+    'tendencia_percentis': lambda df, ano, mes, percentil: calcular_tendencia_percentis(
+        recortar_sincronizados(df, ano=ano, mes=mes), percentil),
+    'tempo_ciclo': calcular_tempo_ciclo,
+}
+
+def _normalizar(valor):
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    if isinstance(valor, np.integer):
+        return int(valor)
+    return valor
+
+def chave_agregado(nome, **parametros):
+    """Chave estável de um agregado: nome + parâmetros normalizados e ordenados"""
+    return (nome,) + tuple(sorted((k, _normalizar(v)) for k, v in parametros.items()))
+
+def calcular_agregado(nome, df, **parametros):
+    """Calcula um agregado do registro sobre a base informada"""
+    return AGREGADOS[nome](df, **parametros)
+
+def obter_agregado(agregados, nome, df, **parametros):
+    """
+    Agregado pré-calculado quando existir no snapshot; senão calcula na hora.
+    Devolve sempre uma cópia, pois o painel acrescenta colunas aos resultados.
+    """
+    if agregados:
+        valor = agregados.get(chave_agregado(nome, **parametros))
+        if valor is not None:
+            return copy.deepcopy(valor)
+    return calcular_agregado(nome, df, **parametros)
+
+def variacoes_agregados(df):
+    """Recortes pré-calculados: os padrões de cada aba e cada ano disponível"""
+    anos = [int(a) for a in sorted(df['Ano'].dropna().unique())]
+    meses = tuple(int(m) for m in sorted(df['Mês'].dropna().unique()))
+
+    for ano in anos:
+        yield 'evolucao_mensal', {'ano': ano}
+
+    for ano in ['Todos os Anos'] + anos:
+        yield 'revisoes_por_responsavel', {'ano': ano, 'mes': 'Todos os Meses'}
+        yield 'revisoes_por_categoria', {'ano': ano, 'mes': 'Todos os Meses'}
+        yield 'sazonalidade_mensal', {'ano': ano}
+        yield 'sincronizacoes_por_dia', {'ano': ano, 'mes': 'Todos os Meses'}
+        yield 'tendencia_percentis', {'ano': ano, 'mes': 'Todos os Meses', 'percentil': 75}
+
+    for coluna in ['SRE', 'Tipo_Chamado', 'Empresa']:
+        yield 'sincronizacoes_dia_por', {
+            'coluna': coluna, 'ano': 'Todos os Anos', 'mes': 'Todos os Meses',
+            'sre': 'Todos os SREs', 'empresa': 'Todas Empresas'
+        }
+
+    for ano in ['Todos'] + anos:
+        yield 'sincronizados_por_sre', {'ano': ano, 'mes': 'Todos'}
+        yield 'mapa', {'empresas': ('Todas',), 'ano': ano, 'mes': 'Todos'}
+        yield 'ipe_por_sre', {'ano': ano, 'meses': meses}
+        yield 'ipe_acumulado', {'ano': ano, 'meses': meses}
+
+    yield 'tempo_ciclo', {}
+
+def calcular_agregados(df, resumos=None):
+    """
+    Todos os agregados pré-calculáveis da base, indexados por chave_agregado.
+    Com `resumos` (AgregadosMensais.resumos da mesma base), os de AGREGADOS_MENSAIS
+    são montados a partir dos resumos mensais em vez de varrer a base.
+    """
+    def calcular(nome, parametros):
+        if resumos is not None and nome in AGREGADOS_MENSAIS:
+            return AGREGADOS_MENSAIS[nome](resumos, **parametros)
+        return calcular_agregado(nome, df, **parametros)
+
+    return {
+        chave_agregado(nome, **parametros): calcular(nome, parametros)
+        for nome, parametros in variacoes_agregados(df)
+    }
+
+def conferir_agregados_mensais(df, resumos=None):
+    """
+    Chaves dos agregados de AGREGADOS_MENSAIS cujo resultado montado dos
+    resumos difere do calculado sobre a base (lista vazia = paridade).
+    """
+    if resumos is None:
+        resumos = AgregadosMensais().resumos(df)
+    divergentes = []
+    for nome, parametros in variacoes_agregados(df):
+        if nome not in AGREGADOS_MENSAIS:
+            continue
+        esperado = calcular_agregado(nome, df, **parametros).reset_index(drop=True)
+        obtido = AGREGADOS_MENSAIS[nome](resumos, **parametros).reset_index(drop=True)
+        try:
+            pd.testing.assert_frame_equal(esperado, obtido, check_dtype=False)
+        except AssertionError:
+            divergentes.append(chave_agregado(nome, **parametros))
+    return divergentes
+
+# ============================================
+# GERAÇÃO E LEITURA DO SNAPSHOT
+# ============================================
+def caminho_snapshot_padrao(caminho_fonte):
+    """data/esteira_demandas.csv -> data/esteira_demandas.snapshot.pkl; data/exports -> data/exports.snapshot.pkl"""
+    base = caminho_fonte.rstrip('/\\')
+    if glob.has_magic(base):
+        base = os.path.join(os.path.dirname(base), 'exports')
+    return os.path.splitext(base)[0] + '.snapshot.pkl'
+
+def _tamanho_mtime(caminho_fonte):
+    """Tamanho total e mtime_ns mais recente dos arquivos da origem"""
+    assinatura = assinatura_origem(caminho_fonte)
+    return sum(t for _, t, _ in assinatura), max(m for _, _, m in assinatura)
+
+def _assinatura_fonte(caminho_fonte):
+    tamanho, mtime_ns = _tamanho_mtime(caminho_fonte)
+    return {
+        'caminho': os.path.abspath(caminho_fonte),
+        'tamanho': tamanho,
+        'mtime_ns': mtime_ns,
+        'md5': calcular_hash_origem(caminho_fonte)
+    }
+
+def gerar_snapshot(caminho_fonte, caminho_saida=None):
+    """Processa o CSV, calcula os agregados e grava o snapshot (escrita atômica)"""
+    caminho_saida = caminho_saida or caminho_snapshot_padrao(caminho_fonte)
+    fonte = _assinatura_fonte(caminho_fonte)
+
+    df, status, file_hash = carregar_exports(caminho_fonte)
+    if df is None:
+        raise ValueError(status)
+
+    indice = IndiceParticoes.da_base(df)
+    resumos = AgregadosMensais(caminho_materializados_padrao(caminho_fonte)).resumos(df)
+    snapshot = {
+        'versao_formato': VERSAO_SNAPSHOT,
+        'versao_pandas': pd.__version__,
+        'gerado_em': time.time(),
+        'fonte': fonte,
+        'file_hash': file_hash,
+        'df': df,
+        # Posições das linhas de cada (Ano, Mês) e meses já fechados na geração
+        'particoes': indice.particoes,
+        'fechadas': indice.fechadas(),
+        'agregados': calcular_agregados(df, resumos)
+    }
+
+    temporario = f"{caminho_saida}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho_saida)
+    return snapshot
+
+def snapshot_em_dia(snapshot, caminho_fonte):
+    """O snapshot é deste formato/pandas e o CSV de origem não mudou desde a geração"""
+    if not isinstance(snapshot, dict):
+        return False
+    if snapshot.get('versao_formato') != VERSAO_SNAPSHOT or snapshot.get('versao_pandas') != pd.__version__:
+        return False
+
+    fonte = snapshot.get('fonte', {})
+    tamanho, mtime_ns = _tamanho_mtime(caminho_fonte)
+    if tamanho != fonte.get('tamanho'):
+        return False
+    if mtime_ns == fonte.get('mtime_ns'):
+        return True
+    # Mesmo tamanho e mtime diferente (cópia, touch): decide pelo conteúdo
+    return calcular_hash_origem(caminho_fonte) == fonte.get('md5')
+
+def carregar_snapshot(caminho_fonte, caminho_snapshot=None):
+    """Snapshot válido para o CSV informado, ou None se ausente, desatualizado ou ilegível"""
+    caminho_snapshot = caminho_snapshot or caminho_snapshot_padrao(caminho_fonte)
+    if not os.path.exists(caminho_snapshot):
+        return None
+
+    try:
+        with open(caminho_snapshot, 'rb') as f:
+            snapshot = pickle.load(f)
+        return snapshot if snapshot_em_dia(snapshot, caminho_fonte) else None
+    except Exception:
+        # Ilegível ou origem ausente/removida durante a verificação
+        return None
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.snapshot',
+        description='Gera o snapshot pré-calculado do painel a partir do CSV do ADMS.'
+    )
+    parser.add_argument('--entrada', default='data/esteira_demandas.csv',
+                        help='CSV exportado do ADMS, diretório ou padrão glob de exports (padrão: %(default)s)')
+    parser.add_argument('--saida', default=None,
+                        help='arquivo do snapshot (padrão: <entrada>.snapshot.pkl)')
+    parser.add_argument('--conferir', action='store_true',
+                        help='confere se os agregados montados dos resumos mensais batem com os calculados sobre a base')
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    if not listar_exports(args.entrada):
+        print(f"Arquivo não encontrado: {args.entrada}", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    try:
+        snapshot = gerar_snapshot(args.entrada, args.saida)
+    except ValueError as e:
+        print(f"Erro ao processar {args.entrada}: {e}", file=sys.stderr)
+        return 1
+
+    saida = args.saida or caminho_snapshot_padrao(args.entrada)
+    if args.conferir:
+        divergentes = conferir_agregados_mensais(snapshot['df'])
+        for chave in divergentes:
+            print(f"Agregado divergente dos resumos mensais: {chave}", file=sys.stderr)
+        if divergentes:
+            return 1
+    print(f"Snapshot v{VERSAO_SNAPSHOT} gravado em {saida}: "
+          f"{len(snapshot['df']):,} registros, {len(snapshot['agregados'])} agregados, "
+          f"{os.path.getsize(saida) / 1024:.0f} KB em {time.perf_counter() - inicio:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,407 @@
+"""
+Teste de carga com várias sessões simultâneas: sobe o painel num servidor
+Streamlit local (ou usa um já no ar) e abre N conexões pelo mesmo websocket do
+navegador, cada uma repetindo um roteiro de uso (mudar o Ano, interagir com as
+abas, buscar Chamado, abrir a Manchete). Mede a latência de cada rerun
+(p50/p95/p99) e a memória do servidor conforme N cresce.
+
+    python -m esteira.teste_carga --sessoes 1,2,4,8 --passos 8
+    python -m esteira.teste_carga --sessoes 4,16 --linhas 100k --saida carga.json
+"""
+import os
+import sys
+import json
+import time
+import base64
+import socket
+import struct
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .memoria import rss_processo
+
+# ============================================
+# CLIENTE WEBSOCKET MÍNIMO (RFC 6455)
+# ============================================
+class ClienteWebSocket:
+    """Cliente síncrono só com a biblioteca padrão: quadros binários, ping/pong e fechamento"""
+
+    def __init__(self, url, timeout=300):
+        partes = urlsplit(url)
+        endereco = f"{partes.hostname}:{partes.port or 80}"
+        self._socket = socket.create_connection((partes.hostname, partes.port or 80), timeout=timeout)
+        self._arquivo = self._socket.makefile('rb')
+        chave = base64.b64encode(os.urandom(16)).decode()
+        self._socket.sendall((
+            f"GET {partes.path or '/'} HTTP/1.1\r\n"
+            f"Host: {endereco}\r\nOrigin: http://{endereco}\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {chave}\r\nSec-WebSocket-Version: 13\r\n"
+            "Sec-WebSocket-Protocol: streamlit\r\n\r\n"
+        ).encode())
+        status = self._arquivo.readline()
+        if b' 101 ' not in status:
+            raise ConnectionError(f"Handshake recusado: {status.decode(errors='replace').strip()}")
+        while self._arquivo.readline() not in (b'\r\n', b''):
+            pass
+
+    def _ler(self, n):
+        dados = self._arquivo.read(n)
+        if len(dados) < n:
+            raise ConnectionError("Conexão encerrada pelo servidor")
+        return dados
+
+    def enviar(self, dados, opcode=0x2):
+        """Envia um quadro (o cliente sempre mascara)"""
+        n = len(dados)
+        if n < 126:
+            cabecalho = struct.pack('!BB', 0x80 | opcode, 0x80 | n)
+        elif n < 65536:
+            cabecalho = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, n)
+        else:
+            cabecalho = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, n)
+        mascara = os.urandom(4)
+        chave = (mascara * (n // 4 + 1))[:n]
+        mascarado = (int.from_bytes(dados, 'big') ^ int.from_bytes(chave, 'big')).to_bytes(n, 'big')
+        self._socket.sendall(cabecalho + mascara + mascarado)
+
+    def receber(self):
+        """Próxima mensagem completa (junta os fragmentos; responde aos pings)"""
+        mensagem = b''
+        while True:
+            b1, b2 = self._ler(2)
+            tamanho = b2 & 0x7F
+            if tamanho == 126:
+                tamanho = struct.unpack('!H', self._ler(2))[0]
+            elif tamanho == 127:
+                tamanho = struct.unpack('!Q', self._ler(8))[0]
+            carga = self._ler(tamanho)
+            opcode = b1 & 0x0F
+            if opcode == 0x9:
+                self.enviar(carga, opcode=0xA)
+            elif opcode == 0x8:
+                raise ConnectionError("Conexão encerrada pelo servidor")
+            elif opcode != 0xA:
+                mensagem += carga
+                if b1 & 0x80:
+                    return mensagem
+
+    def fechar(self):
+        try:
+            self.enviar(struct.pack('!H', 1000), opcode=0x8)
+        except OSError:
+            pass
+        self._arquivo.close()
+        self._socket.close()
+
+# ============================================
+# SESSÃO SIMULADA
+# ============================================
+class SessaoSimulada:
+    """
+    Uma aba do navegador: guarda os widgets da última execução (pela chave
+    dada no APP.py) e os valores escolhidos, e mede cada rerun do envio ao fim
+    do script.
+    """
+
+    def __init__(self, url, timeout=300):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self._BackMsg, self._ForwardMsg, self._WidgetState = BackMsg, ForwardMsg, WidgetState
+        self.cliente = ClienteWebSocket(url, timeout)
+        self.widgets = {}
+        self.estados = {}
+        self.valores = {}
+        self.excecoes = 0
+
+    def _registrar(self, delta):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof('type')
+        if tipo == 'exception':
+            self.excecoes += 1
+            return
+        widget = getattr(elemento, tipo, None)
+        identificador = getattr(widget, 'id', '')
+        # Widgets com key têm id "$$ID-<hash>-<key>"
+        if identificador.startswith('$$ID-') and identificador.count('-') >= 2:
+            self.widgets[identificador.split('-', 2)[2]] = widget
+
+    def executar(self, gatilho=None):
+        """Pede um rerun com os valores atuais (e o gatilho de um botão); devolve os ms até o fim do script"""
+        mensagem = self._BackMsg()
+        mensagem.rerun_script.query_string = ''
+        mensagem.rerun_script.widget_states.widgets.extend(list(self.estados.values()) + ([gatilho] if gatilho else []))
+        inicio = time.perf_counter()
+        self.cliente.enviar(mensagem.SerializeToString())
+        while True:
+            resposta = self._ForwardMsg()
+            resposta.ParseFromString(self.cliente.receber())
+            tipo = resposta.WhichOneof('type')
+            if tipo == 'delta':
+                self._registrar(resposta.delta)
+            elif tipo == 'script_finished' and resposta.script_finished in (
+                    resposta.FINISHED_SUCCESSFULLY, resposta.FINISHED_WITH_COMPILE_ERROR):
+                return (time.perf_counter() - inicio) * 1000
+
+    def alterar(self, chave, **valor):
+        """Muda o widget `chave` (string_value=..., trigger_value=True...) e executa; None se ele não está na tela"""
+        widget = self.widgets.get(chave)
+        if widget is None:
+            return None
+        estado = self._WidgetState(id=widget.id, **valor)
+        if 'trigger_value' in valor:
+            return self.executar(gatilho=estado)
+        self.estados[widget.id] = estado
+        self.valores[chave] = next(iter(valor.values()))
+        return self.executar()
+
+    def fechar(self):
+        self.cliente.fechar()
+
+# ============================================
+# ROTEIRO DE USO
+# ============================================
+def _selecionar(sessao, rng, chave):
+    """Escolhe outra opção do selectbox `chave`"""
+    widget = sessao.widgets.get(chave)
+    if widget is None:
+        return None
+    padrao = widget.options[widget.default] if widget.HasField('default') and widget.options else None
+    opcoes = [o for o in widget.options if o != sessao.valores.get(chave, padrao)]
+    if not opcoes:
+        return None
+    return sessao.alterar(chave, string_value=opcoes[rng.integers(len(opcoes))])
+
+# Trocar de aba não chega ao servidor (as abas do Streamlit são do navegador);
+# o custo de "ir para a aba" é o rerun do primeiro filtro usado nela
+ACOES = {
+    'mudar_ano': lambda sessao, rng: _selecionar(sessao, rng, 'filtro_ano'),
+    'aba_mapa': lambda sessao, rng: _selecionar(sessao, rng, 'mapa_ano_folium'),
+    'aba_kpi': lambda sessao, rng: _selecionar(sessao, rng, 'filtro_ano_ipe'),
+    'aba_estatistica': lambda sessao, rng: _selecionar(sessao, rng, 'filtro_ano_est'),
+    'buscar_chamado': lambda sessao, rng: sessao.alterar('busca_chamado', string_value=f"30{rng.integers(10, 100)}"),
+    'limpar_busca': lambda sessao, rng: sessao.alterar('busca_chamado', string_value=''),
+    'abrir_manchete': lambda sessao, rng: sessao.alterar('btn_manchete', trigger_value=True),
+    'periodo_manchete': lambda sessao, rng: _selecionar(sessao, rng, 'popup_periodo'),
+}
+
+ROTEIRO_PADRAO = [
+    'mudar_ano', 'aba_mapa', 'buscar_chamado', 'abrir_manchete', 'periodo_manchete',
+    'limpar_busca', 'aba_kpi', 'mudar_ano', 'aba_estatistica'
+]
+
+def simular_sessao(url, passos, pausa, semente, roteiro=ROTEIRO_PADRAO, barreira=None):
+    """Abre uma sessão e segue o roteiro (a partir de um ponto sorteado); devolve [(ação, ms)] e o nº de exceções"""
+    rng = np.random.default_rng(semente)
+    if barreira is not None:
+        barreira.wait()
+    sessao = SessaoSimulada(url)
+    latencias = [('abrir', sessao.executar())]
+    try:
+        deslocamento = int(rng.integers(len(roteiro)))
+        for passo in range(passos):
+            time.sleep(rng.uniform(0, pausa))
+            acao = roteiro[(deslocamento + passo) % len(roteiro)]
+            ms = ACOES[acao](sessao, rng)
+            if ms is not None:
+                latencias.append((acao, ms))
+    finally:
+        sessao.fechar()
+    return latencias, sessao.excecoes
+
+# ============================================
+# RODADAS
+# ============================================
+class AmostradorMemoria:
+    """Amostra o RSS do servidor numa thread durante a rodada (nada sem o pid)"""
+
+    def __init__(self, pid, intervalo=0.2):
+        self.pid = pid
+        self.intervalo = intervalo
+        self.amostras = []
+        self._parar = threading.Event()
+
+    def _amostrar(self):
+        while not self._parar.is_set():
+            rss = rss_processo(self.pid)
+            if rss is not None:
+                self.amostras.append(rss)
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        if self.pid is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *erro):
+        self._parar.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+def _mb(valor):
+    return None if valor is None else round(valor / 1024 ** 2, 1)
+
+def rodada(url, sessoes, passos=8, pausa=0.5, semente=0, pid=None):
+    """N sessões simultâneas; devolve latências (p50/p95/p99/máx), erros e memória do servidor"""
+    barreira = threading.Barrier(sessoes)
+    resultados, falhas = [None] * sessoes, []
+
+    def executar(i):
+        try:
+            resultados[i] = simular_sessao(url, passos, pausa, semente + i, barreira=barreira)
+        except Exception as e:
+            falhas.append(f"{type(e).__name__}: {e}")
+
+    rss_inicio = rss_processo(pid) if pid else None
+    inicio = time.perf_counter()
+    with AmostradorMemoria(pid) as amostrador:
+        threads = [threading.Thread(target=executar, args=(i,)) for i in range(sessoes)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    duracao = time.perf_counter() - inicio
+
+    concluidas = [r for r in resultados if r is not None]
+    reruns = np.array([ms for latencias, _ in concluidas for acao, ms in latencias if acao != 'abrir'])
+    aberturas = np.array([ms for latencias, _ in concluidas for acao, ms in latencias if acao == 'abrir'])
+    percentil = lambda valores, p: round(float(np.percentile(valores, p)), 1) if len(valores) else None
+    return {
+        'sessoes': sessoes,
+        'reruns': int(len(reruns)),
+        'reruns_s': round(len(reruns) / duracao, 2) if duracao else None,
+        'p50_ms': percentil(reruns, 50), 'p95_ms': percentil(reruns, 95), 'p99_ms': percentil(reruns, 99),
+        'max_ms': percentil(reruns, 100),
+        'abrir_p50_ms': percentil(aberturas, 50),
+        'excecoes': sum(excecoes for _, excecoes in concluidas),
+        'falhas': falhas,
+        'rss_inicio_mb': _mb(rss_inicio),
+        'rss_pico_mb': _mb(max(amostrador.amostras, default=None)),
+        'rss_fim_mb': _mb(rss_processo(pid) if pid else None),
+    }
+
+# ============================================
+# SERVIDOR LOCAL
+# ============================================
+@contextmanager
+def servidor_local(app, diretorio, porta=8599, timeout=180):
+    """Sobe `streamlit run app` com `diretorio` como pasta de trabalho; devolve (url do websocket, pid)"""
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', os.path.abspath(app),
+         '--server.headless', 'true', '--server.port', str(porta),
+         '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        cwd=diretorio, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        limite = time.time() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://localhost:{porta}/_stcore/health", timeout=2) as resposta:
+                    if resposta.status == 200:
+                        break
+            except OSError:
+                pass
+            if processo.poll() is not None or time.time() > limite:
+                raise RuntimeError(f"O servidor Streamlit não subiu na porta {porta}")
+            time.sleep(0.5)
+        yield f"ws://localhost:{porta}/_stcore/stream", processo.pid
+    finally:
+        processo.terminate()
+        try:
+            processo.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+def diretorio_sintetico(linhas, semente=0, referencia=None):
+    """Pasta de trabalho com um export sintético como esteira_demandas.csv"""
+    from .sintetico import export_sintetico
+    diretorio = tempfile.mkdtemp(prefix='esteira_carga_')
+    cache = os.path.join(tempfile.gettempdir(), 'esteira_benchmark')
+    os.symlink(export_sintetico(linhas, cache, semente=semente, referencia=referencia),
+               os.path.join(diretorio, 'esteira_demandas.csv'))
+    return diretorio
+
+def _imprimir(resultado):
+    memoria = '/'.join('-' if v is None else f"{v:,.0f}"
+                       for v in (resultado['rss_inicio_mb'], resultado['rss_pico_mb'], resultado['rss_fim_mb']))
+    print(f"{resultado['sessoes']:>7} {resultado['reruns']:>7} {resultado['p50_ms'] or 0:>10,.0f} "
+          f"{resultado['p95_ms'] or 0:>10,.0f} {resultado['p99_ms'] or 0:>10,.0f} {resultado['max_ms'] or 0:>10,.0f} "
+          f"{resultado['excecoes'] + len(resultado['falhas']):>6}  {memoria} MB", flush=True)
+
+# ============================================
+# LINHA DE COMANDO
+# ============================================
+def main(argv=None):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(
+        prog='python -m esteira.teste_carga',
+        description='Teste de carga do painel com várias sessões simultâneas.'
+    )
+    parser.add_argument('--sessoes', default='1,2,4,8', help='rodadas com N sessões simultâneas (padrão: %(default)s)')
+    parser.add_argument('--passos', type=int, default=8, help='ações do roteiro por sessão (padrão: %(default)s)')
+    parser.add_argument('--pausa', type=float, default=0.5,
+                        help='pausa máxima, em segundos, entre as ações de uma sessão (padrão: %(default)s)')
+    parser.add_argument('--semente', type=int, default=0, help='semente das escolhas das sessões (padrão: %(default)s)')
+    parser.add_argument('--app', default=os.path.join(raiz, 'APP.py'), help='script do painel (padrão: %(default)s)')
+    parser.add_argument('--porta', type=int, default=8599, help='porta do servidor local (padrão: %(default)s)')
+    parser.add_argument('--linhas', default=None,
+                        help='usa um export sintético com esse número de linhas (10k, 100k, 1m...) no lugar da base real')
+    parser.add_argument('--url', default=None,
+                        help='websocket de um servidor já no ar (ws://host:porta/_stcore/stream); não sobe um local')
+    parser.add_argument('--pid', type=int, default=None, help='pid do servidor já no ar, para medir a memória')
+    parser.add_argument('--saida', default=None, help='grava os resultados em JSON')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        servidor = _servidor_externo(args.url, args.pid)
+    else:
+        diretorio = raiz
+        if args.linhas:
+            from .sintetico import interpretar_tamanho
+            diretorio = diretorio_sintetico(interpretar_tamanho(args.linhas),
+                                            referencia=os.path.join(raiz, 'data', 'esteira_demandas.csv'))
+        servidor = servidor_local(args.app, diretorio, args.porta)
+
+    resultados = []
+    with servidor as (url, pid):
+        # Primeira sessão sozinha: carrega a base nos caches do processo (carga fria)
+        inicio = time.perf_counter()
+        aquecimento = SessaoSimulada(url)
+        aquecimento.executar()
+        aquecimento.fechar()
+        carga_fria_ms = round((time.perf_counter() - inicio) * 1000)
+        print(f"Carga fria: {carga_fria_ms:,} ms")
+
+        print(f"{'sessões':>7} {'reruns':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'máx ms':>10} "
+              f"{'erros':>6}  RSS início/pico/fim")
+        for n in [int(n) for n in args.sessoes.split(',') if n.strip()]:
+            resultado = rodada(url, n, passos=args.passos, pausa=args.pausa, semente=args.semente, pid=pid)
+            resultados.append(resultado)
+            _imprimir(resultado)
+            for falha in resultado['falhas'][:3]:
+                print(f"        {falha}", file=sys.stderr)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'carga_fria_ms': carga_fria_ms, 'passos': args.passos, 'pausa': args.pausa,
+                       'linhas': args.linhas, 'rodadas': resultados}, f, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.saida}")
+    return 0
+
+@contextmanager
+def _servidor_externo(url, pid):
+    yield url, pid
+
+if __name__ == '__main__':
+    sys.exit(main())
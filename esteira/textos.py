@@ -0,0 +1,171 @@
+"""
+Índice invertido dos textos livres (Motivo Revisão e ChangeSet), montado na
+carga. Os textos são normalizados (minúsculas, sem acentos) e quebrados em
+termos uma vez por texto distinto; cada termo aponta para as posições das
+linhas da base que o contêm. Consultas por termo ou prefixo são buscas
+binárias no vocabulário ordenado, sem varrer a coluna com str.contains.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_TEXTO = ['Motivo_Revisao', 'ChangeSet']
+
+# Termos ignorados na contagem dos mais frequentes (continuam pesquisáveis)
+PALAVRAS_VAZIAS = frozenset({
+    'a', 'o', 'as', 'os', 'um', 'uma', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na', 'nos',
+    'nas', 'ao', 'aos', 'para', 'pra', 'por', 'pelo', 'pela', 'com', 'que', 'se', 'foi', 'ser', 'esta',
+    'estava', 'ja', 'mas', 'ou', 'como', 'ate', 'deve', 'apenas', 'tambem', 'mais', 'nao', 'sem'
+})
+
+PADRAO_TERMO = r'[a-z0-9]+'
+
+def normalizar_textos(textos):
+    """Série de textos em minúsculas e sem acentos (NFKD sem as marcas combinantes)"""
+    return (pd.Series(textos, dtype='string')
+            .str.normalize('NFKD')
+            .str.replace('[\u0300-\u036f]', '', regex=True)
+            .str.lower())
+
+def termos_consulta(consulta):
+    """Termos de uma consulta, normalizados como os do índice"""
+    if not consulta:
+        return []
+    decomposto = unicodedata.normalize('NFKD', str(consulta))
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return re.findall(PADRAO_TERMO, sem_acentos.lower())
+
+class IndiceInvertido:
+    """
+    Termo -> posições das linhas (em ordem) de uma coluna de texto. As listas de
+    posições ficam contíguas num único vetor, na ordem do vocabulário, de modo
+    que os termos de um prefixo ocupam uma fatia só.
+    """
+
+    def __init__(self, termos, inicios, linhas, indice):
+        self.termos = termos        # pd.Index ordenado com o vocabulário
+        self.inicios = inicios      # int64, len(termos) + 1: fatia de cada termo em `linhas`
+        self.linhas = linhas        # int64, posições na base
+        self.indice = indice        # índice da base (para traduzir recortes em posições)
+        self._termo_da_linha = np.repeat(np.arange(len(termos)), np.diff(inicios))
+
+    @classmethod
+    def da_coluna(cls, coluna):
+        """Normaliza e quebra cada texto distinto uma única vez e espalha os termos pelas linhas"""
+        codigos, textos = pd.factorize(coluna)
+        pares = normalizar_textos(textos).str.findall(PADRAO_TERMO).explode().dropna()
+        pares = pd.DataFrame({'texto': pares.index.to_numpy(dtype='int64'), 'termo': pares.to_numpy(dtype=object)})
+        pares = pares.drop_duplicates()
+        codigos_termo, termos = pd.factorize(pares['termo'], sort=True)
+
+        # Linhas de cada texto distinto, agrupadas por texto
+        validas = np.flatnonzero(codigos >= 0)
+        linhas_por_texto = validas[np.argsort(codigos[validas], kind='stable')]
+        contagem_texto = np.bincount(codigos[validas], minlength=len(textos))
+        inicio_texto = np.concatenate(([0], np.cumsum(contagem_texto)[:-1])).astype('int64')
+
+        # Cada par (termo, texto) vira as linhas daquele texto
+        texto_par = pares['texto'].to_numpy()
+        repeticoes = contagem_texto[texto_par]
+        deslocamento = np.arange(repeticoes.sum()) - np.repeat(np.cumsum(repeticoes) - repeticoes, repeticoes)
+        linhas = linhas_por_texto[np.repeat(inicio_texto[texto_par], repeticoes) + deslocamento]
+        termo_da_linha = np.repeat(codigos_termo, repeticoes)
+        ordem = np.lexsort((linhas, termo_da_linha))
+
+        inicios = np.concatenate(([0], np.cumsum(np.bincount(termo_da_linha, minlength=len(termos))))).astype('int64')
+        return cls(pd.Index(termos, dtype=object), inicios, linhas[ordem].astype('int64'), coluna.index)
+
+    def __len__(self):
+        return len(self.termos)
+
+    # ============================================
+    # CONSULTAS
+    # ============================================
+    def _fatia(self, inicio, fim):
+        return self.linhas[self.inicios[inicio]:self.inicios[fim]]
+
+    def linhas_termo(self, termo):
+        """Posições das linhas com o termo exato (já normalizado)"""
+        inicio = self.termos.searchsorted(termo, side='left')
+        fim = self.termos.searchsorted(termo, side='right')
+        return self._fatia(inicio, fim)
+
+    def termos_prefixo(self, prefixo):
+        """Termos do vocabulário que começam com `prefixo`"""
+        inicio = self.termos.searchsorted(prefixo, side='left')
+        fim = self.termos.searchsorted(prefixo + '\uffff', side='left')
+        return self.termos[inicio:fim]
+
+    def linhas_prefixo(self, prefixo):
+        """Posições das linhas com algum termo que comece com `prefixo`"""
+        inicio = self.termos.searchsorted(prefixo, side='left')
+        fim = self.termos.searchsorted(prefixo + '\uffff', side='left')
+        if fim - inicio <= 1:
+            return self._fatia(inicio, fim)
+        return np.unique(self._fatia(inicio, fim))
+
+    def buscar(self, consulta, prefixo=True, posicoes=None):
+        """
+        Posições das linhas que contêm todos os termos da consulta (cada termo
+        como prefixo, ou exato com prefixo=False), opcionalmente só dentro do
+        recorte `posicoes`. Consulta vazia: nenhuma linha.
+        """
+        termos = termos_consulta(consulta)
+        if not termos:
+            return np.array([], dtype='int64')
+        busca = self.linhas_prefixo if prefixo else self.linhas_termo
+        resultado = busca(termos[0])
+        for termo in termos[1:]:
+            if len(resultado) == 0:
+                break
+            resultado = np.intersect1d(resultado, busca(termo), assume_unique=True)
+        if posicoes is not None:
+            resultado = np.intersect1d(resultado, posicoes, assume_unique=True)
+        return resultado
+
+    def posicoes(self, df):
+        """Posições na base das linhas de um recorte dela (mesmo índice)"""
+        if df.index is self.indice:
+            return np.arange(len(self.indice))
+        posicoes = self.indice.get_indexer(df.index)
+        return posicoes[posicoes >= 0]
+
+    def termos_frequentes(self, posicoes=None, rotulos=None, n=10):
+        """
+        Termos com mais linhas (sem PALAVRAS_VAZIAS), no recorte `posicoes` ou
+        em toda a base. Com `rotulos` (valores alinhados à base, como SRE ou
+        Ano_Mês) a contagem é por grupo: colunas Grupo, Termo e Cartões.
+        """
+        considerar = ~self.termos.isin(PALAVRAS_VAZIAS)[self._termo_da_linha]
+        if posicoes is not None:
+            no_recorte = np.zeros(len(self.indice), dtype=bool)
+            no_recorte[posicoes] = True
+            considerar &= no_recorte[self.linhas]
+        termos, linhas = self._termo_da_linha[considerar], self.linhas[considerar]
+        n_termos = len(self.termos)
+
+        if rotulos is None:
+            contagem = np.bincount(termos, minlength=n_termos)
+            topo = np.argsort(-contagem, kind='stable')[:n]
+            topo = topo[contagem[topo] > 0]
+            return pd.DataFrame({'Termo': self.termos[topo], 'Cartões': contagem[topo]})
+
+        codigos, grupos = pd.factorize(pd.Series(rotulos), sort=True)
+        codigos = codigos[linhas]
+        conhecidos = codigos >= 0
+        contagem = np.bincount(codigos[conhecidos] * n_termos + termos[conhecidos],
+                               minlength=len(grupos) * n_termos).reshape(len(grupos), n_termos)
+        topo = np.argsort(-contagem, axis=1, kind='stable')[:, :n]
+        cartoes = np.take_along_axis(contagem, topo, axis=1)
+        resultado = pd.DataFrame({
+            'Grupo': np.repeat(np.asarray(grupos, dtype=object), topo.shape[1]),
+            'Termo': self.termos[topo.ravel()],
+            'Cartões': cartoes.ravel()
+        })
+        return resultado[resultado['Cartões'] > 0].reset_index(drop=True)
+
+def indexar_textos(df, colunas=COLUNAS_TEXTO):
+    """Um IndiceInvertido por coluna de texto presente na base"""
+    return {coluna: IndiceInvertido.da_coluna(df[coluna]) for coluna in colunas if coluna in df.columns}